@@ -77,6 +77,11 @@ from geopy import units, util
 from geopy.point import Point
 from geopy.compat import string_compare
 
+try:
+    import numpy
+except ImportError: # pragma: no cover
+    numpy = None
+
 # Average great-circle radius in kilometers, from Wikipedia.
 # Using a sphere with this radius results in an error of up to about 0.5%.
 EARTH_RADIUS = 6372.795
@@ -524,6 +529,43 @@ class vincenty(Distance):
         return Point(units.degrees(radians=lat2), units.degrees(radians=lng2))
 
 
+def great_circle_array(lat_a, lng_a, lat_b, lng_b, radius=EARTH_RADIUS):
+    """
+    Great-circle distances in kilometers between arrays of points given by
+    their latitudes and longitudes in degrees, computed in a single numpy
+    call with the same formula as :class:`.great_circle`. The arrays are
+    broadcast against each other, e.g. ``lat_a[:, None]`` against ``lat_b``
+    gives the matrix of the distances between all pairs of points. NaN
+    coordinates give NaN distances.
+
+    Example::
+
+        >>> from geopy.distance import great_circle_array
+        >>> great_circle_array([41.49008], [-71.312796],
+        ...                    [41.499498], [-81.695391])
+        array([864.45676163])
+
+    """
+    if numpy is None: # pragma: no cover
+        raise ImportError("great_circle_array requires numpy")
+
+    lat1, lng1 = numpy.radians(lat_a), numpy.radians(lng_a)
+    lat2, lng2 = numpy.radians(lat_b), numpy.radians(lng_b)
+
+    sin_lat1, cos_lat1 = numpy.sin(lat1), numpy.cos(lat1)
+    sin_lat2, cos_lat2 = numpy.sin(lat2), numpy.cos(lat2)
+
+    delta_lng = lng2 - lng1
+    cos_delta_lng, sin_delta_lng = numpy.cos(delta_lng), numpy.sin(delta_lng)
+
+    d = numpy.arctan2(numpy.sqrt((cos_lat2 * sin_delta_lng) ** 2 +
+                                 (cos_lat1 * sin_lat2 -
+                                  sin_lat1 * cos_lat2 * cos_delta_lng) ** 2),
+                      sin_lat1 * sin_lat2 + cos_lat1 * cos_lat2 * cos_delta_lng)
+
+    return radius * d
+
+
 # Set the default distance formula to the most generally accurate.
 
 distance = VincentyDistance = vincenty
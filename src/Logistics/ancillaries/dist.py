@@ -5,9 +5,16 @@ Created on Wed Jan 27 10:22:21 2016
 @author: BTeillant
 """
 
-from geopy.distance import great_circle
+from collections import OrderedDict
+
+from geopy.distance import great_circle, great_circle_array
+import numpy
 import utm
 
+# distance matrices of the layouts used in the process
+MATRIX_CACHE_SIZE = 16
+matrix_cache = OrderedDict()
+
 
 def distance(UTM_ini, UTM_fin):
     """
@@ -31,4 +38,78 @@ def distance(UTM_ini, UTM_fin):
 
     distance = great_circle(point_i, point_f).kilometers # gives you a distance (in kms) between two coordinate in dd.dd
 
-    return distance
\ No newline at end of file
+    return distance
+
+
+def utm_to_latlon(UTM_x, UTM_y, UTM_zone):
+    """
+    utm_to_latlon returns the latitudes and longitudes (dd.dd) of arrays of
+    points defined in the UTM coordinate system, the zones being given as in
+    the databases (e.g. '31 U'). Points without coordinates (NaN) give NaN.
+    """
+    UTM_zone = numpy.asarray(UTM_zone, dtype=object)
+    UTM_x, UTM_y, UTM_zone = numpy.broadcast_arrays(numpy.asarray(UTM_x, dtype=float),
+                                                    numpy.asarray(UTM_y, dtype=float),
+                                                    UTM_zone)
+
+    located = numpy.array([isinstance(zone, basestring) for zone in UTM_zone.flat], dtype=bool).reshape(UTM_zone.shape)
+    zone_number = numpy.array([int(zone[0:2]) if isinstance(zone, basestring) else 31 for zone in UTM_zone.flat]).reshape(UTM_zone.shape)
+    zone_letter = numpy.array([str(zone[3]) if isinstance(zone, basestring) else 'U' for zone in UTM_zone.flat]).reshape(UTM_zone.shape)
+
+    return utm.to_latlon_array(numpy.where(located, UTM_x, numpy.nan), UTM_y, zone_number, zone_letter)  # to get dd.dd from utm
+
+
+def distances(UTM_ini, UTM_fin):
+    """
+    distances returns the calculated distances (in kms) between arrays of
+    points defined in the UTM coordinate system, as [x, y, zone] arrays
+    broadcast against each other (e.g. a site against all ports, or all
+    devices against all devices with [:, None] arrays), in one numpy call
+    """
+    [LAT_INI, LONG_INI] = utm_to_latlon(UTM_ini[0], UTM_ini[1], UTM_ini[2])
+    [LAT_FIN, LONG_FIN] = utm_to_latlon(UTM_fin[0], UTM_fin[1], UTM_fin[2])
+
+    return great_circle_array(LAT_INI, LONG_INI, LAT_FIN, LONG_FIN)
+
+
+def distance_matrix(UTM_x, UTM_y, UTM_zone):
+    """
+    distance_matrix returns the distances (in kms) between all pairs of
+    points, as a square array. The points are defined in the UTM coordinate
+    system and their distances are the great circle ones of distance. If any
+    of the zones is missing, all points are taken as local site coordinates
+    [m] and the distances fall back to the planar ones, hypot(dx, dy)/1000.
+    """
+    UTM_x = numpy.asarray(UTM_x, dtype=float)
+    UTM_y = numpy.asarray(UTM_y, dtype=float)
+    UTM_zone = numpy.asarray(UTM_zone, dtype=object)
+
+    if len(UTM_zone) and all(isinstance(zone, basestring) for zone in UTM_zone):
+        return distances([UTM_x[:, None], UTM_y[:, None], UTM_zone[:, None]],
+                         [UTM_x, UTM_y, UTM_zone])
+
+    return numpy.hypot(UTM_x[:, None] - UTM_x, UTM_y[:, None] - UTM_y)/1000
+
+
+def cached_distance_matrix(UTM_x, UTM_y, UTM_zone):
+    """
+    cached_distance_matrix returns the same as distance_matrix, computed only
+    once per set of points (e.g. the layout of the array) and kept in a
+    bounded LRU cache. The returned array is read-only as it is shared
+    between all callers.
+    """
+    UTM_x = numpy.asarray(UTM_x, dtype=float)
+    UTM_y = numpy.asarray(UTM_y, dtype=float)
+    key = (UTM_x.tostring(), UTM_y.tostring(),
+           tuple(unicode(zone) for zone in UTM_zone))
+
+    dist = matrix_cache.pop(key, None)
+    if dist is None:
+        dist = distance_matrix(UTM_x, UTM_y, UTM_zone)
+        dist.flags.writeable = False
+
+    matrix_cache[key] = dist
+    while len(matrix_cache) > MATRIX_CACHE_SIZE:
+        matrix_cache.popitem(last=False)
+
+    return dist
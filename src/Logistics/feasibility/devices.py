@@ -42,13 +42,13 @@ def devices_feas(log_phase, log_phase_id, user_inputs):
 
     if assembly_method == '([A,B,C,D])': # all devices assumed the same
         deck_area = user_inputs['device']['length [m]'].ix[0] * user_inputs['device']['width [m]'].ix[0]
-        deck_cargo = user_inputs['device']['dry mass [kg]'].ix[0]/1000
-        deck_loading = user_inputs['device']['dry mass [kg]'].ix[0] / (user_inputs['device']['length [m]'].ix[0] * user_inputs['device']['width [m]'].ix[0])
+        deck_cargo = user_inputs['device']['dry mass [kg]'].ix[0]/1000.0
+        deck_loading = user_inputs['device']['dry mass [kg]'].ix[0] / (1000.0 * user_inputs['device']['length [m]'].ix[0] * user_inputs['device']['width [m]'].ix[0])
 
     elif assembly_method == '([A,B,C],D)':
         deck_area = max(user_inputs['sub_device']['length [m]']['A':'C'] * user_inputs['sub_device']['width [m]']['A':'C'])
-        deck_cargo = user_inputs['sub_device']['dry mass [kg]']['A':'C'].sum()/1000
-        deck_loading = max(user_inputs['sub_device']['dry mass [kg]']['A':'C'] / (1000 * user_inputs['sub_device']['length [m]']['A':'C'] * user_inputs['sub_device']['width [m]']['A':'C']))
+        deck_cargo = user_inputs['sub_device']['dry mass [kg]']['A':'C'].sum()/1000.0
+        deck_loading = max(user_inputs['sub_device']['dry mass [kg]']['A':'C'] / (1000.0 * user_inputs['sub_device']['length [m]']['A':'C'] * user_inputs['sub_device']['width [m]']['A':'C']))
 
     # Equipment and vessel feasiblity ---------------------------------------
     # these should be dictionaries, with the keys being the name of the vessels
@@ -16,7 +16,7 @@ installation sequences) will be updated.
 """
 
 import warnings
-import pandas as pd
+from ..load.cache import parse_excel
 
 
 def install_plan(file_path, user_inputs, electrical_outputs, MF_outputs):
@@ -48,11 +48,8 @@ def install_plan(file_path, user_inputs, electrical_outputs, MF_outputs):
      relation and sequence.
     """
 
-    # Transform order database .xls into panda type
-    excel = pd.ExcelFile(file_path)
-
-    # Collect data from a particular tab
-    instal_order_db = excel.parse('InstallationOrder', header=0, index_col=0)
+    # Collect data from a particular tab of the .xls database (cached)
+    instal_order_db = parse_excel(file_path, 'InstallationOrder')
 
     operation = {0: ['Electrical', 1],
                  1: ['Moorings', 2],  # ?!?!
@@ -125,125 +122,125 @@ def install_plan(file_path, user_inputs, electrical_outputs, MF_outputs):
                 # install_seq = {0: [100, 101, 112],
                 #                1: [{120: 112}],
                 #                2: [{102: (120, 100)}]}
-                install_seq = {0: ['E_export', 'E_array', 'E_cp', 'Driven', 'Devices']}
+                install_seq = {0: ['E_export', 'E_array', 'E_cp_seabed', 'Driven', 'Devices']}
 
             elif MF_outputs['foundation']['type [-]'].ix[0] == "pile":
-                install_seq = {0: ['E_export', 'E_array', 'E_cp', 'Driven', 'Devices']}
+                install_seq = {0: ['E_export', 'E_array', 'E_cp_seabed', 'Driven', 'Devices']}
 
             elif MF_outputs['foundation']['type [-]'].ix[0] == "suction caisson":
-                install_seq = {0: ['E_export', 'E_array', 'E_cp', 'M_Suction', 'Devices']}
+                install_seq = {0: ['E_export', 'E_array', 'E_cp_seabed', 'M_Suction', 'Devices']}
 
             elif MF_outputs['foundation']['type [-]'].ix[0] == "gravity based":
-                install_seq = {0: ['E_export', 'E_array', 'E_cp', 'Gravity', 'Devices']}
+                install_seq = {0: ['E_export', 'E_array', 'E_cp_seabed', 'Gravity', 'Devices']}
 
             elif MF_outputs['foundation']['type [-]'].ix[0] == "drag-embedment":
-                install_seq = {0: ['E_export', 'E_array', 'E_cp', 'M_drag', 'Devices']}
+                install_seq = {0: ['E_export', 'E_array', 'E_cp_seabed', 'M_Drag', 'Devices']}
 
             elif MF_outputs['foundation']['type [-]'].ix[0] == "direct embedment":
-                install_seq = {0: ['E_export', 'E_array', 'E_cp', 'M_direct', 'Devices']}
+                install_seq = {0: ['E_export', 'E_array', 'E_cp_seabed', 'M_Direct', 'Devices']}
 
             else:
                 warnings.warn("unknown electrical layout type")
 
         elif electrical_outputs['layout']['Electrical Layout [-]'] == "type 2":
             if MF_outputs['foundation']['type [-]'].ix[0] == "shallow foundation":
-                install_seq = {0: ['E_export', 'E_array', 'E_cp', 'Driven', 'Devices']}
+                install_seq = {0: ['E_export', 'E_array', 'E_cp_seabed', 'Driven', 'Devices']}
 
             elif MF_outputs['foundation']['type [-]'].ix[0] == "pile":
-                install_seq = {0: ['E_export', 'E_array', 'E_cp', 'Driven', 'Devices']}
+                install_seq = {0: ['E_export', 'E_array', 'E_cp_seabed', 'Driven', 'Devices']}
 
             elif MF_outputs['foundation']['type [-]'].ix[0] == "suction caisson":
-                install_seq = {0: ['E_export', 'E_array', 'E_cp', 'M_Suction', 'Devices']}
+                install_seq = {0: ['E_export', 'E_array', 'E_cp_seabed', 'M_Suction', 'Devices']}
 
             elif MF_outputs['foundation']['type [-]'].ix[0] == "gravity based":
-                install_seq = {0: ['E_export', 'E_array', 'E_cp', 'Gravity', 'Devices']}
+                install_seq = {0: ['E_export', 'E_array', 'E_cp_seabed', 'Gravity', 'Devices']}
 
             elif MF_outputs['foundation']['type [-]'].ix[0] == "drag-embedment":
-                install_seq = {0: ['E_export', 'E_array', 'E_cp', 'M_drag', 'Devices']}
+                install_seq = {0: ['E_export', 'E_array', 'E_cp_seabed', 'M_Drag', 'Devices']}
 
             elif MF_outputs['foundation']['type [-]'].ix[0] == "direct embedment":
-                install_seq = {0: ['E_export', 'E_array', 'E_cp', 'M_direct', 'Devices']}
+                install_seq = {0: ['E_export', 'E_array', 'E_cp_seabed', 'M_Direct', 'Devices']}
 
         elif electrical_outputs['layout']['Electrical Layout [-]'] == "type 3":
             if MF_outputs['foundation']['type [-]'].ix[0] == "shallow foundation":
-                install_seq = {0: ['E_export', 'E_array', 'E_cp', 'Driven', 'Devices']}
+                install_seq = {0: ['E_export', 'E_array', 'E_cp_seabed', 'Driven', 'Devices']}
 
             elif MF_outputs['foundation']['type [-]'].ix[0] == "pile":
-                install_seq = {0: ['E_export', 'E_array', 'E_cp', 'Driven', 'Devices']}
+                install_seq = {0: ['E_export', 'E_array', 'E_cp_seabed', 'Driven', 'Devices']}
 
             elif MF_outputs['foundation']['type [-]'].ix[0] == "suction caisson":
-                install_seq = {0: ['E_export', 'E_array', 'E_cp', 'M_Suction', 'Devices']}
+                install_seq = {0: ['E_export', 'E_array', 'E_cp_seabed', 'M_Suction', 'Devices']}
 
             elif MF_outputs['foundation']['type [-]'].ix[0] == "gravity based":
-                install_seq = {0: ['E_export', 'E_array', 'E_cp', 'Gravity', 'Devices']}
+                install_seq = {0: ['E_export', 'E_array', 'E_cp_seabed', 'Gravity', 'Devices']}
 
             elif MF_outputs['foundation']['type [-]'].ix[0] == "drag-embedment":
-                install_seq = {0: ['E_export', 'E_array', 'E_cp', 'M_drag', 'Devices']}
+                install_seq = {0: ['E_export', 'E_array', 'E_cp_seabed', 'M_Drag', 'Devices']}
 
             elif MF_outputs['foundation']['type [-]'].ix[0] == "direct embedment":
-                install_seq = {0: ['E_export', 'E_array', 'E_cp', 'M_direct', 'Devices']}
+                install_seq = {0: ['E_export', 'E_array', 'E_cp_seabed', 'M_Direct', 'Devices']}
 
 
     elif user_inputs['device']['type [-]'].ix[0] == "floating":
         if electrical_outputs['layout']['Electrical Layout [-]'].ix[0] == "type 1":
             if MF_outputs['foundation']['type [-]'].ix[0] == "shallow foundation":
-                install_seq = {0: ['E_export', 'E_array', 'E_cp', 'Driven', 'Devices']}
+                install_seq = {0: ['E_export', 'E_array', 'E_cp_seabed', 'Driven', 'Devices']}
 
             elif MF_outputs['foundation']['type [-]'].ix[0] == "pile":
-                install_seq = {0: ['E_export', 'E_array', 'E_cp', 'Driven', 'Devices']}
+                install_seq = {0: ['E_export', 'E_array', 'E_cp_seabed', 'Driven', 'Devices']}
 
             elif MF_outputs['foundation']['type [-]'].ix[0] == "suction caisson":
-                install_seq = {0: ['E_export', 'E_array', 'E_cp', 'M_Suction', 'Devices']}
+                install_seq = {0: ['E_export', 'E_array', 'E_cp_seabed', 'M_Suction', 'Devices']}
 
             elif MF_outputs['foundation']['type [-]'].ix[0] == "gravity based":
-                install_seq = {0: ['E_export', 'E_array', 'E_cp', 'Gravity', 'Devices']}
+                install_seq = {0: ['E_export', 'E_array', 'E_cp_seabed', 'Gravity', 'Devices']}
 
             elif MF_outputs['foundation']['type [-]'].ix[0] == "drag-embedment":
-                install_seq = {0: ['E_export', 'E_array', 'E_cp', 'M_drag', 'Devices']}
+                install_seq = {0: ['E_export', 'E_array', 'E_cp_seabed', 'M_Drag', 'Devices']}
 
             elif MF_outputs['foundation']['type [-]'].ix[0] == "direct embedment":
-                install_seq = {0: ['E_export', 'E_array', 'E_cp', 'M_direct', 'Devices']}
+                install_seq = {0: ['E_export', 'E_array', 'E_cp_seabed', 'M_Direct', 'Devices']}
 
             else:
                 warnings.warn("unknown electrical layout type")
 
         elif electrical_outputs['layout']['Electrical Layout [-]'] == "type 2":
             if MF_outputs['foundation']['type [-]'].ix[0] == "shallow foundation":
-                install_seq = {0: ['E_export', 'E_array', 'E_cp', 'Driven', 'Devices']}
+                install_seq = {0: ['E_export', 'E_array', 'E_cp_seabed', 'Driven', 'Devices']}
 
             elif MF_outputs['foundation']['type [-]'].ix[0] == "pile":
-                install_seq = {0: ['E_export', 'E_array', 'E_cp', 'Driven', 'Devices']}
+                install_seq = {0: ['E_export', 'E_array', 'E_cp_seabed', 'Driven', 'Devices']}
 
             elif MF_outputs['foundation']['type [-]'].ix[0] == "suction caisson":
-                install_seq = {0: ['E_export', 'E_array', 'E_cp', 'M_Suction', 'Devices']}
+                install_seq = {0: ['E_export', 'E_array', 'E_cp_seabed', 'M_Suction', 'Devices']}
 
             elif MF_outputs['foundation']['type [-]'].ix[0] == "gravity based":
-                install_seq = {0: ['E_export', 'E_array', 'E_cp', 'Gravity', 'Devices']}
+                install_seq = {0: ['E_export', 'E_array', 'E_cp_seabed', 'Gravity', 'Devices']}
 
             elif MF_outputs['foundation']['type [-]'].ix[0] == "drag-embedment":
-                install_seq = {0: ['E_export', 'E_array', 'E_cp', 'M_drag', 'Devices']}
+                install_seq = {0: ['E_export', 'E_array', 'E_cp_seabed', 'M_Drag', 'Devices']}
 
             elif MF_outputs['foundation']['type [-]'].ix[0] == "direct embedment":
-                install_seq = {0: ['E_export', 'E_array', 'E_cp', 'M_direct', 'Devices']}
+                install_seq = {0: ['E_export', 'E_array', 'E_cp_seabed', 'M_Direct', 'Devices']}
 
         elif electrical_outputs['layout']['Electrical Layout [-]'] == "type 3":
             if MF_outputs['foundation']['type [-]'].ix[0] == "shallow foundation":
-                install_seq = {0: ['E_export', 'E_array', 'E_cp', 'Driven', 'Devices']}
+                install_seq = {0: ['E_export', 'E_array', 'E_cp_seabed', 'Driven', 'Devices']}
 
             elif MF_outputs['foundation']['type [-]'].ix[0] == "pile":
-                install_seq = {0: ['E_export', 'E_array', 'E_cp', 'Driven', 'Devices']}
+                install_seq = {0: ['E_export', 'E_array', 'E_cp_seabed', 'Driven', 'Devices']}
 
             elif MF_outputs['foundation']['type [-]'].ix[0] == "suction caisson":
-                install_seq = {0: ['E_export', 'E_array', 'E_cp', 'M_Suction', 'Devices']}
+                install_seq = {0: ['E_export', 'E_array', 'E_cp_seabed', 'M_Suction', 'Devices']}
 
             elif MF_outputs['foundation']['type [-]'].ix[0] == "gravity based":
-                install_seq = {0: ['E_export', 'E_array', 'E_cp', 'Gravity', 'Devices']}
+                install_seq = {0: ['E_export', 'E_array', 'E_cp_seabed', 'Gravity', 'Devices']}
 
             elif MF_outputs['foundation']['type [-]'].ix[0] == "drag-embedment":
-                install_seq = {0: ['E_export', 'E_array', 'E_cp', 'M_drag', 'Devices']}
+                install_seq = {0: ['E_export', 'E_array', 'E_cp_seabed', 'M_Drag', 'Devices']}
 
             elif MF_outputs['foundation']['type [-]'].ix[0] == "direct embedment":
-                install_seq = {0: ['E_export', 'E_array', 'E_cp', 'M_direct', 'Devices']}
+                install_seq = {0: ['E_export', 'E_array', 'E_cp_seabed', 'M_Direct', 'Devices']}
 
     else:
         warnings.warn("unknown device type")
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+@author: WavEC Offshore Renewables
+email: boris.teillant@wavec.org; paulo@wavec.org
+
+This module contains the port distance table, the lengths of the shortest sea
+routes between every port of the ports database and every point of the sea
+graph. The table is computed once, with a single-source shortest path search
+from the sea grid point of each port, and saved next to the sea grid as a
+.npy file with one row per point of the sea graph and one column per port
+location. It is memory-mapped when loaded, so that the sea distances between
+any site and all ports are read from one row of the table. The great circle
+legs between the site or the ports and their sea grid points are added to the
+distances of the table.
+
+BETA VERSION NOTES: the table is rebuilt when the coordinates of the ports or
+the sea grid change. Ports sharing the same sea grid point (e.g. terminals of
+the same port) share a column of the table.
+"""
+
+import os
+import json
+import hashlib
+
+import numpy
+import pandas as pd
+
+from sea_grid import load_sea_grid, sea_grid_dir
+from geopy.distance import great_circle_array
+from ..ancillaries.dist import utm_to_latlon
+from ..load.cache import write_file
+
+PORT_TABLE_VERSION = 3
+PORT_TABLE = 'port_distances'
+
+# port distance tables loaded in the process, per sea grid folder and ports
+port_tables = {}
+
+
+def port_coordinates(ports):
+    """
+    port_coordinates returns the latitude and longitude arrays (dd.dd) of the
+    ports, NaN for the ports without UTM coordinates
+    """
+    return utm_to_latlon(ports['UTM x [m]'].values, ports['UTM y [m]'].values,
+                         ports['UTM zone [-]'].values)
+
+
+def port_table_key(grid, ports):
+    """
+    port_table_key returns the digest identifying the port distance table of
+    a sea grid and of the coordinates of the ports
+    """
+    sha = hashlib.sha1(repr((PORT_TABLE_VERSION, len(grid), len(grid.indices),
+                             [unicode(label) for label in ports.index])))
+    lat, lon = port_coordinates(ports)
+    sha.update(lat.tostring())
+    sha.update(lon.tostring())
+    return sha.hexdigest()
+
+
+class PortDistances(object):
+    """
+    PortDistances holds the port distance table, the distances [km] from the
+    point rows[i] of the sea graph to the ports being table[rows[i]][columns],
+    columns giving the column of each port of the database (-1 for the ports
+    which could not be placed on the sea grid) and legs the distances [km]
+    between the ports and their sea grid points
+    """
+
+    def __init__(self, grid, labels, columns, legs, table):
+        self.grid = grid
+        self.labels = labels
+        self.columns = columns
+        self.legs = legs
+        self.table = table
+        self.rows = numpy.cumsum(grid.nodes) - 1
+
+    def site_distances(self, lat, lon):
+        """
+        site_distances returns the sea distances [km] between the site (dd.dd)
+        and all ports, as a panda Series indexed as the ports database: the
+        great circle legs from the site and from the ports to their sea grid
+        points and the sea route between these points. The distances are NaN
+        if the site or the port could not be placed on the sea grid, infinite
+        if the port cannot be reached by sea.
+        """
+        dist = numpy.empty(len(self.columns))
+        dist.fill(numpy.nan)
+        point = self.grid.snap(lat, lon)
+        if point is not None:
+            site_leg = great_circle_array(lat, lon, self.grid.lat[point],
+                                          self.grid.lon[point])
+            placed = self.columns >= 0
+            dist[placed] = (site_leg + self.legs[placed] +
+                            self.table[self.rows[point]][self.columns[placed]])
+        return pd.Series(dist, index=self.labels)
+
+
+def build_port_distances(grid, ports):
+    """
+    build_port_distances computes the port distance table, running a single
+    source shortest path search from the sea grid point of every port
+
+    Returns
+    -------
+    columns : array
+     column of each port in the table, -1 for the ports which could not be
+     placed on the sea grid
+    legs : array
+     distances [km] between the ports and their sea grid points, NaN for the
+     ports which could not be placed on the sea grid
+    table : array
+     distances [km] between every point of the sea graph (rows) and every
+     port location (columns)
+    """
+    lat, lon = port_coordinates(ports)
+    points = numpy.empty(len(ports), dtype=numpy.int64)
+    points.fill(-1)
+    located = ~numpy.isnan(lat)
+    points[located] = grid.snap_points(lat[located], lon[located])
+
+    placed = points >= 0
+    legs = numpy.empty(len(ports))
+    legs.fill(numpy.nan)
+    legs[placed] = great_circle_array(lat[placed], lon[placed],
+                                      grid.lat[points[placed]],
+                                      grid.lon[points[placed]])
+    sources, inverse = numpy.unique(points[placed], return_inverse=True)
+    columns = numpy.empty(len(ports), dtype=numpy.int64)
+    columns.fill(-1)
+    columns[placed] = inverse
+
+    nodes = numpy.asarray(grid.nodes)
+    table = numpy.empty((nodes.sum(), len(sources)), dtype=numpy.float32)
+    for column, source in enumerate(sources):
+        table[:, column] = grid.distances_from(source)[nodes]
+
+    return columns, legs, table
+
+
+def load_port_distances(ports, folder=None):
+    """
+    load_port_distances returns the port distance table of the ports
+    database, memory-mapped from the sea grid folder. The table is loaded
+    once per process and built if the folder does not contain the table of
+    the same ports and sea grid.
+
+    Parameters
+    ----------
+    ports : DataFrame
+     panda table containing the ports database
+    folder : string
+     folder where the sea grid is stored
+
+    Returns
+    -------
+    port_table : PortDistances
+     the port distance table
+    """
+    folder = os.path.abspath(sea_grid_dir(folder))
+    grid = load_sea_grid(folder)
+    key = port_table_key(grid, ports)
+    if (folder, key) in port_tables:
+        return port_tables[(folder, key)]
+
+    table_path = os.path.join(folder, PORT_TABLE + '.npy')
+    columns_path = os.path.join(folder, PORT_TABLE + '_columns.npy')
+    legs_path = os.path.join(folder, PORT_TABLE + '_legs.npy')
+    manifest_path = os.path.join(folder, PORT_TABLE + '.json')
+
+    manifest = {}
+    if os.path.isfile(manifest_path):
+        try:
+            with open(manifest_path, 'r') as f:
+                manifest = json.load(f)
+        except ValueError:
+            manifest = {}
+
+    if manifest.get('key') == key:
+        columns = numpy.load(columns_path)
+        legs = numpy.load(legs_path)
+        table = numpy.load(table_path, mmap_mode='r')
+    else:
+        columns, legs, table = build_port_distances(grid, ports)
+
+        def dump_array(array):
+            def writer(path):
+                with open(path, 'wb') as f:
+                    numpy.save(f, array)
+            return writer
+
+        def dump_manifest(path):
+            with open(path, 'w') as f:
+                json.dump({'version': PORT_TABLE_VERSION, 'key': key}, f)
+
+        write_file(table_path, dump_array(table))
+        write_file(columns_path, dump_array(columns))
+        write_file(legs_path, dump_array(legs))
+        write_file(manifest_path, dump_manifest)
+
+    port_tables[(folder, key)] = PortDistances(grid, ports.index, columns, legs,
+                                                  table)
+
+    return port_tables[(folder, key)]
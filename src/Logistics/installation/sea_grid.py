@@ -0,0 +1,503 @@
+# -*- coding: utf-8 -*-
+"""
+@author: WavEC Offshore Renewables
+email: boris.teillant@wavec.org; paulo@wavec.org
+
+This module contains the sea grid used by the transit algorithm to route the
+vessels between the ports and the project site. The water points off the
+European coast (Point_DTOcean_0.csv) and the edges of the sea graph
+(graph_sea_european_sea.p) are converted once into a compact CSR structure of
+numpy arrays: the latitude and longitude of every water point, and for every
+point the range indptr[i]:indptr[i+1] of its neighbours and of the lengths of
+the corresponding edges. The arrays are saved as .npy files and memory-mapped
+when loaded, and the sea grid is kept in memory for the rest of the process,
+so that the routing calls after the first only cost the path search. The port
+and site coordinates are snapped to their nearest point of the sea graph with
+a spatial index (NodeIndex) built on first use, within SNAP_DISTANCE [km]
+by default.
+
+BETA VERSION NOTES: the edge lengths are the great circle distances [km]
+between the water points, not the grid steps in degrees stored in the pickled
+graph. The water points, the pickled graph and the sea grid folder are
+looked for in the databases folder of the package (databases/sea_grid), the
+sea grid folder can be relocated with the DTOCEAN_SEA_GRID_DIR environment
+variable.
+"""
+
+import os
+import csv
+import json
+import math
+import heapq
+import pickle
+
+import numpy
+
+from geopy.distance import EARTH_RADIUS, great_circle_array
+from ..load.cache import write_file
+
+SEA_GRID_ENV = 'DTOCEAN_SEA_GRID_DIR'
+SEA_GRID_VERSION = 1
+SEA_GRID_ARRAYS = ['lat', 'lon', 'nodes', 'indptr', 'indices', 'weights']
+MANIFEST = 'manifest.json'
+# default maximum distance [km] between coordinates and their nearest point
+# of the sea graph, and largest ring of cells kept in the spatial index
+SNAP_DISTANCE = 100.
+RING_CACHE = 8
+DATABASES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             '..', '..', 'databases')
+WATER_POINTS = os.path.join(DATABASES_DIR, 'Point_DTOcean_0.csv')
+SEA_GRAPH = os.path.join(DATABASES_DIR, 'graph_sea_european_sea.p')
+
+# sea grids loaded in the process, per folder
+sea_grids = {}
+
+
+def sea_grid_dir(folder=None):
+    """Returns the folder where the arrays of the sea grid are stored
+    """
+    if folder is not None:
+        return folder
+    return os.environ.get(SEA_GRID_ENV,
+                          os.path.join(DATABASES_DIR, 'sea_grid'))
+
+
+def read_water_points(csv_path):
+    """
+    read_water_points returns the latitude and longitude arrays of the water
+    points off the European coast, in the order of the nodes of the sea graph
+    """
+    num_points = 1
+    lat_i = []
+    long_i = []
+    with open(csv_path, 'rb') as csvfile:
+        datareader = csv.reader(csvfile, delimiter='\t')
+        for row in datareader:
+
+            if num_points<=1000:
+                lat_i.append(float(row[2])/1e15)
+                long_i.append(float(row[3])/1e15)
+
+            elif num_points==1001:
+                lat_i.append(float(row[3])/1e15)
+                long_i.append(float(row[4])/1e15)
+
+            elif num_points>=1001:
+                if num_points%1000==0 or (num_points-1)%1000==0:
+                    lat_i.append(float(row[3])/1e15)
+                    long_i.append(float(row[4])/1e15)
+                else:
+                    lat_i.append(float(row[4])/1e15)
+                    long_i.append(float(row[5])/1e15)
+
+            if (long_i[num_points-1]<1 and long_i[num_points-1]>0) or (long_i[num_points-1]>-1 and long_i[num_points-1]<0):
+                long_i[num_points-1] = long_i[num_points-1]*1e15
+
+            num_points = num_points+1
+
+    return numpy.array(lat_i), numpy.array(long_i)
+
+
+def graph_arrays(graph, lat, lon):
+    """
+    graph_arrays converts a networkx graph, whose nodes are the indexes of
+    the water points, into the CSR arrays of the sea grid
+
+    Returns
+    -------
+    arrays : dict
+     'lat', 'lon', 'nodes' (True for the points of the graph), 'indptr',
+     'indices' and 'weights' arrays
+    """
+    nb_points = len(lat)
+    nodes = numpy.zeros(nb_points, dtype=bool)
+    degree = numpy.zeros(nb_points, dtype=numpy.int64)
+    for node in graph:
+        nodes[node] = True
+        degree[node] = len(graph[node])
+
+    indptr = numpy.zeros(nb_points + 1, dtype=numpy.int64)
+    numpy.cumsum(degree, out=indptr[1:])
+    indices = numpy.empty(indptr[-1], dtype=numpy.int64)
+    for node in graph:
+        indices[indptr[node]:indptr[node+1]] = sorted(graph[node])
+
+    sources = numpy.repeat(numpy.arange(nb_points), degree)
+    weights = great_circle_array(lat[sources], lon[sources],
+                              lat[indices], lon[indices])
+
+    return {'lat': numpy.asarray(lat, dtype=float),
+            'lon': numpy.asarray(lon, dtype=float),
+            'nodes': nodes,
+            'indptr': indptr,
+            'indices': indices,
+            'weights': weights}
+
+
+def save_sea_grid(arrays, folder=None):
+    """Saves the CSR arrays of a sea grid as .npy files, listed in a manifest
+    """
+    folder = sea_grid_dir(folder)
+
+    def dump_array(array):
+        def writer(path):
+            with open(path, 'wb') as f:
+                numpy.save(f, array)
+        return writer
+
+    for name in SEA_GRID_ARRAYS:
+        write_file(os.path.join(folder, name + '.npy'), dump_array(arrays[name]))
+
+    manifest = {'version': SEA_GRID_VERSION,
+                'points': len(arrays['lat']),
+                'edges': len(arrays['indices'])}
+
+    def dump_manifest(path):
+        with open(path, 'w') as f:
+            json.dump(manifest, f)
+
+    write_file(os.path.join(folder, MANIFEST), dump_manifest)
+
+
+def build_sea_grid(csv_path=WATER_POINTS, graph_path=SEA_GRAPH, folder=None):
+    """
+    build_sea_grid converts the water points and the pickled sea graph into
+    the prebuilt binary files of the sea grid. This is a one-off conversion,
+    the sea grid is then loaded with load_sea_grid.
+
+    Parameters
+    ----------
+    csv_path : string
+     path of the water points file
+    graph_path : string
+     path of the pickled networkx graph
+    folder : string
+     folder where the sea grid is saved
+    """
+    lat, lon = read_water_points(csv_path)
+    with open(graph_path, 'rb') as f:
+        graph = pickle.load(f)
+    save_sea_grid(graph_arrays(graph, lat, lon), folder)
+
+
+def unit_vectors(lat, lon):
+    """
+    unit_vectors returns the cartesian coordinates of points (dd.dd) on the
+    unit sphere, the chord between two of them increasing with their great
+    circle distance
+    """
+    lat, lon = numpy.radians(lat), numpy.radians(lon)
+    return numpy.column_stack((numpy.cos(lat) * numpy.cos(lon),
+                               numpy.cos(lat) * numpy.sin(lon),
+                               numpy.sin(lat)))
+
+
+class NodeIndex(object):
+    """
+    NodeIndex finds the point of the sea graph closest to any coordinates in
+    O(log n). The points of the graph are hashed into the cubic cells of a
+    uniform grid over their unit vectors, the cell size being the median edge
+    length, and sorted by cell. The cells around the coordinates are then
+    searched by binary search, ring by ring, until no closer point can lie in
+    the next ring.
+    """
+
+    def __init__(self, grid):
+        self.points = numpy.flatnonzero(grid.nodes)
+        self.xyz = unit_vectors(grid.lat[self.points], grid.lon[self.points])
+
+        if len(grid.weights):
+            self.cell = float(numpy.median(grid.weights)) / EARTH_RADIUS
+        else:
+            self.cell = 0.
+        if self.cell <= 0:
+            self.cell = 1e-3  # about 6 km
+        self.offset = int(1 / self.cell) + 2
+        self.size = 2 * self.offset + 1
+        self.rings = {}
+
+        keys = self.cell_keys(self.cell_coords(self.xyz))
+        order = numpy.argsort(keys, kind='mergesort')
+        self.keys = keys[order]
+        self.points = self.points[order]
+        self.xyz = self.xyz[order]
+
+    def cell_coords(self, xyz):
+        """integer coordinates of the cells of unit vectors"""
+        return numpy.floor(xyz / self.cell).astype(numpy.int64)
+
+    def cell_keys(self, coords):
+        """single integer key of cells"""
+        coords = coords + self.offset
+        return (coords[..., 0] * self.size + coords[..., 1]) * self.size + coords[..., 2]
+
+    def ring(self, radius):
+        """
+        offsets of the cells at a Chebyshev distance radius of a cell, the
+        faces of the cube of side 2 * radius + 1 only. The rings up to
+        RING_CACHE are kept for the next searches
+        """
+        if radius in self.rings:
+            return self.rings[radius]
+        if radius == 0:
+            return numpy.zeros((1, 3), dtype=numpy.int64)
+
+        full = numpy.arange(-radius, radius + 1)
+        inner = full[1:-1]
+        sides = numpy.array([-radius, radius])
+        # x on a face, then y on a face with x inside, then z on a face
+        # with x and y inside
+        faces = [(sides, full, full), (inner, sides, full), (inner, inner, sides)]
+        offsets = numpy.concatenate(
+            [numpy.stack(numpy.meshgrid(x, y, z, indexing='ij'), -1).reshape(-1, 3)
+             for x, y, z in faces])
+        if radius <= RING_CACHE:
+            self.rings[radius] = offsets
+        return offsets
+
+    def max_chord(self, max_distance):
+        """chord of a great circle distance [km], SNAP_DISTANCE if None"""
+        if max_distance is None:
+            max_distance = SNAP_DISTANCE
+        return 2 * math.sin(min(max_distance / EARTH_RADIUS, math.pi) / 2)
+
+    def search(self, xyz, coords, max_chord):
+        """
+        search returns the position in the index of the point closest to the
+        unit vector xyz of cell coords, or None if there is none within the
+        chord max_chord
+        """
+        best, best_chord = None, float('inf')
+        radius = 0
+        # the points beyond the ring radius - 1 are at least radius - 1 cells
+        # away from any point of the central cell
+        while (radius - 1) * self.cell < min(best_chord, max_chord) and radius <= self.size:
+            keys = self.cell_keys(coords + self.ring(radius))
+            first = numpy.searchsorted(self.keys, keys, side='left')
+            last = numpy.searchsorted(self.keys, keys, side='right')
+            for start, stop in zip(first[first < last], last[first < last]):
+                chords = numpy.sqrt(((self.xyz[start:stop] - xyz) ** 2).sum(1))
+                ind = chords.argmin()
+                if chords[ind] < best_chord:
+                    best, best_chord = start + ind, chords[ind]
+            radius += 1
+
+        if best_chord > max_chord:
+            return None
+        return best
+
+    def nearest(self, lat, lon, max_distance=None):
+        """
+        nearest returns the point of the sea graph closest to the coordinates
+        (dd.dd), or None if there is none within max_distance [km],
+        SNAP_DISTANCE if None
+        """
+        points = self.nearest_points([lat], [lon], max_distance)
+        if points[0] < 0:
+            return None
+        return points[0]
+
+    def nearest_points(self, lat, lon, max_distance=None):
+        """
+        nearest_points returns the points of the sea graph closest to each of
+        the coordinates (dd.dd arrays), -1 where there is none within
+        max_distance [km], SNAP_DISTANCE if None
+        """
+        xyz = unit_vectors(numpy.asarray(lat, dtype=float),
+                           numpy.asarray(lon, dtype=float))
+        coords = self.cell_coords(xyz)
+        max_chord = self.max_chord(max_distance)
+
+        points = numpy.empty(len(xyz), dtype=numpy.int64)
+        points.fill(-1)
+        if not len(self.points):
+            return points
+        for ind in range(len(xyz)):
+            best = self.search(xyz[ind], coords[ind], max_chord)
+            if best is not None:
+                points[ind] = self.points[best]
+        return points
+
+
+class SeaGrid(object):
+    """
+    SeaGrid holds the water points and the edges of the sea graph in CSR
+    form, the neighbours of the point i being indices[indptr[i]:indptr[i+1]]
+    at the distances [km] weights[indptr[i]:indptr[i+1]]
+    """
+
+    def __init__(self, arrays):
+        self.lat = arrays['lat']
+        self.lon = arrays['lon']
+        self.nodes = arrays['nodes']
+        self.indptr = arrays['indptr']
+        self.indices = arrays['indices']
+        self.weights = arrays['weights']
+        self._index = None
+
+    def __len__(self):
+        return len(self.lat)
+
+    def neighbours(self, point):
+        """neighbours and edge lengths [km] of a point of the sea grid"""
+        first, last = self.indptr[point], self.indptr[point+1]
+        return self.indices[first:last], self.weights[first:last]
+
+    @property
+    def index(self):
+        """spatial index of the points of the sea graph, built on first use"""
+        if self._index is None:
+            self._index = NodeIndex(self)
+        return self._index
+
+    def snap(self, lat, lon, max_distance=None):
+        """
+        snap returns the point of the sea graph closest to the coordinates
+        (dd.dd), or None if there is none within max_distance [km],
+        SNAP_DISTANCE if None
+        """
+        return self.index.nearest(lat, lon, max_distance)
+
+    def snap_points(self, lat, lon, max_distance=None):
+        """
+        snap_points returns the points of the sea graph closest to each of
+        the coordinates (dd.dd arrays), -1 where there is none within
+        max_distance [km], SNAP_DISTANCE if None
+        """
+        return self.index.nearest_points(lat, lon, max_distance)
+
+    def heuristic(self, end):
+        """
+        heuristic returns the function giving the great circle distance [km]
+        from a point of the sea grid to the point end, a lower bound of the
+        length of any sea route between them
+        """
+        lat_end = math.radians(self.lat[end])
+        lon_end = math.radians(self.lon[end])
+        sin_end, cos_end = math.sin(lat_end), math.cos(lat_end)
+
+        def to_end(point):
+            lat = math.radians(self.lat[point])
+            delta_lon = lon_end - math.radians(self.lon[point])
+            sin_lat, cos_lat = math.sin(lat), math.cos(lat)
+            return EARTH_RADIUS * math.atan2(
+                math.sqrt((cos_end * math.sin(delta_lon)) ** 2 +
+                          (cos_lat * sin_end -
+                           sin_lat * cos_end * math.cos(delta_lon)) ** 2),
+                sin_lat * sin_end + cos_lat * cos_end * math.cos(delta_lon))
+
+        return to_end
+
+    def shortest_path(self, start, end):
+        """
+        shortest_path returns the shortest route between two points of the
+        sea grid and its length [km], found in a single A* search guided by
+        the great circle distance to the end point
+
+        Returns
+        -------
+        route : list
+         points of the route from start to end, None if there is no route
+        length : float
+         length of the route [km], infinity if there is no route
+        """
+        to_end = self.heuristic(end)
+        dist = {start: 0.}
+        previous = {start: None}
+        done = set()
+        heap = [(to_end(start), 0., start)]
+        while heap:
+            bound, dist_point, point = heapq.heappop(heap)
+            if point in done:
+                continue
+            if point == end:
+                route = [end]
+                while previous[route[-1]] is not None:
+                    route.append(previous[route[-1]])
+                return route[::-1], dist_point
+            done.add(point)
+
+            indices, weights = self.neighbours(point)
+            for succ, weight in zip(indices.tolist(), weights.tolist()):
+                dist_succ = dist_point + weight
+                if succ not in done and dist_succ < dist.get(succ, float('inf')):
+                    dist[succ] = dist_succ
+                    previous[succ] = point
+                    heapq.heappush(heap, (dist_succ + to_end(succ), dist_succ, succ))
+
+        return None, float('inf')
+
+
+    def distances_from(self, source):
+        """
+        distances_from returns the lengths [km] of the shortest sea routes
+        from the point source to all points of the sea grid, infinity for
+        the points that cannot be reached, found in a single Dijkstra search
+        """
+        dist = numpy.empty(len(self))
+        dist.fill(float('inf'))
+        done = numpy.zeros(len(self), dtype=bool)
+        indptr = self.indptr
+        indices = self.indices
+        weights = self.weights
+
+        dist[source] = 0.
+        heap = [(0., source)]
+        while heap:
+            dist_point, point = heapq.heappop(heap)
+            if done[point]:
+                continue
+            done[point] = True
+
+            first, last = indptr[point], indptr[point+1]
+            for succ, weight in zip(indices[first:last].tolist(),
+                                    weights[first:last].tolist()):
+                dist_succ = dist_point + weight
+                if dist_succ < dist[succ]:
+                    dist[succ] = dist_succ
+                    heapq.heappush(heap, (dist_succ, succ))
+
+        return dist
+
+
+def load_sea_grid(folder=None, csv_path=WATER_POINTS, graph_path=SEA_GRAPH):
+    """
+    load_sea_grid returns the sea grid, memory-mapped from its prebuilt
+    binary files. The sea grid is loaded once per process and per folder, and
+    built from the water points and pickled graph if the folder does not
+    contain an up-to-date sea grid.
+
+    Parameters
+    ----------
+    folder : string
+     folder where the sea grid is stored
+    csv_path, graph_path : string
+     paths of the water points file and of the pickled networkx graph, only
+     read if the sea grid is not prebuilt
+
+    Returns
+    -------
+    grid : SeaGrid
+     the sea grid
+    """
+    folder = os.path.abspath(sea_grid_dir(folder))
+    if folder in sea_grids:
+        return sea_grids[folder]
+
+    manifest = {}
+    manifest_path = os.path.join(folder, MANIFEST)
+    if os.path.isfile(manifest_path):
+        try:
+            with open(manifest_path, 'r') as f:
+                manifest = json.load(f)
+        except ValueError:
+            manifest = {}
+    if manifest.get('version') != SEA_GRID_VERSION:
+        build_sea_grid(csv_path, graph_path, folder)
+
+    arrays = dict((name, numpy.load(os.path.join(folder, name + '.npy'),
+                                    mmap_mode='r'))
+                  for name in SEA_GRID_ARRAYS)
+    sea_grids[folder] = SeaGrid(arrays)
+
+    return sea_grids[folder]
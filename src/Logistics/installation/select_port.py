@@ -12,9 +12,13 @@ this will be upgraded for the beta version due to october.
 """
 
 from transit_algorithm import transit_algorithm
+from port_distances import load_port_distances
+from ..ancillaries.dist import distances
 from geopy.distance import great_circle
+import pandas as pd
 import utm
 import math
+import warnings
 
 
 def distance(UTM_ini, UTM_fin):
@@ -42,6 +46,41 @@ def distance(UTM_ini, UTM_fin):
     return distance
 
 
+def port_sea_distances(site_coords, ports):
+    """
+    port_sea_distances returns the sea distances (in kms) between the site,
+    defined in the UTM coordinate system, and all ports of the ports database,
+    read from the port distance table, or None if the sea grid is not
+    available
+    """
+    try:
+        port_table = load_port_distances(ports)
+    except (IOError, OSError) as err:
+        warnings.warn("sea grid not available, straight-line distances are used: {0}".format(err))
+        return None
+
+    [LAT_SITE, LONG_SITE] = utm.to_latlon(site_coords[0], site_coords[1], int(site_coords[2][0:2]), str(site_coords[2][3]))
+
+    return port_table.site_distances(LAT_SITE, LONG_SITE)
+
+
+def site_port_distances(site_coords, ports):
+    """
+    site_port_distances returns the distances (in kms) between the site,
+    defined in the UTM coordinate system, and all ports of the ports database:
+    the sea distances where available, the straight-line distances otherwise
+    and NaN for the ports without coordinates
+    """
+    port_coords = [ports['UTM x [m]'].values, ports['UTM y [m]'].values, ports['UTM zone [-]'].values]
+    site_dist = pd.Series(distances(site_coords, port_coords), index=ports.index)   # closest ports by geo distance!
+
+    sea_dist = port_sea_distances(site_coords, ports)
+    if sea_dist is not None:
+        site_dist = sea_dist.where(sea_dist.notnull(), site_dist)   # closest ports by sea distance
+
+    return site_dist
+
+
 
 
 def install_port(user_inputs, hydrodynamic_outputs, electrical_outputs, MF_outputs, ports, instal_order):
@@ -160,7 +199,7 @@ def install_port(user_inputs, hydrodynamic_outputs, electrical_outputs, MF_outpu
 
 
 
-    # Distance ports-site calculation to be implemented once the transit distance algorithm is available
+    # Distance ports-site calculation, read from the port distance table of the transit algorithm
     # by making use of the grid coordinate position of the site and the ports
 
     index_dev = 0  # USING POSITION OF FIRST DEVICE!!!
@@ -168,6 +207,7 @@ def install_port(user_inputs, hydrodynamic_outputs, electrical_outputs, MF_outpu
     site_coords_y = hydrodynamic_outputs['y coord [m]'][index_dev]
     site_coords_zone = hydrodynamic_outputs['zone [-]'][index_dev]
     site_coords = [site_coords_x, site_coords_y, site_coords_zone]
+    site_dist = site_port_distances(site_coords, ports)
     dist_to_port_vec = []
     for ind_port, row in port_data.iterrows():
         port_coords_x = port_data['UTM x [m]'][ind_port]
@@ -177,7 +217,7 @@ def install_port(user_inputs, hydrodynamic_outputs, electrical_outputs, MF_outpu
 
         if math.isnan(port_coords_x):
             continue
-        dist_to_port_i = distance(site_coords, port_coords)   # closest ports by geo distance!
+        dist_to_port_i = site_dist[ind_port]
         dist_to_port_vec.append( [dist_to_port_i, ind_port, port_data['Name [-]'][ind_port]] )
     closest_ports_all=sorted(dist_to_port_vec)
     # furthest_ports_all = closest_ports_all.reverse()
@@ -211,8 +251,7 @@ def install_port(user_inputs, hydrodynamic_outputs, electrical_outputs, MF_outpu
         if math.isnan(port_coords_x):
             continue
 
-        # dist_to_port_i = transit_algorithm(site_coords, port_coords)
-        dist_to_port_i = distance(site_coords, port_coords)  # TO BE CHANGED, simplification just for testing!!!!!!!!!!!!!!!!!!!!!!!!!!!!!
+        dist_to_port_i = closest_ports_n[ind_closest_port][0]
 
         dist_to_clost_port_vec.append(dist_to_port_i)
         min_dist_to_clst_port = min(dist_to_clost_port_vec)
@@ -254,6 +293,7 @@ def OM_port(hydrodynamic_outputs, wp6_outputs, port_data):
      dictionnary containing the results of the port selection
     """       
     # initialisation
+    ports = port_data
     port = {'Terminal load bearing [t/m^2]': 0,
             'Terminal area [m^2]': 0,
             'Port list satisfying the minimum requirements': 0,
@@ -303,6 +343,7 @@ def OM_port(hydrodynamic_outputs, wp6_outputs, port_data):
     site_coords_zone = hydrodynamic_outputs['zone [-]'][index_dev]
     site_coords = [site_coords_x, site_coords_y, site_coords_zone]
 
+    site_dist = site_port_distances(site_coords, ports)
     dist_to_port_vec = []
     for ind_port, row in port_data.iterrows():
         port_coords_x = port_data['UTM x [m]'][ind_port]
@@ -312,7 +353,7 @@ def OM_port(hydrodynamic_outputs, wp6_outputs, port_data):
 
         if math.isnan(port_coords_x):
             continue
-        dist_to_port_i = distance(site_coords, port_coords)   # closest ports by geo distance!
+        dist_to_port_i = site_dist[ind_port]
         dist_to_port_vec.append( [dist_to_port_i, ind_port, port_data['Name [-]'][ind_port]] )
     closest_ports_all=sorted(dist_to_port_vec)
     # furthest_ports_all = closest_ports_all.reverse()
@@ -345,8 +386,7 @@ def OM_port(hydrodynamic_outputs, wp6_outputs, port_data):
 
         if math.isnan(port_coords_x):
             continue
-        # dist_to_port_i = transit_algorithm(site_coords, port_coords)
-        dist_to_port_i = distance(site_coords, port_coords)  # simplification just for testing
+        dist_to_port_i = closest_ports_n[ind_closest_port][0]
         dist_to_clost_port_vec.append(dist_to_port_i)
         min_dist_to_clst_port = min(dist_to_clost_port_vec)
         if min_dist_to_clst_port == dist_to_port_i:
@@ -5,17 +5,18 @@ Created on Mon Nov 30 10:04:16 2015
 @author: pcvicente adapted from acollin
 """
 
-import csv
-import matplotlib.pyplot as plt
-import networkx as nx
-import pickle
 import utm
-import timeit
 
+from sea_grid import load_sea_grid
 
 
-def transit_algorithm(point_INI, point_FIN):
 
+def transit_algorithm(point_INI, point_FIN, folder=None):
+    """
+    transit_algorithm returns the length [km] of the shortest sea route
+    between two points defined in the UTM coordinate system, the sea grid
+    being loaded only once per process (see sea_grid.load_sea_grid)
+    """
 
     ini_x_utm = point_INI[0]
     ini_y_utm = point_INI[1]
@@ -26,158 +27,54 @@ def transit_algorithm(point_INI, point_FIN):
     fin_zone_utm = point_FIN[2]
 
 
-    # [LAT_INI, LONG_INI] = utm.to_latlon(ini_x_utm, ini_y_utm, int(ini_zone_utm[0:2]), str(ini_zone_utm[3]))
-    # [LAT_FIN, LONG_FIN] = utm.to_latlon(fin_x_utm, fin_y_utm, int(fin_zone_utm[0:2]), str(fin_zone_utm[3]))
-
-
-
-    ### Loading the water points off the European Coast:
-    num_points = 1
-    lat_i = []
-    long_i = []
-    with open('Point_DTOcean_0.csv', 'rb') as csvfile:
-        datareader = csv.reader(csvfile, delimiter='\t')
-        for row in datareader:
-            # print num_points
-            # print ', '.join(row)
-
-            if num_points<=1000:
-                lat_i.append(float(row[2])/1e15)
-                long_i.append(float(row[3])/1e15)
-
-            elif num_points==1001:
-                lat_i.append(float(row[3])/1e15)
-                long_i.append(float(row[4])/1e15)
-
-            elif num_points>=1001:
-                if num_points%1000==0 or (num_points-1)%1000==0:
-                    lat_i.append(float(row[3])/1e15)
-                    long_i.append(float(row[4])/1e15)
-                else:
-                    lat_i.append(float(row[4])/1e15)
-                    long_i.append(float(row[5])/1e15)
-
-            if (long_i[num_points-1]<1 and long_i[num_points-1]>0) or (long_i[num_points-1]>-1 and long_i[num_points-1]<0):
-                long_i[num_points-1] = long_i[num_points-1]*1e15
-
-            num_points = num_points+1
-
-    delt_lat = abs(lat_i[1168] - lat_i[0])
-    delt_long = abs(long_i[1] - long_i[0])
-
-
-
-    ### Loading of the graph
-    start_time = timeit.default_timer()
-    graph = pickle.load( open( "graph_sea_european_sea.p", "rb" ) )
-    print '» graph loaded'
-    stop_time = timeit.default_timer()
-    print 'duration [s]:'
-    print stop_time - start_time
-
-
 
+    ### Loading of the sea grid (once per process):
+    grid = load_sea_grid(folder)
 
 
 
     ### Coordinates of the locations to graph points:
-    ERROR_POINTS = delt_long/2
-
     [LAT_INI, LONG_INI] = utm.to_latlon(ini_x_utm, ini_y_utm, int(ini_zone_utm[0:2]), str(ini_zone_utm[3]))
-    found_point_INI=0
-    for point_vec in range(len(lat_i)):
-
-        LAT_ini = lat_i[point_vec]
-        LONG_ini = long_i[point_vec]
-        # print [LAT, LONG]
-
-        if LAT_ini>LAT_INI-ERROR_POINTS and LAT_ini<LAT_INI+ERROR_POINTS:
-            if LONG_ini>LONG_INI-ERROR_POINTS and LONG_ini<LONG_INI+ERROR_POINTS:
-                if graph.has_node(point_vec):
-                    point_INI = point_vec
-                    found_point_INI=1
-                    # print point_INI
-                    break
-
-    if found_point_INI==0:
+    start = grid.snap(LAT_INI, LONG_INI)  # port
+    if start is None:
         print 'ERROR: initial coordinates not accurate'
 
-
-
     [LAT_FIN, LONG_FIN] = utm.to_latlon(fin_x_utm, fin_y_utm, int(fin_zone_utm[0:2]), str(fin_zone_utm[3]))
-    found_point_FIN=0
-    for point_vec in range(len(lat_i)):
-
-        LAT_fin = lat_i[point_vec]
-        LONG_fin = long_i[point_vec]
-        # print [LAT, LONG]
-
-        if LAT_fin>LAT_FIN-ERROR_POINTS and LAT_fin<LAT_FIN+ERROR_POINTS:
-            if LONG_fin>LONG_FIN-ERROR_POINTS and LONG_fin<LONG_FIN+ERROR_POINTS:
-                if graph.has_node(point_vec):
-                    point_FIN = point_vec
-                    found_point_FIN=1
-                    # print point_FIN
-                    break
-
-    if found_point_FIN==0:
+    end = grid.snap(LAT_FIN, LONG_FIN)  # array location
+    if end is None:
         print 'ERROR: final coordinates not accurate'
 
-
-
-    ### define start and end point:
-    start = point_INI # port
-    end = point_FIN # array location
+    if start is None or end is None:
+        return float('nan')
 
 
 
     ### Calculate route:
-    print '» routing!'
-    start_time = timeit.default_timer()
-    # print start_time
-
-    # if path exists, run this
-    if nx.has_path(graph,start,end):
-        route = nx.dijkstra_path(graph,start,end)
-        route_length = nx.dijkstra_path_length(graph,start,end)
-
-    stop_time = timeit.default_timer()
-    # print stop_time
-    print 'duration [s]:'
-    print stop_time - start_time
+    route, route_length = grid.shortest_path(start, end)
 
+    return route_length
 
-    #print '* route:'
-    #print route
-    print '* distance [km]:'
-    print route_length
 
 
+def plot_route(route, folder=None):
+    """
+    plot_route plots the water points off the European coast and a route
+    returned by SeaGrid.shortest_path
+    """
+    import matplotlib.pyplot as plt
 
-
-    ### Plot route on map:
-    LONG_ROUTE = []
-    LAT_ROUTE = []
-    for ind_rout in range(len(route)):
-        LONG_ROUTE.append(long_i[route[ind_rout]])
-        LAT_ROUTE.append(lat_i[route[ind_rout]])
-
+    grid = load_sea_grid(folder)
 
     plt.figure()
 
     # european sea points:
-    plt.plot(long_i,lat_i, 'ro')
+    plt.plot(grid.lon, grid.lat, 'ro')
 
     # origin and destination points:
-    plt.plot(LONG_ini,LAT_ini, 'yo')
-    plt.plot(LONG_fin,LAT_fin, 'yo')
+    plt.plot(grid.lon[route[0]], grid.lat[route[0]], 'yo')
+    plt.plot(grid.lon[route[-1]], grid.lat[route[-1]], 'yo')
 
     # route:
-    plt.plot(LONG_ROUTE,LAT_ROUTE,'y-')
+    plt.plot(grid.lon[route], grid.lat[route], 'y-')
 
     plt.show()
-
-
-
-
-    return route_length
\ No newline at end of file
@@ -11,55 +11,62 @@ source and WP5 package, so it becomes simple to shift from the temporary .xlsx
 and .csv files to the final SQL solution.
 """
 
-import pandas as pd
-
 from ..phases import VesselType
 from ..phases import EquipmentType
+from .cache import parse_excel, parse_excel_sheets
 
 
-def load_time_olc_data(file_path):
+def load_time_olc_data(file_path, snapshot=None):
     """Imports olc database into a panda table
 
     Parameters
     ----------
     file_path : string
      the folder path of the time and olc data set
+    snapshot : Snapshot
+     snapshot of the input data sets, read instead of the database if it
+     contains the 'schedule_OLC' data set
 
     Returns
     -------
     time_olc : dict
      dictionnary containing a panda dataframe with time duration and olc
     """
-    # Transform time and olc database .xls into panda type
-    excel = pd.ExcelFile(file_path)
-    # Collect data from a particular tab
-    time_olc = excel.parse('operations', header=0, index_col=0)
+    if snapshot is not None and 'schedule_OLC' in snapshot:
+        return snapshot['schedule_OLC']
+
+    # Collect data from a particular tab of the .xls database (cached)
+    time_olc = parse_excel(file_path, 'operations')
 
     return time_olc
 
 
 
-def load_phase_order_data(file_path):
+def load_phase_order_data(file_path, snapshot=None):
     """Imports phase order database into a panda table
 
     Parameters
     ----------
     file_path : string
      the folder path of the phase order table
+    snapshot : Snapshot
+     snapshot of the input data sets, read instead of the database if it
+     contains the 'phase_order' data set
 
     Returns
     -------
     phase_order : dict
      dictionnary containing a panda dataframe with time duration and olc
     """
-    # Transform phase table .xls into panda type
-    excel = pd.ExcelFile(file_path)
-    # Collect data from a particular tab
-    phase_order = excel.parse('InstallationOrder', header=0, index_col=0)
+    if snapshot is not None and 'phase_order' in snapshot:
+        return snapshot['phase_order']
+
+    # Collect data from a particular tab of the .xls database (cached)
+    phase_order = parse_excel(file_path, 'InstallationOrder')
 
     return phase_order
 
-def load_eq_rates(file_path):
+def load_eq_rates(file_path, snapshot=None):
     """Imports pile driving penetration rates and cable laying/trenching/burial
     rates into two panda tables
 
@@ -67,6 +74,9 @@ def load_eq_rates(file_path):
     ----------
     file_path : string
      the folder path of the phase order table
+    snapshot : Snapshot
+     snapshot of the input data sets, read instead of the database if it
+     contains the 'eq_rates' data set
 
     Returns
     -------
@@ -74,21 +84,26 @@ def load_eq_rates(file_path):
      panda table containing the pile driving vertical penetration rates and the
      cable laying/trenching/burial horizontal progress rates
     """
-    # Transform equipment performance rates table .xls into panda type
-    excel = pd.ExcelFile(file_path)
-    # Collect data from a particular tab
-    penet_rates = excel.parse('penet', header=0, index_col=0)
-    laying_rates = excel.parse('laying', header=0, index_col=0)
+    if snapshot is not None and 'eq_rates' in snapshot:
+        return snapshot['eq_rates']
+
+    # Collect data from particular tabs of the .xls database (cached)
+    sheets = parse_excel_sheets(file_path, ['penet', 'laying'])
+    penet_rates = sheets['penet']
+    laying_rates = sheets['laying']
 
     return penet_rates, laying_rates
 
-def load_sf(file_path):
+def load_sf(file_path, snapshot=None):
     """Imports safety factors into a panda table
 
     Parameters
     ----------
     file_path : string
      the folder path of the phase order table
+    snapshot : Snapshot
+     snapshot of the input data sets, read instead of the database if it
+     contains the 'safety_factors' data set
 
     Returns
     -------
@@ -96,16 +111,18 @@ def load_sf(file_path):
      panda table containing the safety factors to apply on the feasiblity
      functions
     """
-    # Transform equipment performance rates table .xls into panda type
-    excel = pd.ExcelFile(file_path)
-    # Collect data from a particular tab
-    port_sf = excel.parse('port_sf', header=0, index_col=0)
-    vessel_sf = excel.parse('vessel_sf', header=0, index_col=0)
-    eq_sf = excel.parse('eq_sf', header=0, index_col=0)
+    if snapshot is not None and 'safety_factors' in snapshot:
+        return snapshot['safety_factors']
+
+    # Collect data from particular tabs of the .xls database (cached)
+    sheets = parse_excel_sheets(file_path, ['port_sf', 'vessel_sf', 'eq_sf'])
+    port_sf = sheets['port_sf']
+    vessel_sf = sheets['vessel_sf']
+    eq_sf = sheets['eq_sf']
 
     return port_sf, vessel_sf, eq_sf
 
-def load_vessel_data(file_path):
+def load_vessel_data(file_path, snapshot=None):
     """Imports vessel database into panda dataframe and creates a class for each
     vessel type
 
@@ -113,16 +130,20 @@ def load_vessel_data(file_path):
     ----------
     file_path : string
      the folder path of the vessel database
+    snapshot : Snapshot
+     snapshot of the input data sets, read instead of the database if it
+     contains the 'vessels' data set
 
     Returns
     -------
     vessels : dict
      dictionnary containing all classes defining the different vessel types
     """
-    # Transform vessel database .xls into panda type
-    excel = pd.ExcelFile(file_path)
-    # Collect data from a particular tab
-    pd_vessel = excel.parse('Python_Format', header=0, index_col=0)
+    if snapshot is not None and 'vessels' in snapshot:
+        return snapshot['vessels']
+
+    # Collect data from a particular tab of the .xls database (cached)
+    pd_vessel = parse_excel(file_path, 'Python_Format')
 
     # Splits the pd_vessel object with the full dataset, into smaller panda
     # objects with specific vessel types. Each vessel object is initiated with
@@ -148,7 +169,7 @@ def load_vessel_data(file_path):
     return vessels
 
 
-def load_equipment_data(file_path):
+def load_equipment_data(file_path, snapshot=None):
     """Imports equipment database into panda dataframe    hammer = excel.parse('hammer', header=0, index_col=0)
 s and creates a class for
     each equipment type
@@ -157,27 +178,35 @@ s and creates a class for
     ----------
     file_path : string
      the folder path of the equipment database
+    snapshot : Snapshot
+     snapshot of the input data sets, read instead of the database if it
+     contains the 'equipments' data set
 
     Returns
     -------
     vessels : dict
      dictionnary containing all classes defining the different equipment types
     """
-
-    # Transform Equipment database .xls into panda type
-    excel = pd.ExcelFile(file_path)
-
-    # Collect data from a particular tab
-    rov = excel.parse('rov', header=0, index_col=0)
-    divers = excel.parse('divers', header=0, index_col=0)
-    cable_burial = excel.parse('cable_burial', header=0, index_col=0)
-    excavating = excel.parse('excavating', header=0, index_col=0)
-    mattress = excel.parse('mattress', header=0, index_col=0)
-    rock_filter_bags = excel.parse('rock_filter_bags', header=0, index_col=0)
-    split_pipe = excel.parse('split_pipe', header=0, index_col=0)
-    hammer = excel.parse('hammer', header=0, index_col=0)
-    drilling_rigs = excel.parse('drilling_rigs', header=0, index_col=0)
-    vibro_driver = excel.parse('vibro_driver', header=0, index_col=0)
+    if snapshot is not None and 'equipments' in snapshot:
+        return snapshot['equipments']
+
+
+    # Collect data from particular tabs of the .xls database (cached)
+    sheets = parse_excel_sheets(file_path, ['rov', 'divers', 'cable_burial',
+                                            'excavating', 'mattress',
+                                            'rock_filter_bags', 'split_pipe',
+                                            'hammer', 'drilling_rigs',
+                                            'vibro_driver'])
+    rov = sheets['rov']
+    divers = sheets['divers']
+    cable_burial = sheets['cable_burial']
+    excavating = sheets['excavating']
+    mattress = sheets['mattress']
+    rock_filter_bags = sheets['rock_filter_bags']
+    split_pipe = sheets['split_pipe']
+    hammer = sheets['hammer']
+    drilling_rigs = sheets['drilling_rigs']
+    vibro_driver = sheets['vibro_driver']
 
     # Define equipment types by invoking EquipmentType class
     equipments = {'rov': EquipmentType("rov", rov),
@@ -195,23 +224,27 @@ s and creates a class for
     return equipments
 
 
-def load_port_data(file_path):
+def load_port_data(file_path, snapshot=None):
     """Imports port database into a panda table
 
     Parameters
     ----------
     file_path : string
      the folder path of the port database
+    snapshot : Snapshot
+     snapshot of the input data sets, read instead of the database if it
+     contains the 'ports' data set
 
     Returns
     -------
     vessels : dict
      dictionnary containing a panda dataframe with all ports
     """
-    # Transform vessel database .xls into panda type
-    excel = pd.ExcelFile(file_path)
-    # Collect data from a particular tab
-    ports = excel.parse('python', header=0, index_col=0)
+    if snapshot is not None and 'ports' in snapshot:
+        return snapshot['ports']
+
+    # Collect data from a particular tab of the .xls database (cached)
+    ports = parse_excel(file_path, 'python')
 
     return ports
 
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+@author: WavEC Offshore Renewables
+email: boris.teillant@wavec.org; paulo@wavec.org
+
+This module provides an on-disk cache for the .xlsx databases imported by the
+load functions. Each sheet parsed from a workbook is stored as a binary pickle
+of the panda dataframe (column blocks are serialised directly, no re-parsing),
+keyed by the content hash of the workbook. The workbook is only opened with
+xlrd when its content changed since the last run.
+
+BETA VERSION NOTES: the cache folder defaults to a '.cache' folder next to the
+workbooks and can be relocated with the DTOCEAN_CACHE_DIR environment variable.
+The entries of a workbook are named after the workbook and a hash of its
+absolute path, so that workbooks of the same name in different folders can
+share a relocated cache folder.
+"""
+
+import os
+import json
+import hashlib
+import warnings
+
+import pandas as pd
+
+CACHE_ENV = 'DTOCEAN_CACHE_DIR'
+CACHE_VERSION = 1
+
+
+def cache_dir(file_path):
+    """Returns the folder where the cached sheets of a workbook are stored
+    """
+    if os.environ.get(CACHE_ENV):
+        return os.environ[CACHE_ENV]
+    return os.path.join(os.path.dirname(os.path.abspath(file_path)), '.cache')
+
+
+def entry_name(file_path):
+    """Returns the prefix of the cache entries of a workbook: its name and a
+    hash of its absolute path
+    """
+    file_path = os.path.abspath(file_path)
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    return '{0}-{1}'.format(name, hashlib.sha1(file_path).hexdigest()[:8])
+
+
+def file_digest(file_path, block_size=1 << 20):
+    """Returns the sha1 hex digest of the content of a file
+    """
+    sha = hashlib.sha1()
+    with open(file_path, 'rb') as f:
+        block = f.read(block_size)
+        while block:
+            sha.update(block)
+            block = f.read(block_size)
+    return sha.hexdigest()
+
+
+def workbook_digest(file_path):
+    """Returns the content digest of a workbook. The digest is stored in a
+    manifest together with the mtime and size of the workbook, so that the
+    file is only hashed again when one of these changed.
+    """
+    stat = os.stat(file_path)
+    manifest_path = os.path.join(cache_dir(file_path),
+                                 entry_name(file_path) + '.json')
+
+    manifest = {}
+    if os.path.isfile(manifest_path):
+        try:
+            with open(manifest_path, 'r') as f:
+                manifest = json.load(f)
+        except ValueError:
+            manifest = {}
+
+    if (manifest.get('version') == CACHE_VERSION and
+            manifest.get('mtime') == stat.st_mtime and
+            manifest.get('size') == stat.st_size):
+        return manifest['digest']
+
+    digest = file_digest(file_path)
+    manifest = {'version': CACHE_VERSION,
+                'mtime': stat.st_mtime,
+                'size': stat.st_size,
+                'digest': digest}
+
+    def dump_manifest(path):
+        with open(path, 'w') as f:
+            json.dump(manifest, f)
+
+    write_file(manifest_path, dump_manifest)
+
+    return digest
+
+
+def sheet_path(file_path, digest, sheet_name, header, index_col):
+    """Returns the path of the cached sheet of a workbook
+    """
+    key = hashlib.sha1(repr((CACHE_VERSION, sheet_name, header, index_col)))
+    fname = '{0}-{1}-{2}.pkl'.format(entry_name(file_path), digest[:16],
+                                     key.hexdigest()[:8])
+    return os.path.join(cache_dir(file_path), fname)
+
+
+def write_file(path, writer):
+    """Writes a cache entry through a temporary file so that an interrupted
+    run never leaves a truncated entry behind. Failures (e.g. read-only
+    database folder) only disable the cache.
+    """
+    tmp_path = path + '.tmp'
+    try:
+        folder = os.path.dirname(path)
+        if not os.path.isdir(folder):
+            os.makedirs(folder)
+        writer(tmp_path)
+        if os.path.exists(path):
+            os.remove(path)
+        os.rename(tmp_path, path)
+    except (IOError, OSError) as err:
+        warnings.warn("database cache not written: {0}".format(err))
+
+
+def parse_excel_sheets(file_path, sheet_names, header=0, index_col=0):
+    """Imports several sheets of a workbook into panda dataframes, reading
+    them from the cache when the workbook is unchanged
+
+    Parameters
+    ----------
+    file_path : string
+     the folder path of the workbook
+    sheet_names : list
+     names of the sheets to be imported
+    header, index_col : integer
+     passed to ExcelFile.parse
+
+    Returns
+    -------
+    sheets : dict
+     dictionnary containing a panda dataframe per sheet name
+    """
+    digest = workbook_digest(file_path)
+
+    sheets = {}
+    excel = None
+    for sheet_name in sheet_names:
+        path = sheet_path(file_path, digest, sheet_name, header, index_col)
+        if os.path.isfile(path):
+            try:
+                sheets[sheet_name] = pd.read_pickle(path)
+                continue
+            except Exception:
+                # corrupted or incompatible entry, parse it again
+                pass
+
+        if excel is None:
+            excel = pd.ExcelFile(file_path)
+        sheets[sheet_name] = excel.parse(sheet_name, header=header,
+                                         index_col=index_col)
+        write_file(path, lambda tmp: pd.to_pickle(sheets[sheet_name], tmp))
+
+    return sheets
+
+
+def parse_excel(file_path, sheet_name, header=0, index_col=0):
+    """Imports one sheet of a workbook into a panda dataframe, reading it
+    from the cache when the workbook is unchanged
+    """
+    return parse_excel_sheets(file_path, [sheet_name], header,
+                              index_col)[sheet_name]
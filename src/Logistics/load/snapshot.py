@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+@author: WavEC Offshore Renewables
+email: boris.teillant@wavec.org; paulo@wavec.org
+
+This module stores the input data sets of WP5 (databases and upstream module
+outputs) into named snapshots, so that a set of inputs can be saved once and
+reused across runs. Each data set is written to its own file and listed in a
+manifest together with its schema (column names of every panda dataframe), so
+that a snapshot is only deserialised dataset by dataset, on first access, and
+checked against the schema recorded when it was saved. A snapshot is saved
+with a key, e.g. the digest of the workbooks it was imported from, and is
+only valid for the same key. A data set which cannot be deserialised (e.g.
+pickled by another pandas version) is reported as missing from the snapshot,
+so that it is imported again.
+
+BETA VERSION NOTES: the snapshots folder defaults to a 'snapshots' folder next
+to the databases and can be relocated with the DTOCEAN_SNAPSHOT_DIR
+environment variable.
+"""
+
+import os
+import json
+import pickle
+import hashlib
+import time
+import warnings
+
+import pandas as pd
+
+SNAPSHOT_ENV = 'DTOCEAN_SNAPSHOT_DIR'
+SNAPSHOT_VERSION = 1
+MANIFEST = 'manifest.json'
+DEFAULT_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            '..', '..', 'databases', 'snapshots')
+
+
+def snapshot_root(root=None):
+    """Returns the folder containing all snapshots
+    """
+    if root is not None:
+        return root
+    return os.environ.get(SNAPSHOT_ENV, DEFAULT_ROOT)
+
+
+def dataset_schema(data):
+    """Returns a json serialisable description of the structure of a data set:
+    column names for the panda dataframes, keys for the dictionnaries and the
+    panda dataframe of the vessel and equipment classes
+    """
+    if isinstance(data, pd.DataFrame):
+        return {'columns': [unicode(col) for col in data.columns]}
+    elif isinstance(data, dict):
+        return dict((unicode(key), dataset_schema(data[key])) for key in data)
+    elif isinstance(data, (list, tuple)):
+        return [dataset_schema(item) for item in data]
+    elif hasattr(data, 'panda'):
+        return {'id': unicode(data.id), 'panda': dataset_schema(data.panda)}
+    else:
+        return type(data).__name__
+
+
+def save_snapshot(name, datasets, root=None, key=None):
+    """Saves a dict of data sets into a named snapshot, one file per data set
+
+    Parameters
+    ----------
+    name : string
+     name of the snapshot
+    datasets : dict
+     dictionnary containing the data sets to be saved, e.g. 'vessels',
+     'user_inputs', 'MF_outputs'
+    root : string
+     folder containing the snapshots
+    key : string
+     key of the snapshot, e.g. the digest of the source databases
+
+    Returns
+    -------
+    snapshot : Snapshot
+     the saved snapshot
+    """
+    folder = os.path.join(snapshot_root(root), name)
+    if not os.path.isdir(folder):
+        os.makedirs(folder)
+
+    manifest = {'version': SNAPSHOT_VERSION,
+                'key': key,
+                'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'datasets': {}}
+
+    for key, data in datasets.items():
+        fname = '{0}.pickle'.format(key)
+        payload = pickle.dumps(data, pickle.HIGHEST_PROTOCOL)
+        with open(os.path.join(folder, fname), 'wb') as f:
+            f.write(payload)
+        manifest['datasets'][key] = {'file': fname,
+                                     'sha1': hashlib.sha1(payload).hexdigest(),
+                                     'schema': dataset_schema(data)}
+
+    # the manifest is written last so that an interrupted save is not valid
+    with open(os.path.join(folder, MANIFEST), 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+
+    return Snapshot(name, root)
+
+
+def has_snapshot(name, root=None, key=None):
+    """Checks if a named snapshot exists, saved with the given key if any
+    """
+    manifest_path = os.path.join(snapshot_root(root), name, MANIFEST)
+    if not os.path.isfile(manifest_path):
+        return False
+    if key is None:
+        return True
+    try:
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+    except ValueError:
+        return False
+    return (manifest.get('version') == SNAPSHOT_VERSION and
+            manifest.get('key') == key)
+
+
+class Snapshot(object):
+    """
+    Snapshot gives dict-like and lazy access to the data sets of a named
+    snapshot. A data set is only read from disk on its first access, then
+    checked against the integrity digest and the schema of the manifest. The
+    data sets which cannot be read are listed in failed and are not part of
+    the snapshot anymore.
+    """
+
+    def __init__(self, name, root=None):
+        self.name = name
+        self.folder = os.path.join(snapshot_root(root), name)
+
+        manifest_path = os.path.join(self.folder, MANIFEST)
+        if not os.path.isfile(manifest_path):
+            raise IOError("snapshot '{0}' not found in {1}".format(
+                name, snapshot_root(root)))
+        with open(manifest_path, 'r') as f:
+            self.manifest = json.load(f)
+
+        if self.manifest.get('version') != SNAPSHOT_VERSION:
+            raise ValueError("snapshot '{0}' has version {1}, expected {2}; "
+                             "it must be saved again".format(
+                                 name, self.manifest.get('version'),
+                                 SNAPSHOT_VERSION))
+
+        self.loaded = {}
+        self.failed = set()
+
+    def keys(self):
+        return [key for key in self.manifest['datasets']
+                if key not in self.failed]
+
+    def __contains__(self, key):
+        # the data set is read here, so that the loaders import it from the
+        # databases instead when it cannot be deserialised
+        if key not in self.manifest['datasets'] or key in self.failed:
+            return False
+        if key not in self.loaded:
+            try:
+                self.loaded[key] = self.read(key)
+            except Exception as err:
+                warnings.warn("data set '{0}' of snapshot '{1}' not read: "
+                              "{2}".format(key, self.name, err))
+                self.failed.add(key)
+                return False
+        return True
+
+    def __getitem__(self, key):
+        if key not in self.loaded:
+            self.loaded[key] = self.read(key)
+        return self.loaded[key]
+
+    def read(self, key):
+        """Deserialises one data set and checks it against the manifest
+        """
+        if key not in self.manifest['datasets']:
+            raise KeyError("data set '{0}' not in snapshot '{1}'".format(
+                key, self.name))
+        entry = self.manifest['datasets'][key]
+
+        with open(os.path.join(self.folder, entry['file']), 'rb') as f:
+            payload = f.read()
+        if hashlib.sha1(payload).hexdigest() != entry['sha1']:
+            raise ValueError("data set '{0}' of snapshot '{1}' is "
+                             "corrupted".format(key, self.name))
+
+        data = pickle.loads(payload)
+        if dataset_schema(data) != entry['schema']:
+            raise ValueError("data set '{0}' of snapshot '{1}' does not match "
+                             "its schema".format(key, self.name))
+
+        return data
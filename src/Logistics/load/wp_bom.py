@@ -12,30 +12,35 @@ database source and WP5 package, so it becomes simple to shift from
 the temporary .xlsx and .csv files to the final SQL solution.
 """
 
-import pandas as pd
+from .cache import parse_excel, parse_excel_sheets
 
-def load_user_inputs(file_path_device):
+def load_user_inputs(file_path_device, snapshot=None):
     """Imports WP1 data set into panda dataframes.
 
     Parameters
     ----------
     file_path_device : string
      the folder path of the device database
+    snapshot : Snapshot
+     snapshot of the input data sets, read instead of the database if it
+     contains the 'user_inputs' data set
 
     Returns
     -------
     WP1_BoM : dict
      dictionnary containing all required inputs to WP5 coming from WP1/end-user
     """
-    # Transform the .xls database into panda type
-    excel = pd.ExcelFile(file_path_device)
-
-    # Collect data from a particular .xls tab
-    site = excel.parse('site', header=0, index_col=0)
-    metocean = excel.parse('metocean', header=0, index_col=0)
-    device = excel.parse('device', header=0, index_col=0)
-    sub_device = excel.parse('sub_device', header=0, index_col=0)
-    landfall = excel.parse('landfall', header=0, index_col=0)
+    if snapshot is not None and 'user_inputs' in snapshot:
+        return snapshot['user_inputs']
+
+    # Collect data from particular .xls tabs (cached)
+    sheets = parse_excel_sheets(file_path_device, ['site', 'metocean', 'device',
+                                                   'sub_device', 'landfall'])
+    site = sheets['site']
+    metocean = sheets['metocean']
+    device = sheets['device']
+    sub_device = sheets['sub_device']
+    landfall = sheets['landfall']
 
     # Splits the different dataset through different dict keys()
     user_inputs = {'site': site,
@@ -48,111 +53,109 @@ def load_user_inputs(file_path_device):
     return user_inputs
 
 
-def load_hydrodynamic_outputs(file_path):
+def load_hydrodynamic_outputs(file_path, snapshot=None):
     """Imports WP2 data set into panda dataframes.
 
     Parameters
     ----------
     file_path : string
      the folder path of the WP2 database
+    snapshot : Snapshot
+     snapshot of the input data sets, read instead of the database if it
+     contains the 'hydrodynamic_outputs' data set
 
     Returns
     -------
     WP2_BoM : dict
      dictionnary containing all required inputs to WP5 coming from WP2
     """
-    # Transform the .xls database into panda type
-    excel = pd.ExcelFile(file_path)
+    if snapshot is not None and 'hydrodynamic_outputs' in snapshot:
+        return snapshot['hydrodynamic_outputs']
 
-    # Collect data from a particular tab
-    hydrodynamic_outputs = excel.parse('Units', header=0, index_col=0)
+    # Collect data from a particular tab of the .xls database (cached)
+    hydrodynamic_outputs = parse_excel(file_path, 'Units')
 
     return hydrodynamic_outputs
 
 
-def load_electrical_outputs(file_path):
+def load_electrical_outputs(file_path, snapshot=None):
     """Imports WP3 data set into panda dataframes.
 
     Parameters
     ----------
     file_path : string
      the folder path of the WP3 database
+    snapshot : Snapshot
+     snapshot of the input data sets, read instead of the database if it
+     contains the 'electrical_outputs' data set
 
     Returns
     -------
     WP3_BoM : dict
      dictionnary containing all required inputs to WP5 coming from WP3
     """
-    # Transform the .xls database into panda type
-    excel = pd.ExcelFile(file_path)
-
-    # Collect data from a particular tab
-    collection_point = excel.parse('collection point', header=0, index_col=0)
-    dynamic_cable = excel.parse('dynamic cable', header=0, index_col=0)
-    static_cable = excel.parse('static cable', header=0, index_col=0)
-    cable_route = excel.parse('cable route', header=0, index_col=0)
-    connectors = excel.parse('connectors', header=0, index_col=0)
-    external_protection = excel.parse('external protection', header=0, index_col=0)
-    layout = excel.parse('layout', header=0, index_col=0)
-
-    # Splits the different dataset through different dict keys()
-    electrical_outputs = {'collection point': collection_point,
-                          'dynamic cable': dynamic_cable,
-                          'static cable': static_cable,
-                          'cable route': cable_route,
-                          'connectors': connectors,
-                          'external protection': external_protection,
-                          'layout': layout
-                          }
+    if snapshot is not None and 'electrical_outputs' in snapshot:
+        return snapshot['electrical_outputs']
+
+    # Collect data from particular tabs of the .xls database (cached) and
+    # splits the different dataset through different dict keys()
+    electrical_outputs = parse_excel_sheets(file_path, ['collection point',
+                                                        'dynamic cable',
+                                                        'static cable',
+                                                        'cable route',
+                                                        'connectors',
+                                                        'external protection',
+                                                        'layout'])
 
     return electrical_outputs
 
 
-def load_MF_outputs(file_path):
+def load_MF_outputs(file_path, snapshot=None):
     """Imports WP4 data set into panda dataframes.
 
     Parameters
     ----------
     file_path : string
      the folder path of the WP4 database
+    snapshot : Snapshot
+     snapshot of the input data sets, read instead of the database if it
+     contains the 'MF_outputs' data set
 
     Returns
     -------
     WP4_BoM : Dataframe
      Dataframe containing all required inputs to WP5 coming from WP4
     """
-    # Transform the .csv database into panda type
-    excel = pd.ExcelFile(file_path)
+    if snapshot is not None and 'MF_outputs' in snapshot:
+        return snapshot['MF_outputs']
 
-    # Collect data from a particular tab
-    line = excel.parse('line', header=0, index_col=0)
-    foundation = excel.parse('foundation', header=0, index_col=0)
-
-    # Splits the different dataset through different dict keys()
-    MF_outputs = {'line': line,
-                  'foundation': foundation,
-                  }
+    # Collect data from particular tabs of the .xls database (cached) and
+    # splits the different dataset through different dict keys()
+    MF_outputs = parse_excel_sheets(file_path, ['line', 'foundation'])
 
     return MF_outputs
 
 
-def load_OM_outputs(file_path):
+def load_OM_outputs(file_path, snapshot=None):
     """Imports WP6 data set into panda dataframes.
 
     Parameters
     ----------
     file_path : string
      the folder path of the WP6 database
+    snapshot : Snapshot
+     snapshot of the input data sets, read instead of the database if it
+     contains the 'OM_outputs' data set
 
     Returns
     -------
     WP6_BoM : Dataframe
      Dataframe containing all required inputs to WP5 coming from WP6
     """
-    # Transform the .xls database into panda type
-    excel = pd.ExcelFile(file_path)
+    if snapshot is not None and 'OM_outputs' in snapshot:
+        return snapshot['OM_outputs']
 
-    # Collect data from a particular tab
-    OM_outputs = excel.parse('OM', header=0, index_col=0)
+    # Collect data from a particular tab of the .xls database (cached)
+    OM_outputs = parse_excel(file_path, 'OM')
 
     return OM_outputs
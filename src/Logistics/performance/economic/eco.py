@@ -8,85 +8,156 @@ functions to calculate the cost of each solution based on the schedule, day rate
 of vessels and equipments and port economic assessment.
 
 BETA VERSION NOTES: The current version of this module only takes into account
-the day rates of vessels to calculate the cost. This will be expanded to equipment
-and port in the next version of the code.
+the day rates of vessels and equipments to calculate the cost. This will be
+expanded to port in the next version of the code.
 """
 import numpy
-import random
+
+# day rate [€/day] of the vessels and of each type of equipment, as a list of
+# (factor, columns) terms summed, each term being the factor times the product
+# of the values of the columns
+VESSEL_DAY_RATE = [(0.5, ['Op max Day Rate']),
+                   (0.5, ['Op min Day Rate'])]
+
+EQUIPMENT_DAY_RATES = {
+    'rov': [(1, ['ROV day rate [EURO/day]']),
+            (2, ['AE supervisor [-]', 'Supervisor rate [EURO/12h]']),
+            (2, ['AE technician [-]', 'Technician rate [EURO/12h]'])],
+    'divers': [(1, ['Total day rate [EURO/day]'])],
+    'cable_burial': [(1, ['Burial tool day rate [EURO/day]']),
+                     (2, ['Personnel day rate [EURO/12h]'])],
+    'excavating': [(1, ['Excavator day rate [EURO/day]']),
+                   (2, ['Personnel day rate [EURO/12h]'])],
+    'mattress': [(1, ['Cost per unit [EURO]'])],
+    'rock_filter_bags': [(1, ['Cost per unit [EURO]'])],
+    'split_pipe': [(1, ['Cost per unit [EURO]'])],
+    'hammer': [(1, ['Hammer day rate [EURO/day]']),
+               (2, ['Personnel day rate [EURO/12h]'])],
+    'drilling_rigs': [(1, ['Drill rig day rate [EURO/day]']),
+                      (1, ['Personnel day rate [EURO/day]'])],
+    'vibro_driver': [(1, ['Vibro diver day rate [EURO/day]']),  # ?!?!
+                     (1, ['Personnel day rate [EURO/day]'])]}
+
+
+def day_rate(terms, records):
+    """day_rate evaluates a day rate formula for a record, or for all rows of
+    a structured array at once
+    """
+    rate = 0
+    for factor, columns in terms:
+        term = factor
+        for column in columns:
+            term = term * records[column].astype(float)
+        rate = rate + term
+    return rate
+
+
+def day_rate_tables(log_phase):
+    """day_rate_tables returns the day rates [€/day] of all feasible vessels
+    and equipments of the logistic phase, one array per type aligned with the
+    rows of its RecordTable. The day rates with a missing cost are NaN, so
+    that the vessels and equipments without any price data are never taken
+    as free: the costs of the solutions using them are NaN and these
+    solutions are ranked last (see rank.finite)
+    """
+    rates = {'vessel': {}, 'equipment': {}}
+    for ves_type, table in log_phase.tables.get('vessel', {}).items():
+        rates['vessel'][ves_type] = day_rate(VESSEL_DAY_RATE, table.records)
+    for eq_type, table in log_phase.tables.get('equipment', {}).items():
+        rates['equipment'][eq_type] = day_rate(EQUIPMENT_DAY_RATES[eq_type],
+                                               table.records)
+    return rates
+
+
+def solutions_cost(sols, rates, dur_charter):
+    """solutions_cost returns the vessel, equipment and port costs of all
+    solutions of an operation sequence in a single vectorised pass
+
+    Parameters
+    ----------
+    sols : dict
+     the solutions, see compatibility_ve
+    rates : dict
+     the day rates of the vessels and equipments, see day_rate_tables
+    dur_charter : array
+     the charter time [h] of each solution, in the order of the sorted
+     solution keys, see charter_time
+
+    Returns
+    -------
+    sol_cost : dict
+     the 'vessel cost', 'equipment cost' and 'port cost' of each solution
+    """
+    ind_sols = sorted(sols)
+    nb_sol = len(ind_sols)
+
+    # gather the hourly rates of the vessels and equipments of all solutions
+    ves_sol, ves_rate = [], []
+    eq_sol, eq_rate = [], []
+    for pos, ind_sol in enumerate(ind_sols):
+        for ve_sol in sols[ind_sol]['VEs']:
+            ves_sol.append(pos)
+            ves_rate.append(ve_sol[1] * rates['vessel'][ve_sol[0]][ve_sol[2]])
+            for eq in ve_sol[3:]:  # first 3 elements are type, quant and row
+                eq_sol.append(pos)
+                eq_rate.append(eq[1] * rates['equipment'][eq[0]][eq[2]])
+
+    dur_charter = numpy.asarray(dur_charter, dtype=float)
+    vessel_cost = numpy.bincount(numpy.asarray(ves_sol, dtype=int),
+                                 numpy.asarray(ves_rate, dtype=float),
+                                 nb_sol) / 24 * dur_charter  # [€]
+    equip_cost = numpy.bincount(numpy.asarray(eq_sol, dtype=int),
+                                numpy.asarray(eq_rate, dtype=float),
+                                nb_sol) / 24 * dur_charter  # [€]
+    port_cost = numpy.zeros(nb_sol)  # to be improved !!!!!!!! port_total_cost = install_port['Selected base port for installation']['Tonnage charges [euro/GT]']
+
+    sol_cost = {}
+    for pos, ind_sol in enumerate(ind_sols):
+        sol_cost[ind_sol] = {'vessel cost': vessel_cost[pos],
+                             'equipment cost': equip_cost[pos],
+                             'port cost': port_cost[pos]}
+    return sol_cost
+
+
+def charter_time(sched):
+    """charter_time returns the time [h] during which the vessels and
+    equipments of a solution are hired: the preparation at port, the waiting
+    time for a weather window and the sea time of its schedule
+    """
+    return sched['preparation'] + sched['waiting time'] + sched['sea time']
+
+
+def solution_cost(log_phase, seq, ind_sol, sched, rates=None):
+    """solution_cost returns the vessel, equipment and port costs of one
+    feasible solution of the logistic phase for the schedule sched
+    """
+    if rates is None:
+        rates = day_rate_tables(log_phase)
+    sols = {ind_sol: log_phase.op_ve[seq].sol[ind_sol]}
+    return solutions_cost(sols, rates, [charter_time(sched)])[ind_sol]
+
 
 def cost(install, log_phase):
+    """cost returns the vessel, equipment and port costs of all feasible
+    solutions of the logistic phase, for the preparation, waiting and sea
+    times of their schedule as computed in the schedule step
+    """
 
     sol = {}
-    sched = {}
-    sched ['sea time'] =  random.choice([10, 25, 32, 48, 56])
-    sched ['waiting time'] = random.choice([2, 6, 9, 15, 22])
+
+    rates = day_rate_tables(log_phase)
 
     # loop over the number of operation sequencing options
     for seq in range(len(log_phase.op_ve)):
 
-        # loop over the number of solutions, i.e feasible combinations of port/vessel(s)/equipment(s)
-        for ind_sol in range(len(log_phase.op_ve[seq].sol)):
-
-            # sched = log_phase.op_ve[seq].sol[sol].schedule  # CHANGE !!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!
-
-            dur_sea_wait = sched['sea time'] + sched['waiting time']
-            nb_ves_type = len(log_phase.op_ve[seq].sol[ind_sol]['VEs'])
-
-            # loop over the nb of vessel types
-            vessel_cost = []
-            equip_cost_ves = []
-            for vt in range(nb_ves_type):
-
-                qty_vt = log_phase.op_ve[0].sol[ind_sol]['VEs'][vt][1]
-                ves_data = log_phase.op_ve[seq].sol[ind_sol]['VEs'][vt][2]
-
-                op_cost_max = ves_data['Op max Day Rate']
-                op_cost_min = ves_data['Op min Day Rate']
-                vessel_cost_h = numpy.mean([op_cost_max, op_cost_min]) / 24  # [€/hour]
-                vessel_cost.append ( qty_vt * (vessel_cost_h * dur_sea_wait) )
-
-                # check if vessel carries any equipment
-                nr_equip = len(log_phase.op_ve[0].sol[ind_sol]['VEs'][vt]) - 3  #  first 3 elements are type, quant and series
-
-                equip_cost_eq_i = []
-                for eqp in range(nr_equip):
-                    eq_type = log_phase.op_ve[0].sol[ind_sol]['VEs'][vt][3+eqp][0]
-                    qty_eqp = log_phase.op_ve[0].sol[ind_sol]['VEs'][vt][3+eqp][1]
-                    eq_data = log_phase.op_ve[0].sol[ind_sol]['VEs'][vt][3+eqp][2]
-
-                    if eq_type == 'rov':
-                        eq_cost = eq_data['ROV day rate [EURO/day]'] + \
-                                  eq_data['AE supervisor [-]']*eq_data['Supervisor rate [EURO/12h]']*2 + \
-                                  eq_data['AE technician [-]']*eq_data['Technician rate [EURO/12h]']*2  # [€/day]
-                    elif eq_type == 'divers':
-                        eq_cost = eq_data['Total day rate [EURO/day]'] # [€/day]
-                    elif eq_type == 'cable_burial':
-                        eq_cost = eq_data['Burial tool day rate [EURO/day]'] + eq_data['Personnel day rate [EURO/12h]']*2 # [€/day]
-                    elif eq_type == 'excavating':
-                        eq_cost = eq_data['Excavator day rate [EURO/day]'] + eq_data['Personnel day rate [EURO/12h]']*2 # [€/day]
-                    elif eq_type == 'mattress':
-                        eq_cost = eq_data['Cost per unit [EURO]']
-                    elif eq_type == 'rock_filter_bags':
-                        eq_cost = eq_data['Cost per unit [EURO]']
-                    elif eq_type == 'split_pipe':
-                        eq_cost = eq_data['Cost per unit [EURO]']
-                    elif eq_type == 'hammer':
-                        eq_cost = eq_data['Hammer day rate [EURO/day]'] + eq_data['Personnel day rate [EURO/12h]']*2 # [€/day]
-                    elif eq_type == 'drilling_rigs':
-                        eq_cost = eq_data['Drill rig day rate [EURO/day]'] + eq_data['Personnel day rate [EURO/day]'] # [€/day]
-                    elif eq_type == 'vibro_driver': # ?!?!
-                        eq_cost = eq_data['Vibro diver day rate [EURO/day]'] + eq_data['Personnel day rate [EURO/day]'] # [€/day]
-
-
-                    eq_cost_h = eq_cost / 24  # [€/hour]
-                    equip_cost_eq_i.append ( qty_eqp * (eq_cost_h * dur_sea_wait) )
-                equip_cost_ves.append ( sum(equip_cost_eq_i) )
-
-            equip_total_cost = sum(equip_cost_ves)
-            vessel_total_cost = sum(vessel_cost)
-            port_total_cost = 0  # to be improved !!!!!!!! port_total_cost = install_port['Selected base port for installation']['Tonnage charges [euro/GT]']
-
-            log_phase.op_ve[seq].sol_cost[ind_sol] = {'vessel cost': vessel_total_cost, 'equipment cost': equip_total_cost, 'port cost': port_total_cost}
-            sol[seq] = log_phase.op_ve[seq].sol_cost
+        # all solutions, i.e feasible combinations of port/vessel(s)/equipment(s)
+        sols = log_phase.op_ve[seq].sol
+
+        dur_charter = [charter_time(sols[ind_sol]['schedule'])
+                       for ind_sol in sorted(sols)]
+
+        log_phase.op_ve[seq].sol_cost.update(solutions_cost(sols, rates,
+                                                            dur_charter))
+        sol[seq] = log_phase.op_ve[seq].sol_cost
 
     return sol, log_phase
@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+"""
+@author: WavEC Offshore Renewables
+email: boris.teillant@wavec.org; paulo@wavec.org
+
+This module ranks the feasible solutions of a logistic phase and returns only
+the best few, cheapest or fastest, without scheduling and costing all of them.
+It chains the compatibility, schedule and cost steps in a branch-and-bound
+search: each combination of vessels (a branch, whose equipments are still to
+be chosen) is scheduled once, and its lower bound is the hourly rate of its
+cheapest compatible equipments times its charter time. The branches and
+their solutions are explored by increasing bound, and the search stops as soon
+as the bound cannot enter the top-k anymore.
+
+BETA VERSION NOTES: the schedule of a solution is assumed to depend on its
+vessels only, as in the current schedule functions.
+"""
+
+import bisect
+import heapq
+import itertools
+import math
+
+from ..selection.match import compile_rules, candidate_nodes, shape_solution
+from ..selection.match import match_tables
+from .schedule.schedule import sched_solution
+from .economic.eco import day_rate_tables, solution_cost, charter_time
+
+RANK_CRITERIA = ['cost', 'time']
+
+
+def finite(value):
+    """finite returns value, or infinity for a missing (NaN) value so that it
+    is ranked last
+    """
+    value = float(value)
+    if math.isnan(value):
+        return float('inf')
+    return value
+
+
+def hourly_rates(rates, vels, sols_eqs):
+    """hourly_rates returns the hourly rate [€/h] of the vessels of a branch
+    and the hourly rates of its compatible equipments per equipment type,
+    rates being the day rates returned by day_rate_tables
+    """
+    ves_rate = sum(ves_sol[1] * rates['vessel'][ves_sol[0]][ves_sol[2]]
+                   for ves_sol in vels) / 24
+    eq_rates = [[finite(eq_sol[1] * rates['equipment'][eq_sol[0]][eq_sol[2]] / 24)
+                 for eq_sol in eqs] for eqs in sols_eqs]
+    return finite(ves_rate), eq_rates
+
+
+def increasing_rates(sols_eqs, eq_rates):
+    """increasing_rates generates the combinations of equipments of a branch
+    by increasing hourly rate, the equipments of each type being sorted by
+    hourly rate
+
+    Returns
+    -------
+    leaves : generator
+     (hourly rate, equipments) tuples
+    """
+    def rate(pos):
+        return sum(eq_rates[eq_type][ind] for eq_type, ind in enumerate(pos))
+
+    first = (0,) * len(sols_eqs)
+    heap = [(rate(first), first)]
+    seen = set([first])
+    while heap:
+        leaf_rate, pos = heapq.heappop(heap)
+        yield leaf_rate, [sols_eqs[eq_type][ind]
+                          for eq_type, ind in enumerate(pos)]
+        for eq_type in range(len(pos)):
+            if pos[eq_type] + 1 < len(sols_eqs[eq_type]):
+                succ = pos[:eq_type] + (pos[eq_type] + 1,) + pos[eq_type+1:]
+                if succ not in seen:
+                    seen.add(succ)
+                    heapq.heappush(heap, (rate(succ), succ))
+
+
+def rank_key(cost, duration, criterion):
+    """rank_key returns the ranking key of a solution, or the bound of a
+    branch, from its total cost and charter time
+    """
+    if criterion == 'time':
+        return (duration, cost)
+    return (cost,)
+
+
+def best_leaves(branches, top_k, criterion, leaf_cost):
+    """best_leaves explores the branches by increasing lower bound, and the
+    leaves (combinations of equipments) of each branch by increasing hourly
+    rate, and returns the top_k leaves of lowest ranking key. The search
+    stops as soon as the bound of a branch or leaf cannot enter the top_k.
+
+    Parameters
+    ----------
+    branches : list
+     (ves_rate, duration, sols_eqs, eq_rates, branch) tuples: hourly rate
+     [€/h] of the vessels, charter time [h], compatible equipments per type,
+     their hourly rates [€/h] and the data of the branch passed to leaf_cost
+    top_k : int
+     number of leaves to keep
+    criterion : str
+     'cost' or 'time'
+    leaf_cost : function
+     leaf_cost(branch, equips) returns the total cost [€] of a leaf, not
+     lower than its bound, and the data of the leaf
+
+    Returns
+    -------
+    best : list
+     (key, leaf data) tuples of the top_k leaves, by increasing key
+    """
+    sorted_branches = []
+    bounds = []
+    for ves_rate, duration, sols_eqs, eq_rates, branch in branches:
+        # the equipments of each type by increasing hourly rate
+        order = [sorted(range(len(eqs)), key=eq_type_rates.__getitem__)
+                 for eqs, eq_type_rates in zip(sols_eqs, eq_rates)]
+        sols_eqs = [[eqs[ind] for ind in ind_eqs]
+                    for eqs, ind_eqs in zip(sols_eqs, order)]
+        eq_rates = [[eq_type_rates[ind] for ind in ind_eqs]
+                    for eq_type_rates, ind_eqs in zip(eq_rates, order)]
+        leaf_rate = next(increasing_rates(sols_eqs, eq_rates))[0]
+        bound = rank_key(finite((ves_rate + leaf_rate) * duration), duration,
+                         criterion)
+        bounds.append((bound, len(sorted_branches)))
+        sorted_branches.append((ves_rate, duration, sols_eqs, eq_rates, branch))
+    bounds.sort()
+
+    best = []
+    counter = itertools.count()
+    for bound, ind in bounds:
+        if len(best) == top_k and bound >= best[-1][0]:
+            break
+
+        ves_rate, duration, sols_eqs, eq_rates, branch = sorted_branches[ind]
+        for leaf_rate, equips in increasing_rates(sols_eqs, eq_rates):
+            leaf_bound = rank_key(finite((ves_rate + leaf_rate) * duration),
+                                  duration, criterion)
+            if len(best) == top_k and leaf_bound >= best[-1][0]:
+                break
+
+            total, leaf = leaf_cost(branch, equips)
+            key = rank_key(finite(total), duration, criterion)
+            bisect.insort(best, (key, next(counter), leaf))
+            del best[top_k:]
+
+    return [(key, leaf) for key, order, leaf in best]
+
+
+def rank_solutions(x, install, log_phase, log_phase_id, port_chosen_data,
+                   user_inputs, hydrodynamic_outputs, electrical_outputs,
+                   MF_outputs, top_k, criterion='cost'):
+    """rank_solutions returns the top_k best solutions of the logistic phase,
+    scheduled and costed, ranked by total cost ('cost') or by charter time,
+    i.e. preparation, waiting and sea times ('time', ties being broken by
+    total cost)
+
+    Parameters
+    ----------
+    x : int
+     layer of the installation plan
+    install : dict
+     among other data contains the requirements of the logistic phase
+    log_phase : class
+     class of the logistic phase under consideration for assessment
+    log_phase_id : str
+     id of the logistic phase
+    port_chosen_data : Series
+     characteristics of the selected port
+    user_inputs, hydrodynamic_outputs, electrical_outputs, MF_outputs : dict
+     upstream module inputs/outputs, passed to the schedule functions
+    top_k : int
+     number of solutions to keep
+    criterion : str
+     'cost' or 'time'
+
+    Returns
+    -------
+    sol : dict
+     the solutions per sequence, the top_k being ranked across all sequences
+     of the logistic phase, so that a sequence may hold none of them; the
+     solutions of each sequence are numbered by their global rank order
+    sol_cost : dict
+     the costs of the solutions per sequence, numbered as in sol
+    log_phase : class
+     An updated version of the log_phase argument, the sol and sol_cost
+     attributes of its sequences containing their share of the top_k
+     solutions
+    """
+    if criterion not in RANK_CRITERIA:
+        raise ValueError("unknown ranking criterion: {0}".format(criterion))
+
+    req_m_pv = compile_rules(install['requirement'][2])
+    req_m_ev = compile_rules(install['requirement'][4])
+    port_table = port_chosen_data.to_frame().T
+    cache = {}
+
+    # branches: combinations of vessels with at least one compatible
+    # equipment of each type
+    branches = []
+    for seq in log_phase.op_ve:
+        for combi in range(len(log_phase.op_ve[seq].ve_combination)):
+            combination = log_phase.op_ve[seq].ve_combination[combi]
+            for vels, sols_eqs in candidate_nodes(combination, req_m_pv,
+                                                  req_m_ev, port_table, cache):
+                if all(sols_eqs):
+                    branches.append((seq, vels, sols_eqs))
+    log_phase.tables = match_tables(cache)
+    rates = day_rate_tables(log_phase)
+
+    # the schedule of each feasible branch, from its cheapest solution
+    ranked = []
+    for seq, vels, sols_eqs in branches:
+        ves_rate, eq_rates = hourly_rates(rates, vels, sols_eqs)
+        equips = [eqs[min(range(len(eqs)), key=eq_type_rates.__getitem__)]
+                  for eqs, eq_type_rates in zip(sols_eqs, eq_rates)]
+        log_phase.op_ve[seq].sol = {0: shape_solution(vels, equips,
+                                                      port_chosen_data)}
+        sched_sol = sched_solution(x, seq, 0, install, log_phase, log_phase_id,
+                                   user_inputs, hydrodynamic_outputs,
+                                   electrical_outputs, MF_outputs)
+        # the elements do not fit on the deck of the vessels of the branch
+        if not sched_sol['feasible']:
+            continue
+        duration = finite(charter_time(sched_sol))
+        ranked.append((ves_rate, duration, sols_eqs, eq_rates,
+                       (seq, vels, sched_sol)))
+
+    def leaf_cost(branch, equips):
+        seq, vels, sched_sol = branch
+        log_phase.op_ve[seq].sol = {0: shape_solution(vels, equips,
+                                                      port_chosen_data)}
+        log_phase.op_ve[seq].sol[0]['schedule'] = dict(sched_sol)
+        sol_cost = solution_cost(log_phase, seq, 0, sched_sol, rates)
+        return (sum(sol_cost.values()),
+                (seq, log_phase.op_ve[seq].sol[0], sol_cost))
+
+    best = best_leaves(ranked, top_k, criterion, leaf_cost)
+
+    # store the ranked solutions
+    sol = {}
+    sol_costs = {}
+    for seq in log_phase.op_ve:
+        log_phase.op_ve[seq].sol = {}
+        log_phase.op_ve[seq].sol_cost = {}
+    for key, (seq, solution, sol_cost) in best:
+        ind_sol = len(log_phase.op_ve[seq].sol)
+        log_phase.op_ve[seq].sol[ind_sol] = solution
+        log_phase.op_ve[seq].sol_cost[ind_sol] = sol_cost
+    for seq in log_phase.op_ve:
+        sol[seq] = log_phase.op_ve[seq].sol
+        sol_costs[seq] = log_phase.op_ve[seq].sol_cost
+
+    return sol, sol_costs, log_phase
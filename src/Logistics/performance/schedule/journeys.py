@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+"""
+@author: WavEC Offshore Renewables
+email: boris.teillant@wavec.org; paulo@wavec.org
+
+This module contains the journey planner of the schedule step in the WP5
+methodology. The elements to be installed (devices, foundations, moorings...)
+are transported from port to site by the first vessel of the solution in
+journeys limited by its deck space and maximum cargo. The planner returns all
+journeys at once, either loading the elements in installation order
+('greedy', each journey taking as many of the next elements as fit, found by
+binary search on the cumulative areas and masses) or by first-fit-decreasing
+bin packing ('ffd', fewer journeys but the installation order is only kept
+within each journey). The elements of each journey can then be visited in
+installation order or in the order of a shorter route, found from the
+distance matrix of the elements by the nearest neighbour heuristic
+('nearest'), optionally improved by 2-opt moves ('2-opt').
+
+BETA VERSION NOTES: the elements are assumed to be stacked on deck without
+any spacing.
+"""
+
+import numpy
+
+JOURNEY_METHODS = ['greedy', 'ffd']
+ROUTE_METHODS = ['installation', 'nearest', '2-opt']
+
+
+def capacity(value):
+    """
+    capacity returns the deck space or cargo of a vessel as a float, a
+    missing value (NaN) not limiting the number of elements on deck
+    """
+    value = float(value)
+    if numpy.isnan(value):
+        return float('inf')
+    return value
+
+
+def greedy_journeys(area, mass, deck_area, deck_cargo):
+    """
+    greedy_journeys returns the journeys of the elements in installation
+    order, each journey taking as many of the next elements as fit on deck
+    """
+    area_accum = numpy.cumsum(area)
+    mass_accum = numpy.cumsum(mass)
+
+    journeys = []
+    start = 0
+    while start < len(area):
+        area_loaded = area_accum[start-1] if start else 0.
+        mass_loaded = mass_accum[start-1] if start else 0.
+        stop = min(numpy.searchsorted(area_accum, area_loaded + deck_area, side='right'),
+                   numpy.searchsorted(mass_accum, mass_loaded + deck_cargo, side='right'))
+        stop = max(stop, start + 1)
+        journeys.append(numpy.arange(start, stop))
+        start = stop
+
+    return journeys
+
+
+def ffd_journeys(area, mass, deck_area, deck_cargo):
+    """
+    ffd_journeys returns the journeys of the elements packed by first fit
+    decreasing: the elements are taken by decreasing share of the deck space
+    or cargo and loaded on the first journey with enough space and cargo left
+    """
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        share = numpy.fmax(area / deck_area, mass / deck_cargo)
+    order = numpy.argsort(-share, kind='mergesort')
+
+    area_left = numpy.empty(len(area))
+    mass_left = numpy.empty(len(area))
+    journeys = []
+    for elem in order:
+        nb_journey = len(journeys)
+        fits = numpy.flatnonzero((area_left[:nb_journey] >= area[elem]) &
+                                 (mass_left[:nb_journey] >= mass[elem]))
+        if len(fits):
+            jour = fits[0]
+        else:
+            jour = nb_journey
+            area_left[jour] = deck_area
+            mass_left[jour] = deck_cargo
+            journeys.append([])
+        area_left[jour] -= area[elem]
+        mass_left[jour] -= mass[elem]
+        journeys[jour].append(elem)
+
+    # the elements of a journey are installed in installation order
+    return [numpy.sort(journey) for journey in journeys]
+
+
+def plan_journeys(elem_area, elem_mass, deck_area, deck_cargo, method='greedy'):
+    """
+    plan_journeys determines the vessel journeys required to transport all
+    elements from port to site
+
+    Parameters
+    ----------
+    elem_area : array
+     deck area [m^2] of each element, in installation order
+    elem_mass : array
+     dry mass [t] of each element, in installation order
+    deck_area : float
+     deck space [m^2] of the transporting vessel
+    deck_cargo : float
+     maximum cargo [t] of the transporting vessel
+    method : str
+     'greedy' or 'ffd'
+
+    Returns
+    -------
+    journeys : list
+     one array per journey containing the indexes of its elements
+    unfit : array
+     indexes of the elements which cannot fit on the deck of the vessel, not
+     part of any journey
+    """
+    if method not in JOURNEY_METHODS:
+        raise ValueError("unknown journey planning method: {0}".format(method))
+
+    # missing areas or masses (NaN) do not take any space on deck
+    area = numpy.nan_to_num(numpy.asarray(elem_area, dtype=float))
+    mass = numpy.nan_to_num(numpy.asarray(elem_mass, dtype=float))
+    deck_area = capacity(deck_area)
+    deck_cargo = capacity(deck_cargo)
+
+    fits = (area <= deck_area) & (mass <= deck_cargo)
+    unfit = numpy.flatnonzero(~fits)
+    elements = numpy.flatnonzero(fits)
+
+    if method == 'greedy':
+        journeys = greedy_journeys(area[elements], mass[elements], deck_area, deck_cargo)
+    else:
+        journeys = ffd_journeys(area[elements], mass[elements], deck_area, deck_cargo)
+
+    return [elements[journey] for journey in journeys], unfit
+
+
+def nearest_neighbour(dist):
+    """
+    nearest_neighbour returns the order of visit of the points of a distance
+    matrix, starting from the first one and always going to the closest point
+    not visited yet
+    """
+    nb_point = len(dist)
+    order = numpy.zeros(nb_point, dtype=int)
+    visited = numpy.zeros(nb_point, dtype=bool)
+    visited[0] = True
+    for step in range(1, nb_point):
+        order[step] = numpy.argmin(numpy.where(visited, numpy.inf, dist[order[step-1]]))
+        visited[order[step]] = True
+
+    return order
+
+
+def two_opt(dist, order):
+    """
+    two_opt improves an order of visit of the points of a distance matrix,
+    first point fixed and no return to it, by reversing the sections of the
+    route which shorten it, until none does
+    """
+    order = numpy.array(order)
+    nb_point = len(order)
+    improved = True
+    while improved:
+        improved = False
+        for first in range(1, nb_point-1):
+            # reverse order[first:last+1] for all last at once: the edges
+            # (prev, order[first]) and (order[last], next) are replaced by
+            # (prev, order[last]) and (order[first], next)
+            last = numpy.arange(first+1, nb_point)
+            prev = order[first-1]
+            gain = dist[prev, order[last]] - dist[prev, order[first]]
+            has_next = last < nb_point-1
+            nxt = order[last[has_next]+1]
+            gain[has_next] += dist[order[first], nxt] - dist[order[last[has_next]], nxt]
+            best = numpy.argmin(gain)
+            if gain[best] < -1e-9:
+                order[first:last[best]+1] = order[first:last[best]+1][::-1].copy()
+                improved = True
+
+    return order
+
+
+def route_journeys(journeys, dist, method='installation'):
+    """
+    route_journeys orders the elements of each journey for their visit
+
+    Parameters
+    ----------
+    journeys : list
+     one array per journey containing the indexes of its elements, as
+     returned by plan_journeys
+    dist : array
+     distances [km] between all elements
+    method : str
+     'installation' (order of the journeys unchanged), 'nearest' or '2-opt'.
+     The first element of each journey remains the first one visited.
+
+    Returns
+    -------
+    journeys : list
+     one array per journey containing the indexes of its elements, in order
+     of visit
+    """
+    if method not in ROUTE_METHODS:
+        raise ValueError("unknown route method: {0}".format(method))
+    if method == 'installation':
+        return journeys
+
+    routes = []
+    for journey in journeys:
+        journey_dist = dist[numpy.ix_(journey, journey)]
+        # elements without coordinates are visited in installation order
+        if len(journey) < 3 or numpy.isnan(journey_dist).any():
+            routes.append(journey)
+            continue
+        order = nearest_neighbour(journey_dist)
+        if method == '2-opt':
+            order = two_opt(journey_dist, order)
+        routes.append(journey[order])
+
+    return routes
@@ -0,0 +1,438 @@
+# -*- coding: utf-8 -*-
+"""
+@author: WavEC Offshore Renewables
+email: boris.teillant@wavec.org; paulo@wavec.org
+
+This module contains the schedulers of the installation logistic phases of the
+electrical infrastructure, foundations, moorings and devices. All phases are scheduled
+by the same kernel, sched_phase, from a table of the elements to be installed
+(deck area, dry mass and coordinates): the elements are loaded on the
+transporting vessel in journeys (see journeys.plan_journeys), the duration of
+the operations is given by the precompiled duration functions of the logistic
+operations (see Logistics.phases.op_durations) and the transit of the vessels
+from port to site, between the elements and back to port is computed for all
+journeys at once. The operational limit conditions of the phase are the most
+restrictive ones of its operations and of the transit of its vessels.
+
+BETA VERSION NOTES: the elements are installed in the order of the outputs of
+the upstream modules, the position of the cables being the first point of
+their route (static cables) or their upstream termination (dynamic cables).
+"""
+
+import numpy
+import pandas as pd
+
+from Logistics.performance.schedule.journeys import plan_journeys, route_journeys
+from Logistics.phases.op_durations import OpContext
+from Logistics.selection.tables import vessel_record
+
+ELEMENT_COLUMNS = ['area [m^2]', 'mass [t]', 'x coord [m]', 'y coord [m]',
+                   'zone [-]']
+
+
+def element_table(index, area, mass, x, y, zone):
+    """
+    element_table returns the panda table of the elements to be installed by
+    a logistic phase, as used by sched_phase
+    """
+    table = pd.DataFrame(index=index, columns=ELEMENT_COLUMNS)
+    table['area [m^2]'] = numpy.asarray(area, dtype=float)
+    table['mass [t]'] = numpy.asarray(mass, dtype=float)
+    table['x coord [m]'] = numpy.asarray(x, dtype=float)
+    table['y coord [m]'] = numpy.asarray(y, dtype=float)
+    table['zone [-]'] = numpy.asarray(zone, dtype=object)
+    return table
+
+
+def foundation_elements(MF_outputs):
+    """
+    foundation_elements returns the table of the foundations and anchors, in
+    local site coordinates
+    """
+    found_db = MF_outputs['foundation']
+    return element_table(found_db.index,
+                         found_db['length [m]']*found_db['width [m]'],
+                         found_db['dry mass [kg]']/1000,
+                         found_db['x coord [-]'],
+                         found_db['y coord [-]'],
+                         [numpy.nan]*len(found_db))
+
+
+def mooring_elements(MF_outputs):
+    """
+    mooring_elements returns the table of the mooring systems, in local site
+    coordinates: each anchor is transported and installed with its mooring
+    line, the line of the same device and number (e.g. line002 of
+    foundation002), the deck area being the one of the anchor
+    """
+    found_db = MF_outputs['foundation']
+    line_db = MF_outputs['line']
+    line_mass = line_db['dry mass [kg]'].groupby(
+        [line_db['devices [-]'],
+         line_db['lines [-]'].str.replace('line', '')]).sum()
+    anchor_line = zip(found_db['devices [-]'],
+                      found_db['foundations [-]'].str.replace('foundation', ''))
+    mass = found_db['dry mass [kg]'].values + line_mass.reindex(anchor_line).fillna(0).values
+    return element_table(found_db.index,
+                         found_db['length [m]']*found_db['width [m]'],
+                         mass/1000,
+                         found_db['x coord [-]'],
+                         found_db['y coord [-]'],
+                         [numpy.nan]*len(found_db))
+
+
+def static_cable_elements(electrical_outputs, cable_type):
+    """
+    static_cable_elements returns the table of the static cables of one type
+    ('export' or 'array'), stored in the cable tank or carousel of the vessel
+    (no deck area)
+    """
+    static_db = electrical_outputs['static cable']
+    static_db = static_db[static_db['type [-]'] == cable_type]
+    cable_route_db = electrical_outputs['cable route']
+    cable_start = cable_route_db.groupby('static cable id [-]').first().reindex(static_db.index)
+    return element_table(static_db.index,
+                         [numpy.nan]*len(static_db),
+                         static_db['total dry mass [kg]']/1000,
+                         cable_start['x coord [m]'],
+                         cable_start['y coord [m]'],
+                         cable_start['zone [-]'])
+
+
+def dynamic_cable_elements(electrical_outputs):
+    """
+    dynamic_cable_elements returns the table of the dynamic cables, stored in
+    the cable tank or carousel of the vessel (no deck area)
+    """
+    dynamic_db = electrical_outputs['dynamic cable']
+    return element_table(dynamic_db.index,
+                         [numpy.nan]*len(dynamic_db),
+                         dynamic_db['total dry mass [kg]']/1000,
+                         dynamic_db['upstream termination x coord [m]'],
+                         dynamic_db['upstream termination y coord [m]'],
+                         dynamic_db['upstream termination zone [-]'])
+
+
+def collection_point_elements(electrical_outputs):
+    """
+    collection_point_elements returns the table of the collection points
+    """
+    cp_db = electrical_outputs['collection point']
+    return element_table(cp_db.index,
+                         cp_db['length [m]']*cp_db['width [m]'],
+                         cp_db['dry mass [kg]']/1000,
+                         cp_db['x coord [m]'],
+                         cp_db['y coord [m]'],
+                         cp_db['zone  [-]'])
+
+
+def device_elements(user_inputs, hydrodynamic_outputs, transportation):
+    """
+    device_elements returns the table of the devices, all assumed the same:
+    the whole device or its sub-devices A to C (assembly strategy
+    '([A,B,C],D)') on the deck of the transporting vessel, or no deck area
+    and cargo for the towed devices
+    """
+    device = user_inputs['device']
+    nb_dev = len(hydrodynamic_outputs)
+    if transportation != 'On-deck transportation':
+        area = numpy.nan
+        mass = numpy.nan
+    elif device['assembly strategy [-]'].ix[0] == '([A,B,C],D)':
+        sub_device = user_inputs['sub_device']
+        area = (sub_device['length [m]']['A':'C']*sub_device['width [m]']['A':'C']).sum()
+        mass = sub_device['dry mass [kg]']['A':'C'].sum()/1000.0
+    else:
+        area = device['length [m]'].ix[0]*device['width [m]'].ix[0]
+        mass = device['dry mass [kg]'].ix[0]/1000.0
+    return element_table(hydrodynamic_outputs.index,
+                         [area]*nb_dev,
+                         [mass]*nb_dev,
+                         hydrodynamic_outputs['x coord [m]'],
+                         hydrodynamic_outputs['y coord [m]'],
+                         hydrodynamic_outputs['zone [-]'])
+
+
+def journey_transits(context, journeys):
+    """
+    journey_transits returns the transit time [h] of each journey: from port
+    to site, between its consecutive elements and back to port, at the speed
+    of the slowest vessel. Missing distances (NaN) are not accounted for.
+    """
+    nb_journey = len(journeys)
+    if not nb_journey:
+        return numpy.zeros(0)
+
+    order = numpy.concatenate(journeys)
+    jour_el = numpy.repeat(numpy.arange(nb_journey), [len(journey) for journey in journeys])
+    # consecutive elements of the same journey
+    same = jour_el[:-1] == jour_el[1:]
+    site_dist = numpy.nan_to_num(context.el_distances(order[:-1][same], order[1:][same]))
+    site_dist = numpy.bincount(jour_el[:-1][same], weights=site_dist, minlength=nb_journey)
+
+    port_2_site_dist = numpy.nan_to_num(context.install['port']['Distance port-site [km]'])
+
+    return (2*port_2_site_dist + site_dist)/context.ves_slow
+
+
+def aggregate_olc(olcs):
+    """
+    aggregate_olc returns the most restrictive [Hs, Tp, Ws, Cs] operational
+    limit conditions of a list of OLC, NaN if none is given
+    """
+    olc = numpy.array(olcs, dtype=float).reshape(-1, 4)
+    olc[numpy.isnan(olc)] = numpy.inf
+    olc = olc.min(axis=0) if len(olc) else numpy.tile(numpy.inf, 4)
+    olc[~numpy.isfinite(olc)] = numpy.nan
+    return list(olc)
+
+
+def sequence_groups(op_seq_sea, journey):
+    """
+    sequence_groups returns the elements of a journey grouped by sequence of
+    sea operations, as a list of (sequence, elements) pairs
+    """
+    groups = []
+    sequences = {}
+    for el in journey:
+        key = tuple(id(log_op) for log_op in op_seq_sea[el])
+        if key not in sequences:
+            sequences[key] = len(groups)
+            groups.append((op_seq_sea[el], []))
+        groups[sequences[key]][1].append(el)
+    return [(ops, numpy.array(els)) for ops, els in groups]
+
+
+def sched_phase(seq, ind_sol, install, log_phase, user_inputs, elements,
+                sched_sol):
+    """
+    sched_phase determines the duration of the individual logistic operations
+    of one feasible solution of a logistic phase, the scheduling kernel shared
+    by all installation phases
+
+    Parameters
+    ----------
+    seq: integer
+     index of the operation sequencing strategy under consideration
+    ind_sol: integer
+     index representing the feasible logistic solution under consideration
+    install : dict
+     dictionnary compiling the results of the installation module, including
+     the selected port, the planning method of the journeys (see
+     journeys.plan_journeys) and their route method (see
+     journeys.route_journeys)
+    log_phase: class
+     class containing all data relevant to the characterization of the feasible
+     logistic solutions
+    user_inputs : dict
+     dictionnary containing all required inputs to WP5 coming from WP1/end-user
+    elements : DataFrame
+     panda table of the elements to be installed (see element_table), in
+     installation order, indexed as the sea operation sequences of the phase
+    sched_sol : dict
+     schedule of the solution, to be filled
+
+    Returns
+    -------
+    sched_sol : dict
+     the schedule of the solution: duration of the preparation [h], sea time
+     [h] (including transits), total duration [h], OLC and detail per journey,
+     including the sequence of all operations of the phase ('operations', the
+     transit of each journey preceding its sea operations). 'feasible' is
+     False if some elements cannot fit on the deck of the transporting vessel
+    """
+    op_ve = log_phase.op_ve[seq]
+    # records of the vessels used for this feasible solution
+    ves_data = [vessel_record(log_phase, ves_sol) for ves_sol in op_ve.sol[ind_sol]['VEs']]
+
+    # elements of the logistic phase, in installation order
+    elements = elements[[el_id in op_ve.op_seq_sea for el_id in elements.index]]
+    el_ids = elements.index.values
+    op_seq_sea = [op_ve.op_seq_sea[el_id] for el_id in el_ids]
+
+    # the first vessel is always the transporting vessel
+    journeys, unfit = plan_journeys(elements['area [m^2]'].values,
+                                    elements['mass [t]'].values,
+                                    ves_data[0]['Deck space [m^2]'],
+                                    ves_data[0]['Max. cargo [t]'],
+                                    install.get('journeys', 'greedy'))
+    # the solution cannot install the elements which do not fit on deck,
+    # they are listed in detail['unfit elements']
+    sched_sol['feasible'] = not len(unfit)
+    nb_journey = len(journeys)
+
+    context = OpContext(install, ves_data, user_inputs,
+                        [elements['x coord [m]'].values,
+                         elements['y coord [m]'].values,
+                         elements['zone [-]'].values])
+    # order of visit of the elements of each journey
+    journeys = route_journeys(journeys, context.el_dist,
+                              install.get('route', 'installation'))
+
+    op_id_prep = []
+    op_dur_prep = []
+    op_id_sea = []
+    op_dur_sea = []
+    op_olc_sea = []
+    op_id_demob = []
+    op_dur_demob = []
+    # sequence of all operations (journey, stage, description, duration, OLC)
+    operations = []
+    unresolved = set()
+
+    def resolve(log_op, jour, journey):
+        if log_op.duration is None:
+            unresolved.add(log_op.description)
+            return None
+        return log_op.duration(context, jour, journey)
+
+    transit = journey_transits(context, journeys)
+    transit_olc = aggregate_olc(context.vessel_olc)
+
+    for jour, journey in enumerate(journeys):
+        for log_op in op_ve.op_seq_prep:
+            op_time = resolve(log_op, jour, journey)
+            if op_time is not None:
+                op_id_prep.append(log_op.description)
+                op_dur_prep.append(op_time[0])
+                operations.append((jour, 'prep', log_op.description, op_time[0], None))
+        operations.append((jour, 'sea', 'Transit', transit[jour], transit_olc))
+        for ops, group in sequence_groups(op_seq_sea, journey):
+            for log_op in ops:
+                op_time = resolve(log_op, jour, group)
+                if op_time is not None:
+                    op_id_sea.append(log_op.description)
+                    op_dur_sea.append(op_time[0])
+                    op_olc_sea.extend(op_time[1])
+                    operations.append((jour, 'sea', log_op.description, op_time[0],
+                                       aggregate_olc(op_time[1]) if op_time[1] else None))
+
+    # no vessel is mobilised if there is no element to install
+    for log_op in op_ve.op_seq_demob if nb_journey else []:
+        op_time = resolve(log_op, nb_journey-1, journeys[-1])
+        if op_time is not None:
+            op_id_demob.append(log_op.description)
+            op_dur_demob.append(op_time[0])
+            operations.append((nb_journey-1, 'demob', log_op.description, op_time[0], None))
+
+    sched_sol['detail'] = {'journey': [len(journey) for journey in journeys],
+                           'journey elements': [el_ids[journey] for journey in journeys],
+                           'unfit elements': el_ids[unfit],
+                           'transit': transit,
+                           'prep': [op_id_prep, op_dur_prep],
+                           'sea': [op_id_sea, op_dur_sea, op_olc_sea],
+                           'demob': [op_id_demob, op_dur_demob],
+                           'operations': operations,
+                           'unresolved': sorted(unresolved)}
+
+    # the vessels are limited by their own OLC during transit
+    if nb_journey:
+        op_olc_sea = op_olc_sea + context.vessel_olc
+
+    sched_sol['olc'] = aggregate_olc(op_olc_sea)
+    # missing time value durations (NaN) are not accounted for
+    sched_sol['preparation'] = numpy.nansum(op_dur_prep)
+    sched_sol['sea time'] = numpy.nansum(op_dur_sea) + transit.sum()
+    sched_sol['log_op_dur_all'] = sched_sol['preparation'] + sched_sol['sea time'] + numpy.nansum(op_dur_demob)
+
+    return sched_sol
+
+
+def sched_e_export(seq, ind_sol, install, log_phase, user_inputs,
+                   electrical_outputs, sched_sol):
+    """sched_e_export schedules the installation of the static export cables
+    """
+    return sched_phase(seq, ind_sol, install, log_phase, user_inputs,
+                       static_cable_elements(electrical_outputs, 'export'),
+                       sched_sol)
+
+
+def sched_e_array(seq, ind_sol, install, log_phase, user_inputs,
+                  electrical_outputs, sched_sol):
+    """sched_e_array schedules the installation of the static array cables
+    """
+    return sched_phase(seq, ind_sol, install, log_phase, user_inputs,
+                       static_cable_elements(electrical_outputs, 'array'),
+                       sched_sol)
+
+
+def sched_e_dynamic(seq, ind_sol, install, log_phase, user_inputs,
+                    electrical_outputs, sched_sol):
+    """sched_e_dynamic schedules the installation of the dynamic cables
+    """
+    return sched_phase(seq, ind_sol, install, log_phase, user_inputs,
+                       dynamic_cable_elements(electrical_outputs),
+                       sched_sol)
+
+
+def sched_e_cp_seabed(seq, ind_sol, install, log_phase, user_inputs,
+                      electrical_outputs, sched_sol):
+    """sched_e_cp_seabed schedules the installation of the seabed collection
+    points
+    """
+    return sched_phase(seq, ind_sol, install, log_phase, user_inputs,
+                       collection_point_elements(electrical_outputs),
+                       sched_sol)
+
+
+def sched_driven(seq, ind_sol, install, log_phase, user_inputs, MF_outputs,
+                 sched_sol):
+    """sched_driven schedules the installation of the driven piles
+    """
+    return sched_phase(seq, ind_sol, install, log_phase, user_inputs,
+                       foundation_elements(MF_outputs), sched_sol)
+
+
+def sched_gravity(seq, ind_sol, install, log_phase, user_inputs, MF_outputs,
+                  sched_sol):
+    """sched_gravity schedules the installation of the gravity based
+    foundations and anchors
+    """
+    return sched_phase(seq, ind_sol, install, log_phase, user_inputs,
+                       foundation_elements(MF_outputs), sched_sol)
+
+
+def sched_m_drag(seq, ind_sol, install, log_phase, user_inputs, MF_outputs,
+                 sched_sol):
+    """sched_m_drag schedules the installation of the mooring systems with
+    drag-embedment anchors
+    """
+    return sched_phase(seq, ind_sol, install, log_phase, user_inputs,
+                       mooring_elements(MF_outputs), sched_sol)
+
+
+def sched_m_direct(seq, ind_sol, install, log_phase, user_inputs, MF_outputs,
+                   sched_sol):
+    """sched_m_direct schedules the installation of the mooring systems with
+    direct-embedment anchors
+    """
+    return sched_phase(seq, ind_sol, install, log_phase, user_inputs,
+                       mooring_elements(MF_outputs), sched_sol)
+
+
+def sched_m_suction(seq, ind_sol, install, log_phase, user_inputs, MF_outputs,
+                    sched_sol):
+    """sched_m_suction schedules the installation of the mooring systems with
+    suction caissons
+    """
+    return sched_phase(seq, ind_sol, install, log_phase, user_inputs,
+                       mooring_elements(MF_outputs), sched_sol)
+
+
+def sched_m_pile(seq, ind_sol, install, log_phase, user_inputs, MF_outputs,
+                 sched_sol):
+    """sched_m_pile schedules the installation of the mooring systems with
+    pile anchors
+    """
+    return sched_phase(seq, ind_sol, install, log_phase, user_inputs,
+                       mooring_elements(MF_outputs), sched_sol)
+
+
+def sched_dev(seq, ind_sol, install, log_phase, user_inputs,
+              hydrodynamic_outputs, sched_sol):
+    """sched_dev schedules the installation of the ocean energy devices
+    """
+    elements = device_elements(user_inputs, hydrodynamic_outputs,
+                               log_phase.op_ve[seq].description)
+    return sched_phase(seq, ind_sol, install, log_phase, user_inputs,
+                       elements, sched_sol)
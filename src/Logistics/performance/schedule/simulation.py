@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""
+@author: WavEC Offshore Renewables
+email: boris.teillant@wavec.org; paulo@wavec.org
+
+This module contains the discrete-event simulation of the installation plan in
+the WP5 methodology. The layers of the installation plan are simulated one
+after the other, the logistic phases of a layer starting together once all
+phases of the previous layer are completed. Each phase is simulated with the
+schedule of its selected solution (the cheapest one): its operations are
+performed one after the other, in the order of the schedule, and the
+operations limited by operational limit conditions (olc) wait for the first
+weather window long enough for them. The weather windows are looked up with
+the WindowIndex of the weather window engine, so that every operation is
+placed in the met-ocean time series in O(log n) and multi-year hindcasts are
+simulated in milliseconds.
+
+BETA VERSION NOTES: the olc are considered static over the entire duration of
+each marine operation and an operation is never interrupted once started.
+Time is counted in hours from the first record of the met-ocean data.
+"""
+
+import math
+
+import numpy
+
+from weather import OLC_COLUMNS, olc_limit, cached_window_index
+
+OLC_KEYS = [olc_key for olc_key, column in OLC_COLUMNS]
+
+
+def olc_dict(olc):
+    """
+    olc_dict returns the operational limit conditions [Hs, Tp, Ws, Cs] as the
+    dict of the weather window engine
+    """
+    return dict(zip(OLC_KEYS, olc))
+
+
+def is_missing(value):
+    """is_missing returns True for a missing (None or NaN) value
+    """
+    return value is None or math.isnan(float(value))
+
+
+def simulate_phase(operations, met_ocean, start):
+    """
+    simulate_phase simulates the operations of a logistic phase through the
+    met-ocean time series
+
+    Parameters
+    ----------
+    operations : list
+     sequence of the operations of the phase, as (journey, stage, description,
+     duration [h], olc) tuples, see the 'operations' entry of the schedule
+     detail. olc is None for the operations which are not weather limited.
+    met_ocean : DataFrame
+     met-ocean time series
+    start : float
+     earliest starting time [h] of the phase
+
+    Returns
+    -------
+    simulation : dict
+     'start' and 'end' times [h] of the phase, total 'waiting time' [h] for
+     weather windows, and the 'operation start' and 'operation end' times [h]
+     of each operation. The times are NaN from the first operation which does
+     not fit in any weather window of the met-ocean data.
+    """
+    nb_op = len(operations)
+    op_start = numpy.empty(nb_op)
+    op_end = numpy.empty(nb_op)
+    op_start.fill(numpy.nan)
+    op_end.fill(numpy.nan)
+    simulation = {'start': start,
+                  'end': float('nan'),
+                  'waiting time': 0.,
+                  'operation start': op_start,
+                  'operation end': op_end}
+    if is_missing(start):
+        return simulation
+
+    # window indexes of the olc of the phase
+    indexes = {}
+    time = start
+    for ind_op, (jour, stage, description, duration, olc) in enumerate(operations):
+        if is_missing(duration):
+            duration = 0.
+        begin = time
+        if olc is not None:
+            key = tuple(olc_limit(value) for value in olc)
+            if any(limit is not None for limit in key):
+                if key not in indexes:
+                    indexes[key] = cached_window_index(met_ocean, olc_dict(olc))
+                begin = indexes[key].next_start(time, duration)
+                if begin is None:
+                    print 'no weather window long enough for the operation ' + description + ' in the met-ocean data'
+                    return simulation
+        simulation['waiting time'] += begin - time
+        op_start[ind_op] = begin
+        op_end[ind_op] = time = begin + duration
+
+    simulation['end'] = time
+
+    return simulation
+
+
+def selected_schedule(log_phase):
+    """
+    selected_schedule returns the schedule of the selected solution of a
+    logistic phase, the one of lowest cost, or of the first scheduled solution
+    if none is costed. None if no solution of the phase was scheduled.
+    """
+    selected = None
+    best_cost = float('inf')
+    for seq in sorted(log_phase.op_ve):
+        op_ve = log_phase.op_ve[seq]
+        sol_cost = getattr(op_ve, 'sol_cost', {})
+        for ind_sol in sorted(op_ve.sol):
+            if 'schedule' not in op_ve.sol[ind_sol]:
+                continue
+            if selected is None:
+                selected = op_ve.sol[ind_sol]['schedule']
+            if ind_sol in sol_cost:
+                total = float(sum(sol_cost[ind_sol].values()))
+                if total < best_cost:
+                    best_cost = total
+                    selected = op_ve.sol[ind_sol]['schedule']
+
+    return selected
+
+
+def layer_start(simulation, x, project_start):
+    """
+    layer_start returns the earliest starting time [h] of the layer x of the
+    installation plan: the project start for the first layer, the end of the
+    previous layer otherwise
+    """
+    if x == 0 or not simulation or x-1 not in simulation['layers']:
+        return project_start
+    return simulation['layers'][x-1]['end']
+
+
+def simulate_layer(simulation, x, phase_ids, log_phases, met_ocean,
+                   project_start):
+    """
+    simulate_layer simulates the logistic phases of the layer x of the
+    installation plan, all starting at the end of the previous layer
+
+    Parameters
+    ----------
+    simulation : dict
+     'phases' and 'layers' simulated so far, updated in place
+    x : int
+     layer of the installation plan
+    phase_ids : list
+     ids of the logistic phases of the layer
+    log_phases : dict
+     logistic phases, with the schedules of their solutions
+    met_ocean : DataFrame
+     met-ocean time series
+    project_start : float
+     starting time [h] of the project
+
+    Returns
+    -------
+    simulation : dict
+     the updated simulation, the 'layers' entry holding the 'start' and 'end'
+     times [h] of each layer and the 'phases' entry the simulation of each
+     phase (see simulate_phase)
+    """
+    start = layer_start(simulation, x, project_start)
+    end = start
+    for log_phase_id in phase_ids:
+        sched_sol = selected_schedule(log_phases[log_phase_id])
+        if sched_sol is None:
+            print 'the logistic phase ' + log_phase_id + ' has no scheduled solution to simulate'
+            operations = None
+        else:
+            operations = sched_sol['detail'].get('operations')
+        if operations is None:
+            phase = simulate_phase([], met_ocean, float('nan'))
+        else:
+            phase = simulate_phase(operations, met_ocean, start)
+        simulation['phases'][log_phase_id] = phase
+        # a layer is completed when all its phases are
+        if is_missing(end) or is_missing(phase['end']):
+            end = float('nan')
+        else:
+            end = max(end, phase['end'])
+
+    simulation['layers'][x] = {'start': start, 'end': end}
+
+    return simulation
+
+
+def simulate_plan(install_plan, log_phases, met_ocean, project_start):
+    """
+    simulate_plan simulates all layers of the installation plan, see
+    simulate_layer
+    """
+    simulation = {'phases': {}, 'layers': {}}
+    for x in sorted(install_plan):
+        simulate_layer(simulation, x, install_plan[x], log_phases, met_ocean,
+                       project_start)
+
+    return simulation
@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+"""
+@author: WavEC Offshore Renewables
+email: boris.teillant@wavec.org; paulo@wavec.org
+
+This module contains the weather window engine of the schedule step in the WP5
+methodology. The weather windows are the periods of the met-ocean time series
+during which all operational limit conditions (olc) of a marine operation are
+satisfied. They are found with a run-length encoding of the access mask built
+from the Hs, Tp, Ws and Cs columns of the met-ocean data in one vectorised
+pass, so that multi-decade hindcasts are processed in milliseconds. Since many
+feasible solutions share the same olc, the weather windows are memoised per
+met-ocean data set and set of olc in a bounded LRU cache.
+
+BETA VERSION NOTES: the olc are considered static over the entire duration of
+the marine operation.
+"""
+
+import math
+from collections import OrderedDict
+
+import numpy
+
+# olc keys and the corresponding met-ocean columns
+OLC_COLUMNS = [('maxHs', 'Hs [m]'),
+               ('maxTp', 'Tp [s]'),
+               ('maxWs', 'Ws [m/s]'),
+               ('maxCs', 'Cs [m/s]')]
+
+# maximum number of sets of weather windows kept in memory
+WW_CACHE_SIZE = 128
+ww_cache = OrderedDict()
+
+
+def olc_limit(value):
+    """
+    olc_limit returns the operational limit as a float or None if the limit
+    is not defined (empty, null, zero or NaN)
+    """
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    if math.isnan(value) or value <= 0:
+        return None
+    return value
+
+
+def time_step(met_ocean):
+    """
+    time_step returns the time step [h] of the met-ocean time series from the
+    hour of the day of its first two records, hourly for a single record
+    """
+    hours = met_ocean['hour [-]'].values
+    if len(hours) < 2:
+        return 1
+    step = (hours[1] - hours[0]) % 24
+    if step == 0:
+        step = 24  # daily records
+    return step
+
+
+def access_mask(met_ocean, olc):
+    """
+    access_mask returns a boolean array, True where the met-ocean conditions
+    satisfy all the operational limit conditions. Missing met-ocean values
+    (NaN) do not restrict the access.
+    """
+    denied = numpy.zeros(len(met_ocean), dtype=bool)
+    with numpy.errstate(invalid='ignore'):
+        for olc_key, column in OLC_COLUMNS:
+            limit = olc_limit(olc.get(olc_key))
+            if limit is not None and column in met_ocean:
+                denied |= met_ocean[column].values > limit
+    return ~denied
+
+
+def run_lengths(mask):
+    """
+    run_lengths returns the indexes of the first element and the lengths of
+    all runs of consecutive True values of a boolean array
+    """
+    padded = numpy.concatenate(([False], mask, [False]))
+    edges = numpy.flatnonzero(padded[1:] != padded[:-1])
+    starts = edges[::2]
+    return starts, edges[1::2] - starts
+
+
+def weather_windows(met_ocean, olc):
+    """
+    weather_windows returns the starting times [h] and the durations [h] of
+    all weather windows found in the met-ocean data for the given operational
+    limit conditions (olc)
+
+    Parameters
+    ----------
+    met_ocean : DataFrame
+     met-ocean time series with the 'hour [-]', 'Hs [m]', 'Tp [s]', 'Ws [m/s]'
+     and 'Cs [m/s]' columns
+    olc : dict
+     operational limit conditions 'maxHs', 'maxTp', 'maxWs' and 'maxCs',
+     undefined limits are not considered
+
+    Returns
+    -------
+    ww : dict
+     'start' and 'duration' arrays of the weather windows, time is counted in
+     hours from the first record of the met-ocean data
+    """
+    step = time_step(met_ocean)
+    starts, lengths = run_lengths(access_mask(met_ocean, olc))
+    if not len(starts):
+        print 'Not a single permitting weather window was found with the criteria specified for one vessel with these met-ocean data!'
+
+    ww = {'start': starts * step,
+          'duration': lengths * step}
+
+    return ww
+
+
+class WindowIndex(object):
+    """
+    WindowIndex answers "when can an operation of a given duration start,
+    at the earliest after a given time" in O(log n) for one set of weather
+    windows. It keeps the sorted window starts and ends, plus a sparse table
+    of the maximum window duration over every range of 2**k consecutive
+    windows, so that the first long enough window is found by binary search.
+    """
+
+    def __init__(self, ww):
+        self.start = numpy.asarray(ww['start'], dtype=float)
+        self.duration = numpy.asarray(ww['duration'], dtype=float)
+        self.end = self.start + self.duration
+
+        # range maximum sparse table, levels[k][i] = max(duration[i:i+2**k])
+        self.levels = [self.duration]
+        width = 1
+        while 2 * width <= len(self.duration):
+            prev = self.levels[-1]
+            self.levels.append(numpy.maximum(prev[:-width], prev[width:]))
+            width = 2 * width
+
+    def range_max(self, first, last):
+        """maximum window duration between the windows first and last included
+        """
+        k = int(last - first + 1).bit_length() - 1
+        return max(self.levels[k][first], self.levels[k][last - 2 ** k + 1])
+
+    def next_start(self, time, duration):
+        """
+        next_start returns the earliest time, not before time, at which an
+        operation lasting duration fits in a weather window, or None if there
+        is no such window in the met-ocean data
+        """
+        nb_ww = len(self.start)
+        # window in progress at the given time
+        current = numpy.searchsorted(self.start, time, side='right') - 1
+        if current >= 0 and self.end[current] - time >= duration:
+            return time
+
+        first = current + 1
+        if first >= nb_ww or self.range_max(first, nb_ww - 1) < duration:
+            return None
+
+        # smallest last such that the windows first..last hold a long one
+        low, high = first, nb_ww - 1
+        while low < high:
+            mid = (low + high) // 2
+            if self.range_max(first, mid) >= duration:
+                high = mid
+            else:
+                low = mid + 1
+
+        return self.start[low]
+
+
+def cache_entry(met_ocean, olc):
+    """
+    cache_entry returns the cache entry [met_ocean, ww, index] of a met-ocean
+    data set and set of operational limit conditions, the weather windows
+    being computed on a miss. The least recently used entries are evicted
+    beyond WW_CACHE_SIZE entries.
+    """
+    key = (id(met_ocean),) + tuple(olc_limit(olc.get(olc_key))
+                                   for olc_key, column in OLC_COLUMNS)
+
+    entry = ww_cache.pop(key, None)
+    # the cache entry holds a reference to the met-ocean data set so that its
+    # id cannot be reused by another data set while the entry is cached
+    if entry is None or entry[0] is not met_ocean:
+        ww = weather_windows(met_ocean, olc)
+        ww['start'].flags.writeable = False
+        ww['duration'].flags.writeable = False
+        entry = [met_ocean, ww, None]
+
+    ww_cache[key] = entry
+    while len(ww_cache) > WW_CACHE_SIZE:
+        ww_cache.popitem(last=False)
+
+    return entry
+
+
+def cached_weather_windows(met_ocean, olc):
+    """
+    cached_weather_windows returns the same as weather_windows, but the
+    weather windows are computed only once per met-ocean data set and set of
+    operational limit conditions. The returned arrays are read-only as they
+    are shared between all callers.
+    """
+    return cache_entry(met_ocean, olc)[1]
+
+
+def cached_window_index(met_ocean, olc):
+    """
+    cached_window_index returns the WindowIndex of the weather windows of a
+    met-ocean data set for the given operational limit conditions, built once
+    and kept in the weather windows cache
+    """
+    entry = cache_entry(met_ocean, olc)
+    if entry[2] is None:
+        entry[2] = WindowIndex(entry[1])
+    return entry[2]
+
+
+def clear_weather_cache():
+    """
+    clear_weather_cache empties the weather windows cache, e.g. when the
+    met-ocean data set was modified in place
+    """
+    ww_cache.clear()
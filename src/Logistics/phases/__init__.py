@@ -18,3 +18,38 @@ class EquipmentType(object):
         self.id = id
         self.panda = panda
 
+
+
+class LogPhaseRegistry(object):
+    """
+    LogPhaseRegistry is a dict-like container of the logistic phases. Each
+    logistic phase is only initialised by its builder on first access and then
+    kept, so that only the phases requested by the installation plan (or the
+    O&M module) are characterized.
+
+    """
+    def __init__(self, builders):
+        self.builders = builders
+        self.phases = {}
+
+    def __getitem__(self, phase_id):
+        if phase_id not in self.phases:
+            self.phases[phase_id] = self.builders[phase_id]()
+        return self.phases[phase_id]
+
+    def __contains__(self, phase_id):
+        return phase_id in self.builders
+
+    def __iter__(self):
+        return iter(self.builders)
+
+    def __len__(self):
+        return len(self.builders)
+
+    def keys(self):
+        return self.builders.keys()
+
+    def initialised(self):
+        """returns the ids of the logistic phases already initialised
+        """
+        return self.phases.keys()
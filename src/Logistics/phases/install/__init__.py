@@ -13,6 +13,9 @@ one related to Moorings and Foundation Installation: Driven Pile, and another
 related to Operation and Maintenance: Offshore Inspection.
 """
 
+from functools import partial
+
+from .. import LogPhaseRegistry
 from .classes import LogPhase, DefPhase
 
 from .e_export import initialize_e_export_phase
@@ -59,28 +62,28 @@ def logPhase_install_init(log_op, vessels, equipments, user_inputs, electrical_o
 
     Returns
     -------
-    logPhase_install : dict
-     dictionnary containing all classes defining the logistic phases for installation
+    logPhase_install : LogPhaseRegistry
+     dict-like registry of all classes defining the logistic phases for
+     installation, each phase being initialized on first access
     """
 
-    # 1st Level - Initialize the logistic phases through LogPhase classes
-
-    # TO BE CHANGED IN ORDER TO ONLY INITIALISE THE PHASES THAT ARE REQUESTED ACCORDING TO THE INSTALLATION PLAN (AND/OR OPERATION SEQUENCE)
-    logPhase_install = {
-                        'E_export': initialize_e_export_phase(log_op, vessels, equipments, electrical_outputs, user_inputs),
-                        'E_array': initialize_e_array_phase(log_op, vessels, equipments, electrical_outputs),
-                        'E_dynamic': initialize_e_dynamic_phase(log_op, vessels, equipments, electrical_outputs),
-                        'E_cp_seabed': initialize_e_cp_seabed_phase(log_op, vessels, equipments, electrical_outputs),
-
-                        'Driven': initialize_drive_phase(log_op, vessels, equipments, MF_outputs),
-                        'Gravity': initialize_gravity_phase(log_op, vessels, equipments, MF_outputs),
-                        'M_Drag': initialize_m_drag_phase(log_op, vessels, equipments, MF_outputs),
-                        'M_Direct': initialize_m_direct_phase(log_op, vessels, equipments, MF_outputs),
-                        'M_Suction': initialize_m_suction_phase(log_op, vessels, equipments, MF_outputs),
-                        'M_Pile': initialize_m_pile_phase(log_op, vessels, equipments, MF_outputs),
-
-                        'Devices': initialize_devices_phase(log_op, vessels, equipments, user_inputs, hydrodynamic_outputs)
-                        }
+    # 1st Level - Register the logistic phases, each LogPhase class is only
+    # initialized when the phase is requested by the installation plan
+    logPhase_install = LogPhaseRegistry({
+                        'E_export': partial(initialize_e_export_phase, log_op, vessels, equipments, electrical_outputs, user_inputs),
+                        'E_array': partial(initialize_e_array_phase, log_op, vessels, equipments, electrical_outputs),
+                        'E_dynamic': partial(initialize_e_dynamic_phase, log_op, vessels, equipments, electrical_outputs),
+                        'E_cp_seabed': partial(initialize_e_cp_seabed_phase, log_op, vessels, equipments, electrical_outputs),
+
+                        'Driven': partial(initialize_drive_phase, log_op, vessels, equipments, MF_outputs),
+                        'Gravity': partial(initialize_gravity_phase, log_op, vessels, equipments, MF_outputs),
+                        'M_Drag': partial(initialize_m_drag_phase, log_op, vessels, equipments, MF_outputs),
+                        'M_Direct': partial(initialize_m_direct_phase, log_op, vessels, equipments, MF_outputs),
+                        'M_Suction': partial(initialize_m_suction_phase, log_op, vessels, equipments, MF_outputs),
+                        'M_Pile': partial(initialize_m_pile_phase, log_op, vessels, equipments, MF_outputs),
+
+                        'Devices': partial(initialize_devices_phase, log_op, vessels, equipments, user_inputs, hydrodynamic_outputs)
+                        })
 
     return logPhase_install
 
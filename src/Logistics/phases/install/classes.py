@@ -5,6 +5,7 @@ class LogPhase(object):
         self.description = description
         self.op_ve = {}
         self.strategy = {}    # !!!!!!!!!!!!!!
+        self.tables = {}  # RecordTable of the feasible vessels and equipments
         # self.op_ve.sol_ves = {}
         # self.op_ve.sol_eq = {}
 #        self.feasibility = feasiblity
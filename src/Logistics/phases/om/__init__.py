@@ -13,6 +13,9 @@ one related to Moorings and Foundation Installation: Driven Pile, and another
 related to Operation and Maintenance: Offshore Inspection.
 """
 
+from functools import partial
+
+from .. import LogPhaseRegistry
 from .LpM1 import initialize_LpM1_phase
 from .LpM2 import initialize_LpM2_phase
 from .LpM3 import initialize_LpM3_phase
@@ -46,23 +49,23 @@ def logPhase_om_init(log_op, vessels, equipments, user_inputs, OM_outputs):
 
     Returns
     -------
-    logPhase_om : dict
-     dictionnary containing all classes defining the logistic phases for operation and maintenance
+    logPhase_om : LogPhaseRegistry
+     dict-like registry of all classes defining the logistic phases for
+     operation and maintenance, each phase being initialized on first access
     """
 
-    # 1st Level - Initialize the logistic phases through LogPhase classes
-
-    # TO BE CHANGED IN ORDER TO ONLY INITIALISE THE PHASES THAT ARE REQUESTED ACCORDING TO THE INSTALLATION PLAN (AND/OR OPERATION SEQUENCE)
-    logPhase_om = {
-                    'LpM1': initialize_LpM1_phase(log_op, vessels, equipments, OM_outputs),
-                    'LpM2': initialize_LpM2_phase(log_op, vessels, equipments, OM_outputs),
-                    'LpM3': initialize_LpM3_phase(log_op, vessels, equipments, OM_outputs),
-                    'LpM4': initialize_LpM4_phase(log_op, vessels, equipments, OM_outputs),
-                    'LpM5': initialize_LpM5_phase(log_op, vessels, equipments, OM_outputs),
-#                    'LpM6': initialize_gravity_phase(log_op, vessels, equipments, OM_outputs),
-#                    'LpM7': initialize_m_drag_phase(log_op, vessels, equipments, OM_outputs),
-#                    'LpM8': initialize_m_direct_phase(log_op, vessels, equipments, OM_outputs),
-                    }
+    # 1st Level - Register the logistic phases, each LogPhase class is only
+    # initialized when the phase is requested by the O&M module
+    logPhase_om = LogPhaseRegistry({
+                    'LpM1': partial(initialize_LpM1_phase, log_op, vessels, equipments, OM_outputs),
+                    'LpM2': partial(initialize_LpM2_phase, log_op, vessels, equipments, OM_outputs),
+                    'LpM3': partial(initialize_LpM3_phase, log_op, vessels, equipments, OM_outputs),
+                    'LpM4': partial(initialize_LpM4_phase, log_op, vessels, equipments, OM_outputs),
+                    'LpM5': partial(initialize_LpM5_phase, log_op, vessels, equipments, OM_outputs),
+#                    'LpM6': partial(initialize_gravity_phase, log_op, vessels, equipments, OM_outputs),
+#                    'LpM7': partial(initialize_m_drag_phase, log_op, vessels, equipments, OM_outputs),
+#                    'LpM8': partial(initialize_m_direct_phase, log_op, vessels, equipments, OM_outputs),
+                    })
 
     return logPhase_om
 
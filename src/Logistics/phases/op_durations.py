@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+"""
+@author: WavEC Offshore Renewables
+email: boris.teillant@wavec.org; paulo@wavec.org
+
+This module contains the duration resolvers of the individual logistic
+operations. The time value duration of an operation is either a direct
+average value, the result of a specialized function or derived from other
+sources (vessel and device databases), as given by the operations_time_OLC
+database. The resolver of each operation is selected once, when the
+operations are initialised by logOp_init, so that the schedule step only
+calls the precompiled function of each operation for every vessel journey.
+
+Each resolver is called as resolver(log_op, context, jour, elements), context
+being the OpContext of the feasible solution under consideration, jour the
+index of the vessel journey and elements the indexes of the elements of the
+journey undergoing the operation, and returns the pair (duration [h], OLC)
+where OLC is the list of the [Hs, Tp, Ws, Cs] operational limit conditions of
+the operation. It returns None when the operation does not take place in this
+journey.
+
+BETA VERSION NOTES: the specialized functions of the cable laying, pile
+penetration, grouting and lowering operations are not implemented yet, these
+operations have no duration function (LogOp.duration is None) unless a direct
+value is given in the database.
+"""
+
+from functools import partial
+
+import numpy
+import pandas as pd
+
+from ..ancillaries.dist import cached_distance_matrix
+
+JACK_UP = ["JUP Barge", "JUP Vessel"]
+KNOT = 0.514444  # [m/s]
+
+
+def vessel_olc(ves_record):
+    """
+    vessel_olc returns the operational limit conditions [Hs, Tp, Ws, Cs] of a
+    vessel, the jacking limits for jack-up vessels and the transit limits for
+    all others (the current speed limits of the vessels database being given
+    in knots)
+    """
+    if ves_record['Vessel type [-]'] in JACK_UP:
+        olc = 'OLC: Jacking max'
+    else:
+        olc = 'OLC: Transit max'
+
+    return [ves_record[olc + 'Hs [m]'],
+            ves_record[olc + 'Tp [s]'],
+            ves_record[olc + 'Ws [m/s]'],
+            ves_record[olc + 'Cs [knots]']*KNOT]
+
+
+class OpContext(object):
+    """
+    OpContext gathers, once per feasible solution, the data required by the
+    duration resolvers: the records of the vessels (the first being the
+    transporting vessel), the device, site and port data and the coordinates
+    [x, y, zone] of the elements to be installed, together with the values
+    shared by all journeys
+    """
+
+    def __init__(self, install, ves_data, user_inputs, el_coords):
+        self.install = install
+        self.ves_data = ves_data
+        self.device = user_inputs['device']
+        self.site = user_inputs['site']
+        self.el_coords = [numpy.asarray(coord) for coord in el_coords]
+        # distances [km] between all elements, computed once per layout
+        self.el_dist = cached_distance_matrix(*self.el_coords)
+
+        # longest mobilisation and slowest transit speed [km/h] of the vessels
+        self.mob_time = max(ves['Mob time [h]'] for ves in ves_data)
+        self.ves_slow = 3.6*min(ves['Transit speed [m/s]'] for ves in ves_data)
+        self.vessel_olc = [vessel_olc(ves) for ves in ves_data]
+
+        self.assembly_time = self.device['assembly duration [h]'].ix[0]
+        self.connect_time = self.device['connect duration [h]'].ix[0]
+        self.disconnect_time = self.device['disconnect duration [h]'].ix[0]
+        self.device_olc = [self.device['max Hs [m]'].ix[0],
+                           self.device['max Tp [s]'].ix[0],
+                           self.device['max wind speed [m/s]'].ix[0],
+                           self.device['max current speed [m/s]'].ix[0]]
+
+    def el_distances(self, el_i, el_f):
+        """
+        el_distances returns the distances [km] between the elements el_i and
+        el_f (arrays of indexes)
+        """
+        return self.el_dist[el_i, el_f]
+
+
+def op_olc(log_op, context):
+    """
+    op_olc returns the OLC of an operation limited by the vessels
+    """
+    if log_op.olc[0] == "vessel":
+        return list(context.vessel_olc)
+    return []
+
+
+def per_element(log_op, context, jour, elements):
+    """
+    per_element: direct average value for each element
+    """
+    return len(elements)*log_op.time_value, op_olc(log_op, context)
+
+
+def per_journey(log_op, context, jour, elements):
+    """
+    per_journey: direct average value for each vessel journey
+    """
+    return log_op.time_value, op_olc(log_op, context)
+
+
+def mobilisation(log_op, context, jour, elements):
+    """
+    mobilisation: longest mobilisation (or demobilisation) time of the vessels
+    """
+    return context.mob_time, []
+
+
+def first_mobilisation(log_op, context, jour, elements):
+    """
+    first_mobilisation: longest mobilisation time of the vessels, before the
+    first journey only
+    """
+    if jour > 0:
+        return None
+    return mobilisation(log_op, context, jour, elements)
+
+
+def vessel_positioning(log_op, context, jour, elements):
+    """
+    vessel_positioning: jacking time down to the water depth of the first
+    element for jack-up vessels, direct average value for each element
+    otherwise
+    """
+    nb_el = len(elements)
+    ves = context.ves_data[0]
+    if ves['Vessel type [-]'] in JACK_UP:
+        el = elements[0]
+        site_el = context.site[(context.site['x coord [m]'] == context.el_coords[0][el]) &
+                               (context.site['y coord [m]'] == context.el_coords[1][el])]
+        water_depth = site_el['bathymetry [m]'].max()
+        jacking_time = water_depth/ves['JackUp speed down [m/min]']/60  # [hour]
+        return nb_el*jacking_time, [context.vessel_olc[0]]
+    return nb_el*log_op.time_value, [context.vessel_olc[0]]
+
+
+def port_transit(log_op, context, jour, elements):
+    """
+    port_transit: transit between the port and the site at the speed of the
+    slowest vessel
+    """
+    port_2_site_dist = context.install['port']['Distance port-site [km]']
+    return port_2_site_dist/context.ves_slow, op_olc(log_op, context)
+
+
+def site_transit(log_op, context, jour, elements):
+    """
+    site_transit: transit between the consecutive elements at the speed of the
+    slowest vessel
+    """
+    dist_tot = numpy.sum(context.el_distances(elements[:-1], elements[1:]))
+    return dist_tot/context.ves_slow, op_olc(log_op, context)
+
+
+def device_assembly(log_op, context, jour, elements):
+    """
+    device_assembly: assembly duration of each device
+    """
+    return len(elements)*context.assembly_time, []
+
+
+def device_connection(log_op, context, jour, elements):
+    """
+    device_connection: connection duration of the device, limited by the
+    device OLC
+    """
+    return context.connect_time, [context.device_olc]
+
+
+def device_disconnection(log_op, context, jour, elements):
+    """
+    device_disconnection: disconnection duration of the device, limited by
+    the device OLC
+    """
+    return context.disconnect_time, [context.device_olc]
+
+
+# resolvers of the operations identified by their key in the database
+OP_RESOLVERS = {'Mob': first_mobilisation,
+                'VessPrep': per_journey,
+                'VesPos': vessel_positioning}
+
+# resolvers of the time functions ('Time: function [-]')
+TIME_FUNCTIONS = {'transit_algorithm': port_transit,
+                  'distance': site_transit}
+
+# resolvers of the other sources ('Time: other [-]')
+TIME_OTHERS = {"vesselsDB['Mob time [h]']": mobilisation,
+               "device['assembly duration [h]']": device_assembly,
+               "device['connect duration [h]']": device_connection,
+               "device['disconnect duration [h]']": device_disconnection}
+
+
+def compile_duration(key, log_op):
+    """
+    compile_duration selects the resolver of an operation following the time
+    assessment method of the database: direct value, then function, then
+    other source, the resolvers of OP_RESOLVERS taking precedence
+
+    Parameters
+    ----------
+    key : str
+     key of the operation in the operations_time_OLC database
+    log_op : LogOp
+     the logistic operation
+
+    Returns
+    -------
+    duration : function
+     duration(context, jour, elements) of the operation, None if the time assessment
+     method of the operation is not handled
+    """
+    if key in OP_RESOLVERS:
+        resolver = OP_RESOLVERS[key]
+    elif not pd.isnull(log_op.time_value):
+        resolver = per_element
+    elif not pd.isnull(log_op.time_function):
+        resolver = TIME_FUNCTIONS.get(log_op.time_function)
+    elif not pd.isnull(log_op.time_other):
+        resolver = TIME_OTHERS.get(log_op.time_other)
+    else:
+        resolver = None
+
+    if resolver is None:
+        return None
+    return partial(resolver, log_op)
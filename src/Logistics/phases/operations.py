@@ -13,17 +13,19 @@ and their characterization was mostly limited to the id and description. This
 will be further expanded in the following version.
 """
 
-import pandas as pd
+from ..load.cache import parse_excel
+from op_durations import compile_duration
 
 class LogOp(object):
 
-    def __init__(self, id, description, time_value, time_function, time_other, olc):
+    def __init__(self, id, description, time_value, time_function, time_other, olc, duration=None):
         self.id = id
         self.description = description
         self.time_value = time_value
         self.time_function = time_function
         self.time_other = time_other
         self.olc = olc
+        self.duration = duration
 
 
 def logOp_init(file_path):
@@ -40,6 +42,8 @@ def logOp_init(file_path):
                 8 = Specialized individual operation for port-based maintenance interventions;
     2nd/3rd digit: simple counter to discriminate between different individual
                    operations within the same category defined by the 1st digit
+    The duration function of each operation is compiled here, once, from its
+    time assessment method (see op_durations.compile_duration).
 
     Parameters
     ----------
@@ -50,11 +54,8 @@ def logOp_init(file_path):
      dictionnary containing all classes defining the logistic operations
     """
 
-    # Transform vessel database .xls into panda type
-    excel = pd.ExcelFile(file_path)
-
-    # Collect data from a particular tab
-    op_db = excel.parse('operations', header=0, index_col=0)
+    # Collect data from a particular tab of the .xls database (cached)
+    op_db = parse_excel(file_path, 'operations')
 
     logOp = {}
 
@@ -72,5 +73,7 @@ def logOp_init(file_path):
                                            op_db.ix[op_nr]['OLC: Cs [m/s]']
                                            ]
                                            )
+        logOp[op_db.index[op_nr]].duration = compile_duration(op_db.index[op_nr],
+                                                              logOp[op_db.index[op_nr]])
 
     return logOp
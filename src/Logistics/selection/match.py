@@ -14,308 +14,262 @@ not been implemented, this module should suffer major changes for the beta versi
 """
 
 from ..phases.install.classes import VE_solutions
+from .tables import RecordTable
 import itertools
 import numpy
 
-def compatibility_ve(install, log_phase, port_chosen_data):
-    """This function is currently limited to the selection of the first two
-    feasible solutions for the installation logistic phase in analysis.
+# arithmetic and comparison methods of the matching requirements
+MATCH_OPERATIONS = {'plus': lambda aux_op, value: aux_op + value,
+                    'mul': lambda aux_op, value: aux_op * value,
+                    'div': lambda aux_op, value: aux_op / value}
+MATCH_COMPARISONS = {'sup': lambda target, aux_op: target >= aux_op,
+                     'equal': lambda target, aux_op: target == aux_op}
+
+
+def compile_rule(rule):
+    """compile_rule compiles a matching requirement, e.g. ['Weight [t]',
+    'plus', 'AE weight [t]', 'sup', 'Max. cargo [t]'], into a function
+    evaluating it over whole tables. The arithmetic operations are applied
+    left to right on the columns of the source table (vessels or equipments)
+    and the result is compared with the column of the target table (port or
+    vessels) following the comparison method.
 
     Parameters
     ----------
-    install : dict
-     not used
-    log_phase : class
-     class of the logistic phase under consideration for assessment, contains
-     data refered to the feasible vessel and equipment combinations specific of
-     each operation sequence of the logistic phase
+    rule : list
+     matching requirement as defined in the feasibility functions
 
     Returns
     -------
-    sol : dict
-     A dict of panda dataframes with unique feasible solutions
-    log_phase : class
-     An updated version of the log_phase argument containing only the feasible
-     equipments within each vessel and equipment combinations dataframes
+    evaluate : function
+     evaluate(source, target) returns the boolean matrix of the requirement,
+     with one row per target and one column per source
     """
+    first = rule[0]
+    operations = []
+    comparison = None
+    for ind_rd in range(1, len(rule)-1, 2):
+        if rule[ind_rd] in MATCH_OPERATIONS:
+            operations.append((MATCH_OPERATIONS[rule[ind_rd]], rule[ind_rd+1]))
+        elif rule[ind_rd] in MATCH_COMPARISONS:
+            comparison = (MATCH_COMPARISONS[rule[ind_rd]], rule[ind_rd+1])
+            break
+        else:
+            raise ValueError("unknown matching method '{0}'".format(rule[ind_rd]))
+
+    def evaluate(source, target):
+        aux_op = source[first].values
+        for operation, column in operations:
+            aux_op = operation(aux_op, source[column].values)
+        if comparison is None:
+            return numpy.ones((len(target.index), len(source.index)), dtype=bool)
+        compare, column = comparison
+        target_val = target[column].values
+        return numpy.asarray(compare(target_val[:, None], aux_op[None, :]),
+                             dtype=bool)
+
+    return evaluate
+
+
+def compile_rules(req_m):
+    """compile_rules compiles the matching requirements of each vessel or
+    equipment type, see compile_rule
+    """
+    return dict((key, [compile_rule(rule) for rule in req_m[key]])
+                for key in req_m)
 
-    sols_ve_indxs_combs_inseq = []
-
-    # Go through different sequence options
-    for seq in log_phase.op_ve:
-
-
-        nr_sol = 0
-        sols_ve_indxs_combs_incomb = []
-
-
-        # Go through different possible combination
-        for combi in range(len(log_phase.op_ve[seq].ve_combination)):
-
-
-            # initialise solution variables
-            ves_sol = {}
-            ves_indexs = {}
-            eq_sol = {}
-            eq_indexs = {}
-
-
-            #  Go through vessels
-            nr_diff_ves = len(log_phase.op_ve[seq].ve_combination[combi]['vessel']) # nr_diff_ves in combination
-            for ves_type in range(nr_diff_ves):
-
-                ves = {}
-                ves_index_vec = {}
-
-                ves_quant = log_phase.op_ve[seq].ve_combination[combi]['vessel'][ves_type][0]  # Quantity of vessels in the solution
-                ves_class = log_phase.op_ve[seq].ve_combination[combi]['vessel'][ves_type][1]  # Vessel class
-                type_of_ves = log_phase.op_ve[seq].ve_combination[combi]['vessel'][ves_type][1].id
-
-                ves_index_vec = ves_class.panda.index  # Get indexs that correspond to vessel class
-                nr_feas_vess_i = len(ves_index_vec)  # Number of feasible vessels within vessel type
-
-                for indx_vec in range(nr_feas_vess_i):
-                  # ves[indx_vec] = ves_class.panda.ix[indx_vec]  # Get info of the feasible vessels
-                  ves[indx_vec] = ves_class.panda.ix[ves_index_vec[indx_vec]]
-                ves_sol[ves_type] = {'type': type_of_ves, 'quantity': ves_quant,
-                                     'Series': ves, 'indexs': ves_index_vec}  # Store info of the vessels
-                ves_indexs[ves_type] = list(ves_index_vec)  # Vector of indexs of feasible vessels per type
-
-
-
-            #  Go through equips
-            nr_diff_equi = len(log_phase.op_ve[seq].ve_combination[combi]['equipment'])
-            for eq_type in range(nr_diff_equi):
-
-                eq = {}
-                eq_index_vec = {}
-
-                eq_quant = log_phase.op_ve[seq].ve_combination[combi]['equipment'][eq_type][0]  # Quantity of vessels in the solution
-                eq_class = log_phase.op_ve[seq].ve_combination[combi]['equipment'][eq_type][1]  # Equipment class
-                type_of_eq = log_phase.op_ve[seq].ve_combination[combi]['equipment'][eq_type][1].id
-                eq_reltd_ves = log_phase.op_ve[seq].ve_combination[combi]['equipment'][eq_type][2]
-
-                eq_index_vec = eq_class.panda.index
-                nr_feas_eq_i = len(eq_index_vec)
-
-                for indx_vec in range(nr_feas_eq_i):
-#                    eq[indx_vec] = eq_class.panda.ix[indx_vec]  # Get info of the feasible equipments
-                    eq[indx_vec] = eq_class.panda.ix[eq_index_vec[indx_vec]]
-                # eq_sol[eq_type] = {'type': type_of_eq, 'quantity': eq_quant,
-                #                  'Series': eq, 'indexs': eq_index_vec, 'req_vessel': ves_sol[eq_reltd_ves]['type']}  # Store info of the equipments
-                eq_sol[eq_type] = {'type': type_of_eq, 'quantity': eq_quant,
-                                 'Series': eq, 'indexs': eq_index_vec, 'req_vessel': eq_reltd_ves}  # Store info of the equipments
-                eq_indexs[eq_type] = list(eq_index_vec)  # Vector of indexs of feasible equipments per type
-
-
-
-
-            # Build solutions
-            # sols_ve_indxs = []
-
-            sols_ves = []
-            for ves_type in range(nr_diff_ves):  # Agregatte vessel type solutions
-
-                VES = []
-                for ves_intype in range(len(ves_sol[ves_type]['Series'])):
-
-                    ves_type_name = ves_sol[ves_type]['type']
-                    ves_type_quant = ves_sol[ves_type]['quantity']
-                    ves_type_panda = ves_sol[ves_type]['Series'][ves_intype]
-
-                    VES.append( [ves_type_name, ves_type_quant, ves_type_panda] )
-
-                sols_ves.append(VES)
-
-            sols_v_indxs_combs = list(itertools.product(*sols_ves))  # Combine vessel solutions
-
-            sols_eq = []
-            for eq_type in range(nr_diff_equi):  # Agregatte equipment type solutions
-
-                EQS = []
-                for eqs_intype in range(len(eq_sol[eq_type]['Series'])):
-
-                    eq_type_name = eq_sol[eq_type]['type']
-                    eq_type_quant = eq_sol[eq_type]['quantity']
-                    eq_type_panda = eq_sol[eq_type]['Series'][eqs_intype]
-                    eq_type_relation = eq_sol[eq_type]['req_vessel']
-
-
-                    EQS.append( [eq_type_name, eq_type_quant, eq_type_panda, eq_type_relation] )
-
-                sols_eq.append(EQS)
-
-            sols_e_indxs_combs = list(itertools.product(*sols_eq))  # Combine vessel solutions
-
-            sols_ve_indxs_sprt = (sols_v_indxs_combs, sols_e_indxs_combs)  # Agregatte vessel and equipment solutions
-            sols_ve_indxs_comb = list(itertools.product(*sols_ve_indxs_sprt))  # Combine solutions
-
-            sols_ve_indxs_combs_incomb.append(sols_ve_indxs_comb)  # Store solution per combination
-
-
-        sols_ve_indxs_combs_inseq.append(sols_ve_indxs_combs_incomb)  # Store solution per sequence
-
-
-
-    # Apply MATCHING
-
-    port_pd = port_chosen_data
-
-    # Port/Vessel
-    req_m_pv = install['requirement'][2]
-    match_rq_pv = dict.fromkeys(req_m_pv.keys())
-
-    for typ_req in range(len(req_m_pv)):
-        m_pv_key_req = req_m_pv.keys()[typ_req]
-
-        for seq in range(len(log_phase.op_ve)):
 
-            for combin in range(len(sols_ve_indxs_combs_inseq[0])):
+def match_matrix(rules, source, target):
+    """match_matrix returns the boolean matrix, one row per target and one
+    column per source, of the compatibility of a source table with a target
+    table for all compiled rules
+    """
+    matrix = numpy.ones((len(target.index), len(source.index)), dtype=bool)
+    with numpy.errstate(invalid='ignore', divide='ignore'):
+        for evaluate in rules:
+            matrix &= evaluate(source, target)
+    return matrix
+
+
+def feasible_rows(type_class, rules, target, tables):
+    """feasible_rows returns the panda dataframe of the feasible vessels or
+    equipments of a type and its RecordTable, restricted to those compatible
+    with the target (e.g. the port) when the type has matching requirements.
+    They are built once per type and kept in tables.
+    """
+    if type_class.id not in tables:
+        type_pd = type_class.panda
+        if type_class.id in rules:
+            type_pd = type_pd[match_matrix(rules[type_class.id], type_pd,
+                                           target)[0]]
+        tables[type_class.id] = (type_pd, RecordTable(type_class.id, type_pd))
+    return tables[type_class.id]
+
+
+def candidate_nodes(combination, req_m_pv, req_m_ev, port_table, cache):
+    """candidate_nodes generates lazily the combinations of vessels of a
+    vessel and equipment combination passing the port/vessel matching
+    requirements, each with the equipments compatible with its vessels. The
+    vessels incompatible with the port are removed before combining the
+    vessel types, so the rejected combinations are never built.
 
-                ve_combinations = sols_ve_indxs_combs_inseq[seq][combin]
+    Parameters
+    ----------
+    combination : dict
+     'vessel' and 'equipment' lists of the combination
+    req_m_pv : dict
+     compiled port/vessel matching requirements per vessel type
+    req_m_ev : dict
+     compiled vessel/equipment matching requirements per equipment type
+    port_table : DataFrame
+     characteristics of the selected port, as a single row
+    cache : dict
+     feasible rows per type and vessel/equipment match matrices shared by
+     the combinations of the logistic phase
 
-                LEN_combi = len(ve_combinations)
-                ind_ve_combi = -1
-                while ind_ve_combi < LEN_combi-1:
+    Returns
+    -------
+    nodes : generator
+     (vessels, equipments) tuples, vessels being a tuple of [type, quantity,
+     row] lists and equipments a list per equipment type of the compatible
+     [type, quantity, row, vessel index] lists, row being the position of the
+     vessel or equipment in the RecordTable of its type
+    """
+    ves_rows = cache.setdefault('vessel', {})
+    eq_rows = cache.setdefault('equipment', {})
+    match_ve = cache.setdefault('match_ve', {})
+
+    sols_ves = []
+    for ves_quant, ves_class in combination['vessel']:
+        ves_table, ves_records = feasible_rows(ves_class, req_m_pv,
+                                               port_table, ves_rows)
+        sols_ves.append([[ves_class.id, ves_quant, row]
+                         for row in range(len(ves_records))])
+
+    sols_eqs = []
+    for eq_quant, eq_class, eq_reltd_ves in combination['equipment']:
+        eq_table, eq_records = feasible_rows(eq_class, {}, None, eq_rows)
+        sols_eqs.append([[eq_class.id, eq_quant, row, eq_reltd_ves]
+                         for row in range(len(eq_records))])
+
+    def compatible(eq_sol, ves_sol):
+        eq_type, ves_type = eq_sol[0], ves_sol[0]
+        if eq_type not in req_m_ev:
+            return True
+        if (eq_type, ves_type) not in match_ve:
+            match_ve[eq_type, ves_type] = match_matrix(req_m_ev[eq_type],
+                                                       eq_rows[eq_type][0],
+                                                       ves_rows[ves_type][0])
+        return match_ve[eq_type, ves_type][ves_sol[2], eq_sol[2]]
+
+    for vels in itertools.product(*sols_ves):
+        sols_eqs_vels = [[eq_sol for eq_sol in eqs
+                          if compatible(eq_sol, vels[eq_sol[3]])]
+                         for eqs in sols_eqs]
+        yield vels, sols_eqs_vels
+
+
+def candidate_solutions(combination, req_m_pv, req_m_ev, port_table, cache):
+    """candidate_solutions generates lazily the vessel and equipment
+    solutions of a vessel and equipment combination passing the port/vessel
+    and vessel/equipment matching requirements. For each combination of
+    vessels of candidate_nodes, only the compatible equipments are combined,
+    so the rejected solutions are never built.
 
-                    ind_ve_combi = ind_ve_combi+1
+    Returns
+    -------
+    solutions : generator
+     (vessels, equipments) tuples, vessels being [type, quantity, row] lists
+     and equipments [type, quantity, row, vessel index] lists
+    """
+    for vels, sols_eqs_vels in candidate_nodes(combination, req_m_pv,
+                                               req_m_ev, port_table, cache):
+        for equips in itertools.product(*sols_eqs_vels):
+            yield vels, equips
 
-                    ve_comb = ve_combinations[ind_ve_combi]
-                    ve_comb_ves = ve_combinations[ind_ve_combi][0]
-                    ve_comb_eqs = ve_combinations[ind_ve_combi][1]
 
-                    for ind_ves_in_combi in range(len(ve_comb_ves)):
-                        m_v_key_type = ve_comb_ves[ind_ves_in_combi][0]
-                        ves_pd = ve_comb_ves[ind_ves_in_combi][2] # panda series data
-                        if m_v_key_type == m_pv_key_req:
+def shape_solution(vels, equips, port_chosen_data):
+    """shape_solution returns the solution dict of a candidate solution, the
+    equipments being listed after the vessel they are used from
+    """
+    ve_sols = []
+    for ind_ves_sol in range(len(vels)):
+        ve_sol = list(vels[ind_ves_sol])
+        for ind_eq_sol in range(len(equips)):
+            ves_dpend = equips[ind_eq_sol][3]
+            if ves_dpend == ind_ves_sol:
+                ve_sol.append(list(equips[ind_eq_sol]))
+        ve_sols.append(ve_sol)
+    return {'port': port_chosen_data, 'VEs': ve_sols}
+
+
+def match_tables(cache):
+    """match_tables returns the RecordTable of the feasible vessels and
+    equipments per type, as stored in the tables attribute of log_phase
+    """
+    tables = {}
+    for element in ['vessel', 'equipment']:
+        tables[element] = dict((type_id, table[1])
+                               for type_id, table in cache.get(element, {}).items())
+    return tables
 
-                            for req in range(len(req_m_pv[m_pv_key_req])):
-                               m_ev_read = req_m_pv[m_pv_key_req][req]
 
-                               aux_op = ves_pd[m_ev_read[0]]
-                               for ind_rd in range(1,len(m_ev_read)-1,2):
+def compatibility_ve(install, log_phase, port_chosen_data):
+    """compatibility_ve combines the feasible vessels and equipments of each
+    vessel and equipment combination of the logistic phase into solutions,
+    keeping only the solutions compatible with the selected port and the
+    equipments compatible with the vessel they are used from.
 
-                                   if m_ev_read[ind_rd] == 'plus':
-                                       aux_op = aux_op + ves_pd[m_ev_read[ind_rd+1]]
-                                   elif m_ev_read[ind_rd] == 'mul':
-                                       aux_op = aux_op * ves_pd[m_ev_read[ind_rd+1]]
-                                   elif m_ev_read[ind_rd] == 'div':
-                                       aux_op = aux_op / ves_pd[m_ev_read[ind_rd+1]]
-                                   elif m_ev_read[ind_rd] == 'sup':
-                                       if port_pd[m_ev_read[ind_rd+1]] >= aux_op :
-                                           continue
-                                       else:
-                                            del sols_ve_indxs_combs_inseq[seq][combin][ind_ve_combi]
-                                            LEN_combi = LEN_combi-1
-                                   elif m_ev_read[ind_rd] == 'equal':
-                                       if port_pd[m_ev_read[ind_rd+1]] == aux_op :
-                                          continue
-                                       else:
-                                            del sols_ve_indxs_combs_inseq[seq][combin][ind_ve_combi]
-                                            LEN_combi = LEN_combi-1
+    Parameters
+    ----------
+    install : dict
+     among other data contains the matching requirements
+    log_phase : class
+     class of the logistic phase under consideration for assessment, contains
+     data refered to the feasible vessel and equipment combinations specific of
+     each operation sequence of the logistic phase
+    port_chosen_data : Series
+     characteristics of the selected port
 
+    Returns
+    -------
+    sol : dict
+     A dict of unique feasible solutions, the vessels and equipments of each
+     solution refer to the rows of the RecordTable of their type
+    log_phase : class
+     An updated version of the log_phase argument containing the feasible
+     solutions and, in its tables attribute, the RecordTable of the feasible
+     vessels and equipments per type
+    """
 
-    # # Port/Equipment
+    # Port/Vessel and Vessel/Equipment matching requirements
+    req_m_pv = compile_rules(install['requirement'][2])
     # req_m_pe = install['requirement'][3]
-    # match_rq_pe = dict.fromkeys(req_m_pe.keys())
-
-
-    # Vessel/Equipment
-    req_m_ev = install['requirement'][4]
-    match_rq = dict.fromkeys(req_m_ev.keys())
-
-    for typ_req in range(len(req_m_ev)):
-        m_ev_key_req = req_m_ev.keys()[typ_req]
-
-        for seq in range(len(log_phase.op_ve)):
-
-            for combin in range(len(sols_ve_indxs_combs_inseq[0])):
-
-                ve_combinations = sols_ve_indxs_combs_inseq[seq][combin]
-
-                LEN_combi = len(ve_combinations)
-                ind_ve_combi = -1
-                while ind_ve_combi < LEN_combi-1:
-
-                    ind_ve_combi = ind_ve_combi+1
-
-                    ve_comb = ve_combinations[ind_ve_combi]
-                    ve_comb_ves = ve_combinations[ind_ve_combi][0]
-                    ve_comb_eqs = ve_combinations[ind_ve_combi][1]
-
-                    for ind_eq_in_combi in range(len(ve_comb_eqs)):
-
-                        m_e_key_type = ve_comb_eqs[ind_eq_in_combi][0]
-                        eq_pd = ve_comb_eqs[ind_eq_in_combi][2] # panda series data
-                        req_ves = ve_comb_eqs[ind_eq_in_combi][3]  # vessel (index) required to use equipment
-
-                        m_v_key_type = ve_comb_ves[req_ves][0]
-                        ves_pd = ve_comb_ves[req_ves][2] # panda series data
-
-                        if m_e_key_type == m_ev_key_req:
-
-                           for req in range(len(req_m_ev[m_ev_key_req])):
-                               m_ev_read = req_m_ev[m_ev_key_req][req]
-
-                               aux_op = eq_pd[m_ev_read[0]]
-                               for ind_rd in range(1,len(m_ev_read)-1,2):
-
-                                   if m_ev_read[ind_rd] == 'plus':
-                                       aux_op = aux_op + eq_pd[m_ev_read[ind_rd+1]]
-                                   elif m_ev_read[ind_rd] == 'mul':
-                                       aux_op = aux_op * eq_pd[m_ev_read[ind_rd+1]]
-                                   elif m_ev_read[ind_rd] == 'div':
-                                       aux_op = aux_op / eq_pd[m_ev_read[ind_rd+1]]
-                                   elif m_ev_read[ind_rd] == 'sup':
-                                       if ves_pd[m_ev_read[ind_rd+1]] >= aux_op :
-                                           continue
-                                       else:
-                                            del sols_ve_indxs_combs_inseq[seq][combin][ind_ve_combi]
-                                            LEN_combi = LEN_combi-1
-                                   elif m_ev_read[ind_rd] == 'equal':
-                                       if ves_pd[m_ev_read[ind_rd+1]] == aux_op :
-                                            continue
-                                       else:
-                                            del sols_ve_indxs_combs_inseq[seq][combin][ind_ve_combi]
-                                            LEN_combi = LEN_combi-1
-
-        # log_phase.op_ve[seq].sol = sols_ve_indxs_combs_inseq[seq]
-        # sol = sols_ve_indxs_combs_inseq[seq]
+    req_m_ev = compile_rules(install['requirement'][4])
 
+    port_table = port_chosen_data.to_frame().T
+    cache = {}
 
     # Shape solution for performance:
     final_sol = {}
-    for seq in range(len(sols_ve_indxs_combs_inseq)):
+    for seq in log_phase.op_ve:
         sol = {}
         sols_iter = 0
-        for combi in range(len(sols_ve_indxs_combs_inseq[seq])):
-            for sols in range(len(sols_ve_indxs_combs_inseq[seq][combi])):
-
-                sol_i = sols_ve_indxs_combs_inseq[seq][combi][sols]
-                vels = sol_i[0]
-                equips = sol_i[1]
-
-                # sol[sols_iter] = { 'port': port_chosen_data, str(sols): [list(vels), list(equips)] }
-                # OR
-                ve_sols=[]
-                for ind_ves_sol in range(len(vels)):
-                    sol[sols_iter] = { 'port': port_chosen_data}
-                    ve_sol = list(vels[ind_ves_sol])
-                    for ind_eq_sol in range(len(equips)):
-                        ves_dpend = equips[ind_eq_sol][3]
-                        if ves_dpend==ind_ves_sol:
-                            ve_sol.append( list(equips[ind_eq_sol]) )
-                    ve_sols.append(ve_sol)
-                sol[sols_iter].update (  {'VEs': ve_sols} )
+        for combi in range(len(log_phase.op_ve[seq].ve_combination)):
+            combination = log_phase.op_ve[seq].ve_combination[combi]
 
-                sols_iter = sols_iter + 1
+            for vels, equips in candidate_solutions(combination, req_m_pv,
+                                                    req_m_ev, port_table,
+                                                    cache):
+                sol[sols_iter] = shape_solution(vels, equips, port_chosen_data)
 
-                # continue
+                sols_iter = sols_iter + 1
 
         log_phase.op_ve[seq].sol = sol
 
         final_sol[seq] = log_phase.op_ve[seq].sol
 
+    log_phase.tables = match_tables(cache)
 
     return final_sol, log_phase
 
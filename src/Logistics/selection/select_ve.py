@@ -12,11 +12,103 @@ BETA VERSION NOTES: These functions are mature and should not suffer many
 changes from the current version to the following beta version.
 """
 
+import numpy
+
+# comparison methods of the requirements, the other methods ('inf', 'equal')
+# are not applied in the selection step yet
+REQ_METHODS = {'sup': lambda column, value: column >= value}
+
+
+def feasibility_mask(panda, requirements):
+    """feasibility_mask compiles a list of requirements of one vessel or
+    equipment type, e.g. [['Deck space [m^2]', 'sup', value], ...], into a
+    single boolean mask over the rows of its panda dataframe
+
+    Parameters
+    ----------
+    panda : DataFrame
+     vessel or equipment database of one type
+    requirements : list
+     list of [parameter, method, value] requirements
+
+    Returns
+    -------
+    mask : array
+     True for the vessels or equipments satisfying all requirements
+    """
+    mask = numpy.ones(len(panda.index), dtype=bool)
+    with numpy.errstate(invalid='ignore'):
+        for para, meth, val in requirements:
+            if meth in REQ_METHODS:
+                mask &= numpy.asarray(REQ_METHODS[meth](panda[para], val))
+    return mask
+
+
+def select_feasible(req, log_phase, element):
+    """select_feasible erases the unfeasible vessels or equipments from the
+    panda dataframes of the vessel and equipment types of all combinations of
+    the logistic phase. The mask of each type is evaluated once and shared by
+    all combinations referencing the type. Combinations with a type left
+    without any feasible vessel or equipment, or without any in the database,
+    are removed and the remaining combinations are renumbered.
+
+    Parameters
+    ----------
+    req : dict
+     feasibility requirements per vessel or equipment type id
+    log_phase : class
+     class of the logistic phase under consideration for assessment
+    element : str
+     'vessel' or 'equipment'
+
+    Returns
+    -------
+    feasible : dict
+     A dict of panda dataframes with all the feasible vessels or equipments
+     per type id, None for the types not found in any combination
+    log_phase : class
+     An updated version of the log_phase argument
+    """
+    feasible = dict.fromkeys(req.keys())
+    # feasible panda dataframe of each type class, evaluated once
+    filtered = {}
+
+    for seq in log_phase.op_ve:
+
+        combinations = log_phase.op_ve[seq].ve_combination
+        kept = []
+        for combi in sorted(combinations):
+
+            feasible_combi = True
+            for item in combinations[combi][element]:
+                type_class = item[1]
+
+                if type_class.id in req:
+                    if id(type_class) not in filtered:
+                        type_pd = type_class.panda
+                        mask = feasibility_mask(type_pd, req[type_class.id])
+                        filtered[id(type_class)] = type_pd[mask]
+                    type_class.panda = filtered[id(type_class)]
+                    if len(type_class.panda.index) > 0:
+                        feasible[type_class.id] = type_class.panda
+
+                # Check if no vessel/equipment is feasible for this type
+                if len(type_class.panda.index) == 0:
+                    feasible_combi = False
+
+            if feasible_combi:
+                kept.append(combinations[combi])
+
+        log_phase.op_ve[seq].ve_combination = dict(enumerate(kept))
+
+    return feasible, log_phase
+
+
 def select_e (install, log_phase):
     """select_e function selects the equipments that satisfy the minimum
     requirements calculated in the feasibility functions. The current method to
     achieve this is erasing the unfeasible equipments from the panda dataframes
-    included in the ve_combination objects.
+    included in the ve_combination objects, see select_feasible.
 
     Parameters
     ----------
@@ -36,84 +128,14 @@ def select_e (install, log_phase):
      equipments within each vessel and equipment combinations dataframes
     """
 
-    req_e = install['requirement'][0]
-    #Initialize an empty dic with the name of the equip to be evaluated
-    eq = dict.fromkeys(req_e.keys())
-
-    for typ in range(len(req_e)):
-        e_key_req = req_e.keys()[typ]
-
-        for seq in range(len(log_phase.op_ve)):
-
-            # print 'seq='
-            # print seq
-
-            LEN_combi = len(log_phase.op_ve[seq].ve_combination)
-            combi = 0
-            while combi < LEN_combi:
-
-                # print 'combi='
-                # print combi
-
-                LEN_nr_eq = len(log_phase.op_ve[seq].ve_combination[combi]['equipment'])
-                nr_eq = 0
-                while nr_eq < LEN_nr_eq:
-
-                    # print 'nr_eq='
-                    # print nr_eq
-
-                    e_key_phase = log_phase.op_ve[seq].ve_combination[combi]['equipment'][nr_eq][1].id
-                    e_pd = log_phase.op_ve[seq].ve_combination[combi]['equipment'][nr_eq][1].panda
-
-                    if e_key_phase == e_key_req:
-
-                        for req in range(len(req_e[e_key_req])):
-                            e_para = req_e[e_key_req][req][0]
-                            e_meth = req_e[e_key_req][req][1]
-                            e_val = req_e[e_key_req][req][2]
-
-                            if e_meth == 'sup':
-                                e_pd = e_pd[e_pd[e_para] >= e_val]
-                            # elif e_meth == 'inf':
-                            #     e_pd = e_pd[e_pd[e_para] <= e_val]
-                            # elif e_meth == 'equal':
-                            #     e_pd = e_pd[e_pd[e_para] == e_val]
-
-
-                        # e_sol = e_pd
-                        # Check if no vessel is feasible within the req for this particular ve_combination
-                        # if e_sol.empty:
-                        if len(e_pd.index)==0:
-                            del log_phase.op_ve[seq].ve_combination[combi]   # If so, force the combination to be 0
-                            for ind_comb in range(combi,LEN_combi-1):
-                                log_phase.op_ve[seq].ve_combination[ind_comb] = log_phase.op_ve[seq].ve_combination[ind_comb+1]
-                                del log_phase.op_ve[seq].ve_combination[ind_comb+1]
-                            LEN_combi = len(log_phase.op_ve[seq].ve_combination)
-                            nr_eq = LEN_nr_eq
-                            if combi==LEN_combi-1:
-                                combi=combi+1
-                            break
-                        else:
-                            eq[e_key_req] = e_pd
-                            log_phase.op_ve[seq].ve_combination[combi]['equipment'][nr_eq][1].panda = e_pd
-                            nr_eq = nr_eq + 1
-
-                    else:
-                        if nr_eq==LEN_nr_eq-1:
-                            combi = combi + 1
-                        nr_eq = nr_eq + 1
-
-                combi = combi + 1
-
-
-    return eq, log_phase
+    return select_feasible(install['requirement'][0], log_phase, 'equipment')
 
 
 def select_v (install, log_phase):
     """select_v function selects the vessels that satisfy the minimum requirements
     calculated in the feasibility functions. The current method to do this is
     erasing the unfeasible vessels from the panda dataframes included in the
-    ve_combination objects
+    ve_combination objects, see select_feasible.
 
     Parameters
     ----------
@@ -132,71 +154,4 @@ def select_v (install, log_phase):
      vessels within each vessel and equipment combinations dataframes
     """
 
-    import matplotlib.pyplot as plt
-
-    # load the vessel requirements inside a short named variable
-    req_v = install['requirement'][1]
-
-    # Initialize an empty dic with the name of the vessels to be evaluated
-    ves = dict.fromkeys(req_v.keys())
-
-    for typ in range(len(req_v)):   # loop over the vessel types in requirements
-        v_key_req = req_v.keys()[typ]
-
-        for seq in range(len(log_phase.op_ve)): # loop over the number of strategies (op_ve) of the logistic phase in study
-
-            LEN_combi = len(log_phase.op_ve[seq].ve_combination)
-            combi = 0
-            while combi < LEN_combi: # loop over the number of combinations inside the strategy
-
-                LEN_nr_ves = len(log_phase.op_ve[seq].ve_combination[combi]['vessel'])
-                nr_ves = 0
-                while nr_ves < LEN_nr_ves: # loop over the number of vessels inside the combination
-
-                    v_key_phase = log_phase.op_ve[seq].ve_combination[combi]['vessel'][nr_ves][1].id
-                    v_pd = log_phase.op_ve[seq].ve_combination[combi]['vessel'][nr_ves][1].panda
-
-                    if v_key_phase == v_key_req:
-
-                       for req in range(len(req_v[v_key_req])):
-                           v_para = req_v[v_key_req][req][0]
-                           v_meth = req_v[v_key_req][req][1]
-                           v_val = req_v[v_key_req][req][2]
-
-                           if v_meth == 'sup':
-                               v_pd = v_pd[v_pd[v_para] >= v_val]
-                           # elif v_meth == 'inf':
-                           #     v_pd = v_pd[v_pd[v_para] <= v_val]
-                           # elif v_meth == 'equal':
-                           #     v_pd = v_pd[v_pd[v_para] == v_val]
-
-                       # v_sol = v_pd
-                       # Check if no vessel is feasible within the req for this particular ve_combination
-                       # if v_sol.empty:
-                       if len(v_pd.index)==0:
-                            del log_phase.op_ve[seq].ve_combination[combi]   # If so, force the combination to be 0
-                            for ind_comb in range(combi,LEN_combi-1):
-                                log_phase.op_ve[seq].ve_combination[ind_comb] = log_phase.op_ve[seq].ve_combination[ind_comb+1]
-                                del log_phase.op_ve[seq].ve_combination[ind_comb+1]
-                            LEN_combi = len(log_phase.op_ve[seq].ve_combination)
-                            nr_ves = LEN_nr_ves
-                            if combi==LEN_combi-1:
-                                combi=combi+1
-                            break
-
-                       else:
-                            ves[v_key_req] = v_pd
-                            log_phase.op_ve[seq].ve_combination[combi]['vessel'][nr_ves][1].panda = v_pd
-                            nr_ves = nr_ves + 1
-
-                    else:
-                        if nr_ves==LEN_nr_ves-1:
-                            combi = combi + 1
-                        nr_ves = nr_ves + 1
-
-                combi = combi + 1
-
-
-
-
-    return ves, log_phase
\ No newline at end of file
+    return select_feasible(install['requirement'][1], log_phase, 'vessel')
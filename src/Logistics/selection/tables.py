@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+@author: WavEC Offshore Renewables
+email: boris.teillant@wavec.org; paulo@wavec.org
+
+This module contains the compact representation of the feasible vessels and
+equipments shared by all solutions of a logistic phase. The feasible vessels
+or equipments of each type are stored once as a column-oriented numpy
+structured array, and the solutions only refer to them by their row position,
+instead of holding a copy of a panda Series per vessel and per equipment.
+
+BETA VERSION NOTES: the tables are built by the compatibility functions of the
+selection step and stored in the tables attribute of the logistic phase.
+"""
+
+
+class RecordTable(object):
+    """
+    RecordTable holds the feasible vessels or equipments of one type as a
+    numpy structured array with one field per column of the database. The
+    rows are referred to by their position in the table, the labels keep the
+    index of the corresponding rows in the database.
+    """
+
+    def __init__(self, id, panda):
+        self.id = id
+        self.labels = panda.index.values
+        self.records = panda.to_records(index=False)
+
+    def __len__(self):
+        return len(self.records)
+
+    def column(self, column):
+        """values of a column for all rows of the table"""
+        return self.records[column]
+
+    def record(self, row):
+        """record of a row, its values are read by column name"""
+        return self.records[row]
+
+    def value(self, row, column):
+        """value of a column for a row of the table"""
+        return self.records[column][row]
+
+
+def vessel_record(log_phase, ves_sol):
+    """vessel_record returns the record of the vessel of a solution, ves_sol
+    being the [type, quantity, row, ...] entry of the solution
+    """
+    return log_phase.tables['vessel'][ves_sol[0]].record(ves_sol[2])
+
+
+def equipment_record(log_phase, eq_sol):
+    """equipment_record returns the record of the equipment of a solution,
+    eq_sol being the [type, quantity, row, vessel index] entry of the solution
+    """
+    return log_phase.tables['equipment'][eq_sol[0]].record(eq_sol[2])
@@ -0,0 +1,96 @@
+"""
+@author: WavEC Offshore Renewables
+email: boris.teillant@wavec.org; paulo@wavec.org
+
+batch.py runs the installation assessment of main.py for many projects
+(scenarios), e.g. a sweep of array layouts defined by different
+hydrodynamic_outputs / MF_outputs, over a pool of processes. The reference
+databases (vessels, equipments, ports, logistic operations) are loaded once in
+the parent process and handed to the workers when the pool starts: on
+platforms forking the workers they are shared copy-on-write, elsewhere they
+are sent once per worker instead of once per scenario.
+
+Parameters
+----------
+scenarios (iterable): scenarios accepted by main.run, i.e. dicts with the
+upstream module inputs/outputs of each project
+
+datasets (dict): preloaded data sets as returned by main.load_datasets
+
+Returns
+-------
+
+results (generator): (index, install, error) tuples yielded as soon as each
+scenario is finished, in completion order. index is the position of the
+scenario in scenarios, install the output of main.run and error None or the
+traceback of the failed assessment.
+
+Examples
+--------
+>>> datasets = load_datasets()
+>>> for index, install, error in run_batch(layouts, datasets):
+...     print index, install['cost']
+"""
+
+import multiprocessing
+import traceback
+
+from main import run, load_datasets
+
+# data sets shared by all scenarios assessed in a worker process
+worker_datasets = None
+
+
+def init_worker(datasets):
+    """stores the reference data sets in the worker process
+    """
+    global worker_datasets
+    worker_datasets = datasets
+
+
+def run_scenario(args):
+    """assesses one scenario in a worker process, failures are returned
+    instead of raised so that they do not stop the batch
+    """
+    index, scenario = args
+    try:
+        return index, run(scenario, worker_datasets), None
+    except Exception:
+        return index, None, traceback.format_exc()
+
+
+def run_batch(scenarios, datasets=None, processes=None, chunksize=1):
+    """run_batch assesses each scenario with main.run over a pool of processes
+    and streams the results back as they finish
+
+    Parameters
+    ----------
+    scenarios : iterable
+     scenarios accepted by main.run
+    datasets : dict
+     preloaded data sets as returned by main.load_datasets, loaded from the
+     databases if None
+    processes : int
+     number of worker processes, the number of cpus if None
+    chunksize : int
+     number of scenarios sent to a worker at once
+
+    Returns
+    -------
+    results : generator
+     (index, install, error) tuples in completion order
+    """
+    if datasets is None:
+        datasets = load_datasets()
+
+    pool = multiprocessing.Pool(processes, init_worker, (datasets,))
+    try:
+        for result in pool.imap_unordered(run_scenario, enumerate(scenarios),
+                                          chunksize):
+            yield result
+        pool.close()
+    except:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
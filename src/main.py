@@ -57,6 +57,7 @@ install (dict): dictionnary compiling all key results obtained from the assessme
     've_select' (dict): list of vessels satisfying the minimum requirements
     'combi_select' (dict): list of solutions passing the compatibility check
     'schedule' (dict): list of parameters with data about time
+    'simulation' (dict): start and end times of the layers and logistic phases of the installation plan, simulated through the metocean data
     'cost'  (dict): vessel equiment and port cost
     'risk': to be defined
     'envir': to be defined
@@ -65,7 +66,8 @@ install (dict): dictionnary compiling all key results obtained from the assessme
 
 Examples
 --------
->>> LOGISTICS()
+>>> datasets = load_datasets()
+>>> install = run(0, datasets)
 
 
 See also: ...
@@ -78,6 +80,8 @@ See also: ...
 
 """
 
+import hashlib
+import warnings
 from os import path
 
 from Logistics.load import load_phase_order_data, load_time_olc_data
@@ -88,7 +92,10 @@ from Logistics.load import load_port_data
 from Logistics.load.wp_bom import load_user_inputs, load_hydrodynamic_outputs
 from Logistics.load.wp_bom import load_electrical_outputs, load_MF_outputs
 from Logistics.load.wp_bom import load_OM_outputs
+from Logistics.load.snapshot import Snapshot, save_snapshot, has_snapshot
+from Logistics.load.cache import workbook_digest
 
+from Logistics.phases import VesselType, EquipmentType
 from Logistics.phases.operations import logOp_init
 from Logistics.phases.install import logPhase_install_init
 from Logistics.phases.om import logPhase_om_init         # FOR OM ONLY!!!!!!!!
@@ -97,8 +104,10 @@ from Logistics.installation import select_port
 from Logistics.feasibility.glob import glob_feas
 from Logistics.selection.select_ve import select_e, select_v
 from Logistics.selection.match import compatibility_ve
-from Logistics.performance.schedule.schedule import sched
+from Logistics.performance.schedule.schedule import sched, phase_schedules
+from Logistics.performance.schedule.simulation import simulate_layer
 from Logistics.performance.economic.eco import cost
+from Logistics.performance.rank import rank_solutions
 
 # # Set directory paths for loading inputs (@Tecnalia)
 mod_path = path.dirname(path.realpath(__file__))
@@ -110,122 +119,250 @@ def database_file(file):
     db_path = path.join(mod_path, fpath)
     return db_path
 
-#def run():
-"""
-Load required inputs and database into panda dataframes
-"""
-
-import pickle
-
-# inputs_SV_LD = 'save'
-inputs_SV_LD = 'load'
+# workbook of each data set stored in the snapshots
+DATASET_FILES = {'phase_order': "Installation_Order.xlsx",
+                 'schedule_OLC': "operations_time_OLC.xlsx",
+                 'eq_rates': "equipment_perf_rates.xlsx",
+                 'safety_factors': "safety_factors.xlsx",
+                 'vessels': "logisticsDB_vessel_python.xlsx",
+                 'equipments': "logisticsDB_equipment_python.xlsx",
+                 'ports': "logisticsDB_ports_python.xlsx",
+                 'user_inputs': "inputs_user.xlsx",
+                 'hydrodynamic_outputs': "ouputs_hydrodynamic.xlsx",
+                 'electrical_outputs': "ouputs_electrical.xlsx",
+                 'MF_outputs': "outputs_MF.xlsx",
+                 'OM_outputs': "outputs_OM.xlsx"}
+
+REFERENCE_DATASETS = ['phase_order', 'schedule_OLC', 'eq_rates',
+                      'safety_factors', 'vessels', 'equipments', 'ports',
+                      'logOp']
+
+# installation plan of the project cases not covered by planning
+DEFAULT_PLAN = {0: ['Devices']}
+
+UPSTREAM_DATASETS = ['user_inputs', 'hydrodynamic_outputs',
+                     'electrical_outputs', 'MF_outputs', 'OM_outputs']
+
+
+def databases_key():
+    """Returns the key of the snapshots of the databases, the sha1 digest of
+    the content digests of all workbooks
+    """
+    sha = hashlib.sha1()
+    for key in sorted(DATASET_FILES):
+        sha.update(key)
+        sha.update(workbook_digest(database_file(DATASET_FILES[key])))
+    return sha.hexdigest()
+
+
+def load_datasets(snapshot_name=None):
+    """Load required inputs and database into panda dataframes. If a snapshot
+    name is given, the data sets are read from the named snapshot when it was
+    saved from the current databases: each data set is only deserialised when
+    its loader is called. Otherwise the data sets are imported from the
+    databases and saved as a new snapshot.
+
+    Parameters
+    ----------
+    snapshot_name : string
+     name of the snapshot of input data sets (see Logistics.load.snapshot),
+     None to always import the databases
+
+    Returns
+    -------
+    datasets : dict
+     dictionnary containing the reference databases (REFERENCE_DATASETS) and
+     the upstream module inputs/outputs of the example project
+     (UPSTREAM_DATASETS)
+    """
+    inputs_snapshot = None
+    if snapshot_name is not None:
+        snapshot_key = databases_key()
+        if has_snapshot(snapshot_name, key=snapshot_key):
+            inputs_snapshot = Snapshot(snapshot_name)
 
-if inputs_SV_LD == "save":
-    # Saving the objects:
+    datasets = {}
 
     #default_values inputs
-    phase_order = load_phase_order_data(database_file("Installation_Order.xlsx"))
-    schedule_OLC = load_time_olc_data(database_file("operations_time_OLC.xlsx"))
-    penet_rates, laying_rates = load_eq_rates(database_file("equipment_perf_rates.xlsx"))
-    port_sf, vessel_sf, eq_sf = load_sf(database_file("safety_factors.xlsx"))
+    datasets['phase_order'] = load_phase_order_data(database_file(DATASET_FILES['phase_order']), inputs_snapshot)
+    datasets['schedule_OLC'] = load_time_olc_data(database_file(DATASET_FILES['schedule_OLC']), inputs_snapshot)
+    datasets['eq_rates'] = load_eq_rates(database_file(DATASET_FILES['eq_rates']), inputs_snapshot)
+    datasets['safety_factors'] = load_sf(database_file(DATASET_FILES['safety_factors']), inputs_snapshot)
 
     #Internal logistic module databases
-    vessels = load_vessel_data(database_file("logisticsDB_vessel_python.xlsx"))
-    equipments = load_equipment_data(database_file("logisticsDB_equipment_python.xlsx"))
-    ports = load_port_data(database_file("logisticsDB_ports_python.xlsx"))
+    datasets['vessels'] = load_vessel_data(database_file(DATASET_FILES['vessels']), inputs_snapshot)
+    datasets['equipments'] = load_equipment_data(database_file(DATASET_FILES['equipments']), inputs_snapshot)
+    datasets['ports'] = load_port_data(database_file(DATASET_FILES['ports']), inputs_snapshot)
 
     #upstream module inputs/outputs
-    user_inputs = load_user_inputs(database_file("inputs_user.xlsx"))
-    hydrodynamic_outputs = load_hydrodynamic_outputs(database_file("ouputs_hydrodynamic.xlsx"))
-    electrical_outputs = load_electrical_outputs(database_file("ouputs_electrical.xlsx"))
-    MF_outputs = load_MF_outputs(database_file("outputs_MF.xlsx"))
-    OM_outputs = load_OM_outputs(database_file("outputs_OM.xlsx"))
-
-    with open('objs.pickle', 'w') as f:
-        pickle.dump([phase_order, schedule_OLC, vessels, equipments, ports, user_inputs, hydrodynamic_outputs, electrical_outputs, MF_outputs], f)
-
-elif inputs_SV_LD == "load":
-    # Getting back the objects:
-    with open('objs.pickle') as f:
-        phase_order, schedule_OLC, vessels, equipments, ports, user_inputs, hydrodynamic_outputs, electrical_outputs, MF_outputs = pickle.load(f)
-
-else:
-    print 'Invalid SaveLoad option'
-
-"""
- Initialise logistic operations and logistic phases
-"""
-
-# logOp = logOp_init()
-
-logOp = logOp_init(database_file("operations_time_OLC.xlsx"))
-
-
-"""
-Determine the adequate installation logistic phase plan
-"""
-install_plan, instal_order = planning.install_plan(database_file("Installation_Order.xlsx"), user_inputs, electrical_outputs, MF_outputs)
-
-# DUMMY-TO BE ERASED, install plan is constrained to F_driven because
-# we just have the F_driven characterized for now
-# install_plan = {0: ['F_driven']}
-install_plan = {0: ['Devices'] }
-
-
-"""
-Select the most appropriate base installation port
-"""
-
-install_port = select_port.install_port(user_inputs, hydrodynamic_outputs, electrical_outputs, MF_outputs, ports, instal_order)
-
-# Incremental assessment of all logistic phase forming the the installation process
-install = {'plan': install_plan,
-          'port': install_port,
-          'requirement': {},
-          'eq_select': {},
-          've_select': {},
-          'combi_select': {},
-          'schedule': {},
-          'cost': {},
-          'risk': {},
-          'envir': {},
-          'status': "pending"}
-
-
-logPhase_install = logPhase_install_init(logOp, vessels, equipments, user_inputs,
-                                         electrical_outputs, MF_outputs, hydrodynamic_outputs)
-
-#logPhase_om = logPhase_om_init(logOp, vessels, equipments, user_inputs, OM_outputs)
-
-if install['status'] == "pending":
-   # loop over the number of layers of the installation plan
-   for x in range(len(install['plan'])):
-       for y in range(len(install['plan'][x])):
-           # extract the LogPhase ID to be evaluated from the installation plan
-           log_phase_id = install['plan'][x][y]
-           log_phase = logPhase_install[log_phase_id]
-           # print log_phase
-
-           # characterize the logistic requirements
-           install['requirement'] = glob_feas(log_phase, log_phase_id, user_inputs, hydrodynamic_outputs,
-                                              electrical_outputs, MF_outputs)
-
-           # selection of the maritime infrastructure
-           install['eq_select'], log_phase = select_e(install, log_phase)
-           install['ve_select'], log_phase = select_v(install, log_phase)
-
-           # matching requirements for combinations of port/vessel(s)/equipment
-           install['combi_select'], log_phase = compatibility_ve(install, log_phase, install_port['Selected base port for installation'])
-#           print install['combi_select']
+    datasets['user_inputs'] = load_user_inputs(database_file(DATASET_FILES['user_inputs']), inputs_snapshot)
+    datasets['hydrodynamic_outputs'] = load_hydrodynamic_outputs(database_file(DATASET_FILES['hydrodynamic_outputs']), inputs_snapshot)
+    datasets['electrical_outputs'] = load_electrical_outputs(database_file(DATASET_FILES['electrical_outputs']), inputs_snapshot)
+    datasets['MF_outputs'] = load_MF_outputs(database_file(DATASET_FILES['MF_outputs']), inputs_snapshot)
+    datasets['OM_outputs'] = load_OM_outputs(database_file(DATASET_FILES['OM_outputs']), inputs_snapshot)
+
+    # save the snapshot again if it is missing, stale or partly unreadable
+    if snapshot_name is not None and (inputs_snapshot is None or inputs_snapshot.failed):
+        save_snapshot(snapshot_name, datasets, key=snapshot_key)
+
+    # Initialise logistic operations
+    datasets['logOp'] = logOp_init(database_file("operations_time_OLC.xlsx"))
+
+    return datasets
+
+
+def run(scenario=0, datasets=None, top_k=None, rank_by='cost', route='installation',
+        install_plan=None, journeys='greedy'):
+    """run performs the assessment of the installation of one project. The
+    reference databases can be loaded once with load_datasets and passed to
+    successive calls, so that a process evaluating many projects keeps them
+    in memory.
+
+    Parameters
+    ----------
+    scenario : int or dict
+     0 assesses the example project of the databases folder, a dict provides
+     the upstream module inputs/outputs of the project to be assessed (any of
+     UPSTREAM_DATASETS), the missing ones being taken from datasets
+    datasets : dict
+     dictionnary containing the preloaded data sets as returned by
+     load_datasets, loaded from the databases if None. It is not modified.
+    top_k : int
+     if given, only the top_k best solutions of each logistic phase are
+     scheduled, costed and returned, see Logistics.performance.rank
+    rank_by : str
+     ranking criterion of the solutions, 'cost' or 'time'
+    route : str
+     order of visit of the elements of each vessel journey, 'installation',
+     'nearest' or '2-opt', see Logistics.performance.schedule.journeys
+    install_plan : dict
+     installation plan {layer: [logistic phase ids]} to be assessed, given by
+     Logistics.installation.planning for the project case if None
+    journeys : str
+     loading of the elements on the deck of the transporting vessel,
+     'greedy' (installation order) or 'ffd' (first fit decreasing), see
+     Logistics.performance.schedule.journeys
+
+    Returns
+    -------
+    install : dict
+     dictionnary compiling all key results obtained from the assessment of the
+     logistic phases for installation (see module documentation)
+    """
+    if datasets is None:
+        datasets = load_datasets()
+
+    data = dict(datasets)
+    if isinstance(scenario, dict):
+        data.update(scenario)
+    elif scenario != 0:
+        raise ValueError("unknown scenario: {0}".format(scenario))
+
+    # the feasibility and selection steps shrink the panda dataframes of the
+    # vessel and equipment classes, work on copies of the classes so that
+    # preloaded databases can be reused
+    vessels = dict((key, VesselType(ves.id, ves.panda))
+                   for key, ves in data['vessels'].items())
+    equipments = dict((key, EquipmentType(eq.id, eq.panda))
+                      for key, eq in data['equipments'].items())
+    ports = data['ports']
+    logOp = data['logOp']
+
+    user_inputs = data['user_inputs']
+    hydrodynamic_outputs = data['hydrodynamic_outputs']
+    electrical_outputs = data['electrical_outputs']
+    MF_outputs = data['MF_outputs']
 
-#          schedule assessment of the different operation sequence
-           install['schedule'], log_phase = sched(x, install, log_phase,
-                                                  log_phase_id, user_inputs,
-                                                  hydrodynamic_outputs,
-                                                  electrical_outputs,
-                                                  MF_outputs)
+    """
+    Determine the adequate installation logistic phase plan
+    """
+    project_plan, instal_order = planning.install_plan(database_file("Installation_Order.xlsx"), user_inputs, electrical_outputs, MF_outputs)
+    if install_plan is None:
+        install_plan = project_plan
+    if not install_plan:
+        # the installation sequences of planning do not cover the project case
+        warnings.warn("no installation sequence defined for this project, only the devices are installed")
+        install_plan = dict(DEFAULT_PLAN)
 
-#           # cost assessment of the different operation sequenc
-           install['cost'], log_phase = cost(install, log_phase)
 
+    """
+    Select the most appropriate base installation port
+    """
 
+    install_port = select_port.install_port(user_inputs, hydrodynamic_outputs, electrical_outputs, MF_outputs, ports, instal_order)
+
+    # Incremental assessment of all logistic phase forming the the installation process
+    install = {'plan': install_plan,
+              'port': install_port,
+              'requirement': {},
+              'eq_select': {},
+              've_select': {},
+              'combi_select': {},
+              'schedule': {},
+              'cost': {},
+              'risk': {},
+              'envir': {},
+              'route': route,
+              'journeys': journeys,
+              'simulation': {'phases': {}, 'layers': {}},
+              'status': "pending"}
+
+
+    logPhase_install = logPhase_install_init(logOp, vessels, equipments, user_inputs,
+                                             electrical_outputs, MF_outputs, hydrodynamic_outputs)
+
+    #logPhase_om = logPhase_om_init(logOp, vessels, equipments, user_inputs, OM_outputs)
+
+    if install['status'] == "pending":
+       # loop over the number of layers of the installation plan
+       for x in range(len(install['plan'])):
+           for y in range(len(install['plan'][x])):
+               # extract the LogPhase ID to be evaluated from the installation plan
+               log_phase_id = install['plan'][x][y]
+               log_phase = logPhase_install[log_phase_id]
+               # print log_phase
+
+               # characterize the logistic requirements
+               install['requirement'] = glob_feas(log_phase, log_phase_id, user_inputs, hydrodynamic_outputs,
+                                                  electrical_outputs, MF_outputs)
+
+               # selection of the maritime infrastructure
+               install['eq_select'], log_phase = select_e(install, log_phase)
+               install['ve_select'], log_phase = select_v(install, log_phase)
+
+               if top_k is not None:
+                   # best solutions, scheduled and costed
+                   install['combi_select'], install['cost'], log_phase = rank_solutions(x, install, log_phase, log_phase_id,
+                                                                                        install_port['Selected base port for installation'],
+                                                                                        user_inputs, hydrodynamic_outputs,
+                                                                                        electrical_outputs, MF_outputs,
+                                                                                        top_k, rank_by)
+                   install['schedule'] = phase_schedules(log_phase)
+                   continue
+
+               # matching requirements for combinations of port/vessel(s)/equipment
+               install['combi_select'], log_phase = compatibility_ve(install, log_phase, install_port['Selected base port for installation'])
+    #           print install['combi_select']
+
+    #          schedule assessment of the different operation sequence
+               install['schedule'], log_phase = sched(x, install, log_phase,
+                                                      log_phase_id, user_inputs,
+                                                      hydrodynamic_outputs,
+                                                      electrical_outputs,
+                                                      MF_outputs)
+
+    #           # cost assessment of the different operation sequenc
+               install['cost'], log_phase = cost(install, log_phase)
+
+           # simulation of the layer through the met-ocean data, with the
+           # selected solution of each logistic phase
+           install['simulation'] = simulate_layer(install['simulation'], x, install['plan'][x],
+                                                  logPhase_install, user_inputs['metocean'],
+                                                  user_inputs['device']['Project start date [-]'].ix[0])
+
+    return install
+
+
+if __name__ == "__main__":
+
+    install = run(0)
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""py.test fixtures shared by the tests of the installation module
+"""
+
+import os
+import sys
+
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+import main
+from Logistics.phases import VesselType
+
+
+@pytest.fixture(scope='session')
+def reference_datasets():
+    '''Data sets of the reference project, imported from the databases'''
+
+    return main.load_datasets(None)
+
+
+@pytest.fixture(scope='session')
+def feasible_datasets(reference_datasets):
+    '''Data sets of the reference project in which the Crane Barge has a
+    winch able to deploy the rov. No vessel of the reference databases can
+    install the devices otherwise, so that this fixture exercises the whole
+    assessment chain on non-empty solutions.'''
+
+    datasets = dict(reference_datasets)
+    datasets['vessels'] = dict(reference_datasets['vessels'])
+    crane_barge = reference_datasets['vessels']['Crane Barge']
+    panda = crane_barge.panda.copy()
+    panda['AH winch rated pull [t]'] = 50.
+    datasets['vessels']['Crane Barge'] = VesselType(crane_barge.id, panda)
+
+    return datasets
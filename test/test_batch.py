@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""py.test tests on batch.py
+"""
+
+import numpy
+
+from batch import run_batch
+
+
+def summary(install):
+    '''Number of solutions and costs of the devices phase of an assessment'''
+    
+    return [(seq, ind_sol, sorted(install['cost'][seq][ind_sol].items()))
+            for seq in sorted(install['cost'])
+            for ind_sol in sorted(install['cost'][seq])]
+
+
+def test_run_batch(feasible_datasets):
+    '''Test that the results of a batch do not depend on the number of
+    processes'''
+    
+    hydrodynamic_outputs = feasible_datasets['hydrodynamic_outputs']
+    scenarios = [{},
+                 {'hydrodynamic_outputs': hydrodynamic_outputs.iloc[:1]}]
+    
+    results = {}
+    for processes in [1, 2]:
+        batch = sorted(run_batch(scenarios, feasible_datasets, processes))
+        assert [index for index, install, error in batch] == [0, 1]
+        assert [error for index, install, error in batch] == [None, None]
+        results[processes] = [summary(install) for index, install, error in batch]
+    
+    assert results[1][0] and results[1][1]
+    numpy.testing.assert_equal(results[2], results[1])
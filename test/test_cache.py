@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""py.test tests on the cache of the databases
+"""
+
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+from Logistics.load import cache
+
+DATABASES = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                         'src', 'databases')
+# two workbooks with a sheet of the same name
+VESSELS = os.path.join(DATABASES, 'logisticsDB_vessel_python.xlsx')
+SEQUENCING = os.path.join(DATABASES, 'InterPhasingSequencing_python.xlsx')
+SHEET = 'Python_Format'
+
+
+@pytest.fixture
+def opened(monkeypatch, tmpdir):
+    '''Workbooks opened by the cache, in a temporary cache folder'''
+    
+    monkeypatch.setenv(cache.CACHE_ENV, str(tmpdir.join('cache')))
+    
+    excel_file = pd.ExcelFile
+    paths = []
+    
+    def counted(file_path):
+        paths.append(file_path)
+        return excel_file(file_path)
+    
+    monkeypatch.setattr(cache.pd, 'ExcelFile', counted)
+    return paths
+
+
+def copy_workbook(source, path, mtime):
+    '''Copies a workbook, with the given modification time'''
+    
+    if not os.path.isdir(os.path.dirname(path)):
+        os.makedirs(os.path.dirname(path))
+    shutil.copyfile(source, path)
+    os.utime(path, (mtime, mtime))
+
+
+def test_parse_excel_hit(opened, tmpdir):
+    '''Test that an unchanged workbook is read from the cache'''
+    
+    path = str(tmpdir.join('book.xlsx'))
+    copy_workbook(VESSELS, path, 1e9)
+    
+    first = cache.parse_excel(path, SHEET)
+    second = cache.parse_excel(path, SHEET)
+    
+    assert opened == [path]
+    pd.testing.assert_frame_equal(second, first)
+    pd.testing.assert_frame_equal(first, pd.ExcelFile(VESSELS).parse(SHEET,
+                                                                     header=0,
+                                                                     index_col=0))
+
+
+def test_parse_excel_changed(opened, tmpdir):
+    '''Test that a changed workbook is imported again'''
+    
+    path = str(tmpdir.join('book.xlsx'))
+    copy_workbook(VESSELS, path, 1e9)
+    cache.parse_excel(path, SHEET)
+    
+    copy_workbook(SEQUENCING, path, 1e9 + 1)
+    changed = cache.parse_excel(path, SHEET)
+    
+    assert opened == [path, path]
+    pd.testing.assert_frame_equal(changed, cache.parse_excel(SEQUENCING, SHEET))
+
+
+def test_parse_excel_corrupt(opened, tmpdir):
+    '''Test that a corrupt entry is imported again and replaced'''
+    
+    path = str(tmpdir.join('book.xlsx'))
+    copy_workbook(VESSELS, path, 1e9)
+    first = cache.parse_excel(path, SHEET)
+    
+    folder = str(tmpdir.join('cache'))
+    entries = [name for name in os.listdir(folder) if name.endswith('.pkl')]
+    assert len(entries) == 1
+    with open(os.path.join(folder, entries[0]), 'wb') as f:
+        f.write('not a pickle')
+    
+    pd.testing.assert_frame_equal(cache.parse_excel(path, SHEET), first)
+    pd.testing.assert_frame_equal(cache.parse_excel(path, SHEET), first)
+    assert opened == [path, path]
+
+
+def test_parse_excel_same_name(opened, tmpdir):
+    '''Test that workbooks of the same name in different folders do not
+    share their cache entries'''
+    
+    first = str(tmpdir.join('a', 'book.xlsx'))
+    second = str(tmpdir.join('b', 'book.xlsx'))
+    copy_workbook(VESSELS, first, 1e9)
+    copy_workbook(SEQUENCING, second, 1e9)
+    
+    sheets = [cache.parse_excel(path, SHEET) for path in [first, second]]
+    again = [cache.parse_excel(path, SHEET) for path in [first, second]]
+    
+    assert opened == [first, second]
+    assert not sheets[0].equals(sheets[1])
+    for sheet, sheet_again in zip(sheets, again):
+        pd.testing.assert_frame_equal(sheet_again, sheet)
+    manifests = [name for name in os.listdir(str(tmpdir.join('cache')))
+                 if name.endswith('.json')]
+    assert len(manifests) == 2
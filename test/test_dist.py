@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""py.test tests on the distance functions
+"""
+
+import numpy
+import pytest
+import utm
+
+from geopy.distance import EARTH_RADIUS, great_circle, great_circle_array
+
+from Logistics.ancillaries import dist
+
+
+POINTS = [(50.1, -5.5), (50.3, -6.2), (49.9, -5.5), (-50.1, 174.5),
+          (0., 0.), (0., 180.), (90., 0.), (-90., 0.), (50.1, -5.5)]
+
+
+def utm_points(points):
+    '''x, y and zone arrays of points given by latitude and longitude, the
+    zones being given as in the databases (e.g. '30 U')'''
+    
+    coords = [utm.from_latlon(lat, lng) for lat, lng in points]
+    
+    return (numpy.array([coord[0] for coord in coords]),
+            numpy.array([coord[1] for coord in coords]),
+            numpy.array(['{0:02d} {1}'.format(coord[2], coord[3])
+                         for coord in coords], dtype=object))
+
+
+def test_great_circle_array():
+    '''Test that the distances between arrays of points are the scalar great
+    circle distances, including equal and antipodal points'''
+    
+    lat, lng = numpy.array(POINTS).T
+    
+    matrix = great_circle_array(lat[:, None], lng[:, None], lat, lng)
+    
+    assert matrix.shape == (len(POINTS), len(POINTS))
+    for ind_a, point_a in enumerate(POINTS):
+        for ind_b, point_b in enumerate(POINTS):
+            assert matrix[ind_a, ind_b] == pytest.approx(
+                great_circle(point_a, point_b).kilometers, abs=1e-6)
+    
+    numpy.testing.assert_allclose(numpy.diag(matrix), 0., atol=1e-6)
+    assert matrix[0, -1] == pytest.approx(0., abs=1e-6)
+    assert matrix[4, 5] == pytest.approx(numpy.pi * EARTH_RADIUS)
+    assert matrix[6, 7] == pytest.approx(numpy.pi * EARTH_RADIUS)
+
+
+def test_great_circle_array_nan():
+    '''Test that missing coordinates give missing distances only'''
+    
+    distances = great_circle_array([50.1, numpy.nan], [-5.5, -6.2],
+                                   [50.3, 50.3], [-6.2, -6.2])
+    
+    assert distances[0] == pytest.approx(
+        great_circle((50.1, -5.5), (50.3, -6.2)).kilometers)
+    assert numpy.isnan(distances[1])
+
+
+def test_distance_matrix():
+    '''Test that the distance matrix of UTM points is made of the pairwise
+    distances'''
+    
+    points = [(50.1, -5.5), (50.3, -6.2), (49.9, -5.45), (50.1, -5.5),
+              (51.2, -3.1)]
+    x, y, zone = utm_points(points)
+    
+    assert len(set(zone)) == 2
+    
+    matrix = dist.distance_matrix(x, y, zone)
+    
+    assert matrix.shape == (5, 5)
+    for ind_a in range(5):
+        for ind_b in range(5):
+            assert matrix[ind_a, ind_b] == pytest.approx(
+                dist.distance([x[ind_a], y[ind_a], zone[ind_a]],
+                              [x[ind_b], y[ind_b], zone[ind_b]]), abs=1e-6)
+    
+    assert matrix[0, 3] == pytest.approx(0., abs=1e-6)
+    numpy.testing.assert_allclose(matrix, matrix.T)
+
+
+def test_distance_matrix_planar():
+    '''Test that points without zone fall back to planar distances'''
+    
+    x = [0., 3000., 3000., 500.]
+    y = [0., 4000., 0., 500.]
+    
+    for zone in [[numpy.nan] * 4, ['30 U', '30 U', None, '30 U']]:
+        matrix = dist.distance_matrix(x, y, zone)
+        
+        assert matrix[0, 1] == pytest.approx(5.)
+        assert matrix[1, 2] == pytest.approx(4.)
+        assert matrix[0, 3] == pytest.approx(numpy.hypot(.5, .5))
+        numpy.testing.assert_allclose(numpy.diag(matrix), 0.)
+        numpy.testing.assert_allclose(matrix, matrix.T)
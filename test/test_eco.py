@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""py.test tests on the cost step
+"""
+
+import numpy
+import pandas as pd
+import pytest
+
+from Logistics.performance.economic import eco
+from Logistics.selection.tables import RecordTable
+
+
+class Phase(object):
+    '''Logistic phase with the feasible vessels and equipments tables only'''
+    
+    def __init__(self, tables):
+        self.tables = tables
+
+
+@pytest.fixture
+def rates():
+    '''Day rates of a vessel type and of rovs, the first one without any
+    rate'''
+    
+    vessels = pd.DataFrame({'Op max Day Rate': [45000., 52000.],
+                            'Op min Day Rate': [40000., 48000.]})
+    rovs = pd.DataFrame({'ROV day rate [EURO/day]': [numpy.nan, 2300., 2000.],
+                         'AE supervisor [-]': [1., 1., 1.],
+                         'Supervisor rate [EURO/12h]': [numpy.nan, 1370., 1900.],
+                         'AE technician [-]': [1., 1., 2.],
+                         'Technician rate [EURO/12h]': [numpy.nan, 1247., 1800.]})
+    tables = {'vessel': {'Crane Barge': RecordTable('Crane Barge', vessels)},
+              'equipment': {'rov': RecordTable('rov', rovs)}}
+    
+    return eco.day_rate_tables(Phase(tables))
+
+
+def test_day_rate_tables(rates):
+    '''Test that the equipments without price data have no day rate'''
+    
+    numpy.testing.assert_allclose(rates['vessel']['Crane Barge'],
+                                  [42500., 50000.])
+    numpy.testing.assert_allclose(rates['equipment']['rov'],
+                                  [numpy.nan, 2300. + 2*1370. + 2*1247.,
+                                   2000. + 2*1900. + 4*1800.])
+
+
+def test_solutions_cost(rates):
+    '''Test the costs of solutions over a schedule with preparation, waiting
+    and sea times'''
+    
+    sched = {'preparation': 12., 'waiting time': 6., 'sea time': 30.}
+    sols = {0: {'VEs': [['Crane Barge', 1, 0, ['rov', 1, 0, 0]]]},
+            1: {'VEs': [['Crane Barge', 1, 1, ['rov', 1, 1, 0]]]},
+            2: {'VEs': [['Crane Barge', 2, 0, ['rov', 2, 2, 0]]]}}
+    
+    assert eco.charter_time(sched) == 48.
+    
+    sol_cost = eco.solutions_cost(sols, rates, [eco.charter_time(sched)] * 3)
+    
+    assert sorted(sol_cost) == [0, 1, 2]
+    assert sol_cost[0]['vessel cost'] == pytest.approx(42500. * 2)
+    # the cost of the rov without price data is missing, not free
+    assert numpy.isnan(sol_cost[0]['equipment cost'])
+    assert sol_cost[1]['vessel cost'] == pytest.approx(50000. * 2)
+    assert sol_cost[1]['equipment cost'] == pytest.approx(7534. * 2)
+    assert sol_cost[2]['vessel cost'] == pytest.approx(2 * 42500. * 2)
+    assert sol_cost[2]['equipment cost'] == pytest.approx(2 * 13000. * 2)
+    for ind_sol in sol_cost:
+        assert sol_cost[ind_sol]['port cost'] == 0.
@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+"""py.test tests on the feasibility functions
+"""
+
+import pytest
+
+from Logistics.feasibility.devices import devices_feas
+
+
+def test_devices_feas_deck(reference_datasets):
+    '''Test the deck requirements of the devices in tonnes'''
+    
+    user_inputs = reference_datasets['user_inputs']
+    device = user_inputs['device']
+    mass = device['dry mass [kg]'].ix[0] / 1000.
+    area = device['length [m]'].ix[0] * device['width [m]'].ix[0]
+    
+    feas_v = devices_feas(None, 'Devices', user_inputs)[1]
+    requirements = dict((req[0], req[2]) for req in feas_v['Crane Barge'])
+    
+    assert requirements['Max. cargo [t]'] == pytest.approx(mass)
+    assert requirements['Deck loading [t/m^2]'] == pytest.approx(mass / area)
+    assert requirements['Deck loading [t/m^2]'] > 0
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""py.test tests on the journey planner
+"""
+
+import numpy
+import pytest
+
+from Logistics.performance.schedule import journeys
+
+
+def as_lists(planned):
+    '''Journeys as lists of element indexes'''
+    
+    return [list(journey) for journey in planned]
+
+
+def route_length(dist, order):
+    '''Length of a route visiting the points in order, without return'''
+    
+    order = numpy.asarray(order)
+    return dist[order[:-1], order[1:]].sum()
+
+
+def test_greedy_journeys():
+    '''Test that the elements are loaded in installation order'''
+    
+    planned, unfit = journeys.plan_journeys([40., 40., 30., 30.], [1.] * 4,
+                                            70., 100.)
+    
+    assert as_lists(planned) == [[0], [1, 2], [3]]
+    assert not len(unfit)
+    
+    # limited by the cargo
+    planned, unfit = journeys.plan_journeys([1.] * 5, [5., 5., 5., 2., 8.],
+                                            70., 10.)
+    
+    assert as_lists(planned) == [[0, 1], [2, 3], [4]]
+
+
+def test_ffd_journeys():
+    '''Test that the elements are packed by first fit decreasing'''
+    
+    planned, unfit = journeys.plan_journeys([40., 40., 30., 30.], [1.] * 4,
+                                            70., 100., method='ffd')
+    
+    assert as_lists(planned) == [[0, 2], [1, 3]]
+    assert not len(unfit)
+    
+    # the heaviest elements, of larger share of the cargo than of the deck,
+    # are loaded first
+    planned, unfit = journeys.plan_journeys([35., 35., 10., 10.], [1., 1., 6., 6.],
+                                            70., 10., method='ffd')
+    
+    assert as_lists(planned) == [[0, 2], [1, 3]]
+
+
+@pytest.mark.parametrize('method', journeys.JOURNEY_METHODS)
+def test_plan_journeys_unfit(method):
+    '''Test that the elements too large or too heavy for the deck are not
+    part of any journey'''
+    
+    planned, unfit = journeys.plan_journeys([10., 100., 10., 10.],
+                                            [1., 1., 1., 50.], 70., 20.,
+                                            method=method)
+    
+    assert list(unfit) == [1, 3]
+    assert as_lists(planned) == [[0, 2]]
+
+
+@pytest.mark.parametrize('method', journeys.JOURNEY_METHODS)
+def test_plan_journeys_missing(method):
+    '''Test that missing areas, masses or capacities do not limit the
+    journeys'''
+    
+    planned, unfit = journeys.plan_journeys([numpy.nan, 60., numpy.nan],
+                                            [1., numpy.nan, 1.], 70., 10.,
+                                            method=method)
+    
+    assert as_lists(planned) == [[0, 1, 2]]
+    assert not len(unfit)
+    
+    planned, unfit = journeys.plan_journeys([100., 100.], [1., 1.],
+                                            numpy.nan, numpy.nan, method=method)
+    
+    assert as_lists(planned) == [[0, 1]]
+
+
+def test_plan_journeys_method():
+    '''Test that an unknown method is rejected'''
+    
+    with pytest.raises(ValueError):
+        journeys.plan_journeys([1.], [1.], 10., 10., method='random')
+
+
+def test_nearest_neighbour():
+    '''Test the nearest neighbour route of points on a line'''
+    
+    x = numpy.array([0., 5., 1., 4., 2.])
+    dist = abs(x[:, None] - x)
+    
+    assert list(journeys.nearest_neighbour(dist)) == [0, 2, 4, 3, 1]
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_two_opt(seed):
+    '''Test that 2-opt does not lengthen the nearest neighbour route'''
+    
+    rng = numpy.random.RandomState(seed)
+    xy = rng.uniform(size=(12, 2))
+    dist = numpy.hypot(*(xy[:, None] - xy).transpose(2, 0, 1))
+    
+    nearest = journeys.nearest_neighbour(dist)
+    improved = journeys.two_opt(dist, nearest)
+    
+    assert improved[0] == 0
+    assert sorted(improved) == range(12)
+    assert route_length(dist, improved) <= route_length(dist, nearest) + 1e-12
+
+
+def test_two_opt_crossing():
+    '''Test that a route crossing itself is uncrossed'''
+    
+    square = numpy.array([[0., 0.], [1., 1.], [1., 0.], [0., 1.]])
+    dist = numpy.hypot(*(square[:, None] - square).transpose(2, 0, 1))
+    
+    assert list(journeys.two_opt(dist, [0, 1, 2, 3])) == [0, 2, 1, 3]
+
+
+@pytest.mark.parametrize('method', journeys.ROUTE_METHODS)
+def test_route_journeys(method):
+    '''Test that the routes visit the same elements, starting with the first
+    one of each journey'''
+    
+    rng = numpy.random.RandomState(0)
+    xy = rng.uniform(size=(9, 2))
+    dist = numpy.hypot(*(xy[:, None] - xy).transpose(2, 0, 1))
+    planned = [numpy.arange(0, 5), numpy.arange(5, 7), numpy.arange(7, 9)]
+    
+    routes = journeys.route_journeys(planned, dist, method)
+    
+    for journey, route in zip(planned, routes):
+        assert route[0] == journey[0]
+        assert sorted(route) == list(journey)
+        assert route_length(dist, route) <= route_length(dist, journey) or method == 'nearest'
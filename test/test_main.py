@@ -4,23 +4,177 @@
 .. moduleauthor:: Mathew Topper <mathew.topper@tecnalia.com>
 """
 
-from dtocean_installation import main
+import numpy
+import pytest
 
-def test_run():
+import main
+
+
+def test_run(feasible_datasets):
     '''Test the run method of main'''
     
-    (environment_data,
-    technology_data,
-    equipment_data,
-    vessel_data,
-    log_pre_sol,
-    log_req,
-    equipSol,
-    vesselSol,
-    portSol,
-    log_sol,
-    log_sched,
-    log_cost) = main.run(0)
-    
-    print log_sol.keys()
-    assert log_cost <= 0.
+    install = main.run(0, feasible_datasets)
+    
+    assert install['plan'] == main.DEFAULT_PLAN
+    assert install['combi_select'][0]
+    assert len(install['cost'][0]) == len(install['combi_select'][0])
+    assert sorted(install['schedule'][0]) == sorted(install['combi_select'][0])
+    # the equipments without price data make the cost of their solutions
+    # missing, never free
+    costs = [sum(sol_cost.values()) for sol_cost in install['cost'][0].values()]
+    assert numpy.isfinite(costs).any()
+    for sol_cost in install['cost'][0].values():
+        assert numpy.isfinite(sol_cost['vessel cost'])
+        assert sol_cost['equipment cost'] > 0 or numpy.isnan(sol_cost['equipment cost'])
+
+
+def test_run_reference(reference_datasets):
+    '''Test that no vessel of the reference databases can install the
+    devices of the reference project (see the feasible_datasets fixture)'''
+    
+    install = main.run(0, reference_datasets)
+    
+    assert not install['combi_select'][0]
+
+
+def test_run_install_plan(feasible_datasets):
+    '''Test that a given installation plan is assessed instead of the plan
+    of the project case'''
+    
+    install = main.run(0, feasible_datasets, install_plan={0: ['Devices']})
+    
+    assert install['plan'] == {0: ['Devices']}
+    assert install['combi_select'][0]
+
+
+def test_run_datasets_reuse(feasible_datasets):
+    '''Test that preloaded data sets are not modified by run'''
+    
+    datasets = feasible_datasets
+    nb_vessels = dict((key, len(ves.panda))
+                      for key, ves in datasets['vessels'].items())
+    
+    first = main.run(0, datasets)
+    second = main.run(0, datasets)
+    
+    for key, ves in datasets['vessels'].items():
+        assert len(ves.panda) == nb_vessels[key]
+    assert len(second['combi_select'][0]) == len(first['combi_select'][0])
+
+
+def test_run_top_k(feasible_datasets):
+    '''Test that the ranking mode keeps the top_k best solutions only'''
+    
+    install = main.run(0, feasible_datasets, top_k=3)
+    
+    assert install['combi_select'][0]
+    for seq in install['combi_select']:
+        assert len(install['combi_select'][seq]) <= 3
+        assert len(install['cost'][seq]) == len(install['combi_select'][seq])
+        assert sorted(install['schedule'][seq]) == sorted(install['combi_select'][seq])
+
+
+def test_run_route(feasible_datasets):
+    '''Test that the journeys visit the same elements whatever the route'''
+    
+    journeys = {}
+    
+    for route in ['installation', 'nearest', '2-opt']:
+        install = main.run(0, feasible_datasets, route=route)
+        journeys[route] = [sorted(el for journey in sol['schedule']['detail']['journey elements']
+                                  for el in journey)
+                           for sol in install['combi_select'][0].values()]
+    
+    assert journeys['installation']
+    assert journeys['nearest'] == journeys['installation']
+    assert journeys['2-opt'] == journeys['installation']
+
+
+def test_run_journeys(feasible_datasets):
+    '''Test that the devices are installed whatever the journey planning'''
+    
+    installed = {}
+    
+    for method in ['greedy', 'ffd']:
+        install = main.run(0, feasible_datasets, journeys=method)
+        installed[method] = [sorted(el for journey in sol['schedule']['detail']['journey elements']
+                                    for el in journey)
+                             for sol in install['combi_select'][0].values()]
+    
+    assert installed['greedy']
+    assert installed['ffd'] == installed['greedy']
+    
+    with pytest.raises(ValueError):
+        main.run(0, feasible_datasets, journeys='random')
+
+
+def test_run_simulation(feasible_datasets):
+    '''Test that the layers of the installation plan are simulated in order'''
+    
+    install = main.run(0, feasible_datasets)
+    layers = install['simulation']['layers']
+    
+    assert sorted(layers) == sorted(install['plan'])
+    assert numpy.isfinite(layers[0]['end'])
+    assert layers[0]['end'] > layers[0]['start']
+    
+    for x in sorted(layers)[1:]:
+        assert layers[x]['start'] == layers[x-1]['end']
+
+
+def test_run_schedule(feasible_datasets):
+    '''Test that the schedule of the devices accounts for all operations'''
+    
+    install = main.run(0, feasible_datasets)
+    
+    for sol in install['combi_select'][0].values():
+        sched_sol = sol['schedule']
+        operations = sched_sol['detail']['operations']
+        prep = [op[3] for op in operations if op[1] == 'prep']
+        sea = [op[3] for op in operations if op[1] == 'sea']
+        
+        assert sched_sol['preparation'] == numpy.nansum(prep) > 0
+        assert sched_sol['sea time'] == pytest.approx(numpy.nansum(sea))
+        assert sched_sol['sea time'] > 0
+        # most restrictive limit of each parameter
+        olcs = numpy.array([op[4] for op in operations if op[4] is not None])
+        numpy.testing.assert_equal(sched_sol['olc'],
+                                   numpy.where(numpy.isnan(olcs).all(axis=0), numpy.nan,
+                                               numpy.nanmin(olcs, axis=0)))
+
+
+def test_run_unfit(feasible_datasets, monkeypatch):
+    '''Test that the solutions whose elements cannot fit on the deck of the
+    transporting vessel are removed'''
+    
+    from Logistics.performance.schedule import schedule_phase
+    
+    plan_journeys = schedule_phase.plan_journeys
+    calls = []
+    
+    # the elements of every other solution do not fit on deck
+    def every_other(elem_area, elem_mass, deck_area, deck_cargo, method):
+        calls.append(len(calls) % 2 == 0)
+        if not calls[-1]:
+            return [], numpy.arange(len(elem_area))
+        return plan_journeys(elem_area, elem_mass, deck_area, deck_cargo, method)
+    
+    install = main.run(0, feasible_datasets)
+    monkeypatch.setattr(schedule_phase, 'plan_journeys', every_other)
+    with pytest.warns(UserWarning, match="cannot fit on deck"):
+        unfit = main.run(0, feasible_datasets)
+    
+    assert len(unfit['combi_select'][0]) == sum(calls)
+    assert len(unfit['combi_select'][0]) < len(install['combi_select'][0])
+    assert sorted(unfit['combi_select'][0]) == range(sum(calls))
+    assert sorted(unfit['cost'][0]) == range(sum(calls))
+    assert sorted(unfit['schedule'][0]) == range(sum(calls))
+    for sol in unfit['combi_select'][0].values():
+        assert sol['schedule']['feasible']
+    
+    del calls[:]
+    ranked = main.run(0, feasible_datasets, top_k=3)
+    
+    assert ranked['combi_select'][0]
+    for sol in ranked['combi_select'][0].values():
+        assert sol['schedule']['feasible']
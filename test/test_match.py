@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""py.test tests on the matching of the vessels and equipments
+"""
+
+import itertools
+import numpy
+import pandas as pd
+import pytest
+
+from Logistics.selection import match
+
+
+RULES = [['Weight [t]', 'plus', 'AE weight [t]', 'sup', 'Max. cargo [t]'],
+         ['Weight [t]', 'mul', 'Units [-]', 'sup', 'Max. cargo [t]'],
+         ['Weight [t]', 'div', 'Footprint [m^2]', 'sup', 'Deck loading [t/m^2]'],
+         ['Weight [t]', 'plus', 'AE weight [t]', 'mul', 'Units [-]',
+          'sup', 'Max. cargo [t]'],
+         ['Class', 'equal', 'Class'],
+         ['Weight [t]']]
+
+
+@pytest.fixture
+def vessels():
+    '''Vessels with missing capacities'''
+    
+    return pd.DataFrame({'Max. cargo [t]': [10., 25., numpy.nan, 40.],
+                         'Deck loading [t/m^2]': [1., numpy.nan, 5., 10.],
+                         'Class': ['A', 'B', 'A', 'C']},
+                        index=[3, 7, 8, 12])
+
+
+@pytest.fixture
+def equipments():
+    '''Equipments with missing weights and a zero footprint'''
+    
+    return pd.DataFrame({'Weight [t]': [5., 12., numpy.nan, 20., 8.],
+                         'AE weight [t]': [2., numpy.nan, 1., 15., 0.],
+                         'Units [-]': [1., 2., 1., 2., 3.],
+                         'Footprint [m^2]': [5., 4., 2., 0., 1.],
+                         'Class': ['A', 'B', 'C', 'A', 'D']},
+                        index=[0, 2, 5, 6, 9])
+
+
+def scalar_rule(rule, source, target):
+    '''Evaluate a matching requirement for a source and a target Series the
+    way the original row by row matching did'''
+    
+    aux_op = source[rule[0]]
+    for ind_rd in range(1, len(rule)-1, 2):
+        if rule[ind_rd] == 'plus':
+            aux_op = aux_op + source[rule[ind_rd+1]]
+        elif rule[ind_rd] == 'mul':
+            aux_op = aux_op * source[rule[ind_rd+1]]
+        elif rule[ind_rd] == 'div':
+            aux_op = aux_op / source[rule[ind_rd+1]]
+        elif rule[ind_rd] == 'sup':
+            return bool(target[rule[ind_rd+1]] >= aux_op)
+        elif rule[ind_rd] == 'equal':
+            return bool(target[rule[ind_rd+1]] == aux_op)
+    return True
+
+
+def scalar_matrix(rules, source, target):
+    '''Boolean matrix of the matching requirements, one row per target and
+    one column per source, evaluated pair by pair'''
+    
+    matrix = numpy.ones((len(target.index), len(source.index)), dtype=bool)
+    with numpy.errstate(invalid='ignore', divide='ignore'):
+        for ind_t in range(len(target.index)):
+            for ind_s in range(len(source.index)):
+                matrix[ind_t, ind_s] = all(
+                    scalar_rule(rule, source.iloc[ind_s], target.iloc[ind_t])
+                    for rule in rules)
+    return matrix
+
+
+@pytest.mark.parametrize("rule", RULES)
+def test_compile_rule(rule, vessels, equipments):
+    '''Test each operator of a compiled requirement against the scalar
+    comparison, the missing values never matching'''
+    
+    with numpy.errstate(invalid='ignore', divide='ignore'):
+        matrix = match.compile_rule(rule)(equipments, vessels)
+    
+    assert matrix.dtype == bool
+    assert matrix.shape == (4, 5)
+    numpy.testing.assert_array_equal(matrix,
+                                     scalar_matrix([rule], equipments, vessels))
+
+
+def test_compile_rule_nan(vessels, equipments):
+    '''Test that the missing capacities and weights reject the pairs'''
+    
+    matrix = match.match_matrix([match.compile_rule(RULES[0])],
+                                equipments, vessels)
+    
+    assert not matrix[2].any()
+    assert not matrix[:, 1].any()
+    assert not matrix[:, 2].any()
+    numpy.testing.assert_array_equal(matrix[0], [True, False, False, False,
+                                                 True])
+
+
+def test_compile_rule_unknown():
+    '''Test that an unknown matching method is rejected'''
+    
+    with pytest.raises(ValueError):
+        match.compile_rule(['Weight [t]', 'minus', 'AE weight [t]'])
+
+
+def test_match_matrix(vessels, equipments):
+    '''Test that the compiled requirements of a type all apply'''
+    
+    rules = match.compile_rules({'rov': RULES, 'winch': []})
+    
+    assert sorted(rules) == ['rov', 'winch']
+    assert len(rules['rov']) == len(RULES)
+    
+    matrix = match.match_matrix(rules['rov'], equipments, vessels)
+    
+    numpy.testing.assert_array_equal(matrix,
+                                     scalar_matrix(RULES, equipments, vessels))
+    assert match.match_matrix(rules['winch'], equipments, vessels).all()
+
+
+class Type(object):
+    '''Vessel or equipment type with its feasible rows'''
+    
+    def __init__(self, id, panda):
+        self.id = id
+        self.panda = panda
+
+
+def exhaustive_solutions(combination, req_pv, req_ev, port):
+    '''All the vessel and equipment solutions of a combination passing the
+    scalar matching requirements, as label tuples'''
+    
+    ves_opts = [[(ves_class.id, quant, label)
+                 for label in ves_class.panda.index]
+                for quant, ves_class in combination['vessel']]
+    eq_opts = [[(eq_class.id, quant, label, ves_idx)
+                for label in eq_class.panda.index]
+               for quant, eq_class, ves_idx in combination['equipment']]
+    panda = dict((item[1].id, item[1].panda)
+                 for item in combination['vessel'] + combination['equipment'])
+    
+    solutions = set()
+    with numpy.errstate(invalid='ignore', divide='ignore'):
+        for vels in itertools.product(*ves_opts):
+            if not all(scalar_rule(rule, panda[ves[0]].loc[ves[2]], port)
+                       for ves in vels for rule in req_pv.get(ves[0], [])):
+                continue
+            for equips in itertools.product(*eq_opts):
+                if all(scalar_rule(rule, panda[eq[0]].loc[eq[2]],
+                                   panda[vels[eq[3]][0]].loc[vels[eq[3]][2]])
+                       for eq in equips for rule in req_ev.get(eq[0], [])):
+                    solutions.add((vels, equips))
+    return solutions
+
+
+def test_candidate_solutions(vessels, equipments):
+    '''Test that the lazily generated solutions are the ones of the
+    exhaustive enumeration of the combination'''
+    
+    barges = Type('Crane Barge', vessels)
+    tugs = Type('Tugboat', pd.DataFrame({'Max. cargo [t]': [30., 5., 12.],
+                                         'Deck loading [t/m^2]': [2., 2., 2.],
+                                         'Class': ['A', 'D', 'B']},
+                                        index=[1, 4, 6]))
+    rovs = Type('rov', equipments)
+    winches = Type('winch', equipments.iloc[1:4])
+    combination = {'vessel': [[1, barges], [2, tugs]],
+                   'equipment': [[1, rovs, 0], [2, winches, 1], [1, rovs, 1]]}
+    port = pd.Series({'Max. cargo [t]': 28., 'Class': 'A'})
+    req_pv = {'Crane Barge': [['Max. cargo [t]', 'sup', 'Max. cargo [t]']],
+              'Tugboat': [['Max. cargo [t]', 'mul', 'Deck loading [t/m^2]',
+                           'sup', 'Max. cargo [t]']]}
+    req_ev = {'rov': RULES[:2], 'winch': [RULES[4]]}
+    
+    cache = {}
+    solutions = list(match.candidate_solutions(
+        combination, match.compile_rules(req_pv), match.compile_rules(req_ev),
+        port.to_frame().T, cache))
+    
+    labels = dict((type_id, table[1].labels)
+                  for element in ['vessel', 'equipment']
+                  for type_id, table in cache[element].items())
+    found = [(tuple((ves[0], ves[1], labels[ves[0]][ves[2]]) for ves in vels),
+              tuple((eq[0], eq[1], labels[eq[0]][eq[2]], eq[3])
+                    for eq in equips))
+             for vels, equips in solutions]
+    expected = exhaustive_solutions(combination, req_pv, req_ev, port)
+    
+    assert len(found) == len(set(found))
+    assert set(found) == expected
+    assert 0 < len(expected) < 4 * 3 * 5 * 3 * 5
+    
+    nodes = list(match.candidate_nodes(
+        combination, match.compile_rules(req_pv), match.compile_rules(req_ev),
+        port.to_frame().T, {}))
+    
+    assert len(nodes) == len(cache['vessel']['Crane Barge'][1]) * \
+        len(cache['vessel']['Tugboat'][1])
+    assert sum(numpy.prod([len(eqs) for eqs in sols_eqs])
+               for vels, sols_eqs in nodes) == len(found)
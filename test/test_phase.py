@@ -1,14 +1,56 @@
 # -*- coding: utf-8 -*-
-"""py.test tests on main.py
+"""py.test tests on the logistic phase classes
 
 .. moduleauthor:: Mathew Topper <mathew.topper@tecnalia.com>
 """
 
-from dtocean-installation import main
-from dtocean-installation.wp5.logistics.phase import FeasibilityPhase
+import pytest
+
+from Logistics.phases import LogPhaseRegistry
+from Logistics.phases.install.classes import LogPhase
+
 
 def test_phase():
-    '''Test the run method of main'''
+    '''Test the initialisation of a logistic phase'''
+    
+    phase = LogPhase("id", "description")
+    assert phase.description == "description"
+    assert phase.op_ve == {}
+
+
+def test_phase_registry():
+    '''Test that a logistic phase is only built on first access, and once'''
+    
+    calls = []
+    
+    def builder(phase_id):
+        def build():
+            calls.append(phase_id)
+            return LogPhase(phase_id, "description")
+        return build
+    
+    registry = LogPhaseRegistry(dict((phase_id, builder(phase_id))
+                                     for phase_id in ['Devices', 'Moorings']))
+    
+    assert len(registry) == 2
+    assert 'Devices' in registry
+    assert 'Cables' not in registry
+    assert sorted(registry) == ['Devices', 'Moorings']
+    assert calls == []
+    assert registry.initialised() == []
+    
+    phase = registry['Devices']
+    
+    assert phase.id == 'Devices'
+    assert calls == ['Devices']
+    assert registry['Devices'] is phase
+    assert calls == ['Devices']
+    assert registry.initialised() == ['Devices']
+    
+    registry['Moorings']
+    registry['Moorings']
+    
+    assert calls == ['Devices', 'Moorings']
     
-    phase = FeasibilityPhase("id", "description", "ops_sequence", "v_sequence", "feasibility")
-    assert phase.feasibility == "feasibility"
+    with pytest.raises(KeyError):
+        registry['Cables']
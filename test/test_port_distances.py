@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""py.test tests on the port distance table
+"""
+
+import numpy
+import pandas as pd
+import pytest
+import utm
+
+from geopy.distance import great_circle_array
+from Logistics.installation import port_distances, sea_grid, select_port
+
+from test_sea_grid import lattice
+
+# ports (lat, lon): at a sea grid point, off the lattice, at the isolated
+# corner of the lattice, too far from the lattice and without coordinates
+PORTS = [(50.3, -5.6), (50.22, -6.05), (50., -6.), (52., -6.), None]
+
+
+def ports_table(ports):
+    '''Ports database with the UTM coordinates of the ports'''
+    
+    table = pd.DataFrame(index=['port {0}'.format(ind) for ind in range(len(ports))],
+                         columns=['UTM x [m]', 'UTM y [m]', 'UTM zone [-]'])
+    for label, coords in zip(table.index, ports):
+        if coords is None:
+            continue
+        x, y, number, letter = utm.from_latlon(*coords)
+        table.loc[label] = [x, y, '{0} {1}'.format(number, letter)]
+    table[['UTM x [m]', 'UTM y [m]']] = table[['UTM x [m]', 'UTM y [m]']].astype(float)
+    return table
+
+
+@pytest.fixture
+def folder(tmpdir, monkeypatch):
+    '''Sea grid folder of the lattice, its first point being isolated, used
+    as the default sea grid folder'''
+    
+    lat, lon, graph = lattice()
+    graph.remove_edges_from(list(graph.edges(0)))
+    folder = str(tmpdir.join('sea_grid'))
+    sea_grid.save_sea_grid(sea_grid.graph_arrays(graph, lat, lon), folder)
+    monkeypatch.setenv(sea_grid.SEA_GRID_ENV, folder)
+    
+    return folder
+
+
+def test_build_port_distances(folder):
+    '''Test the port distance table against the shortest path searches of
+    the sea grid'''
+    
+    grid = sea_grid.load_sea_grid(folder)
+    ports = ports_table(PORTS)
+    
+    columns, legs, table = port_distances.build_port_distances(grid, ports)
+    
+    assert list(columns[3:]) == [-1, -1]
+    assert numpy.isnan(legs[3:]).all()
+    nodes = numpy.flatnonzero(grid.nodes)
+    lat, lon = port_distances.port_coordinates(ports)
+    for ind in range(3):
+        point = grid.snap(lat[ind], lon[ind])
+        assert legs[ind] == pytest.approx(great_circle_array(lat[ind], lon[ind],
+                                                             grid.lat[point],
+                                                             grid.lon[point]))
+        numpy.testing.assert_allclose(table[:, columns[ind]],
+                                      grid.distances_from(point)[nodes],
+                                      rtol=1e-6)
+    # the first port lies on a sea grid point, to the UTM conversions
+    assert legs[0] == pytest.approx(0., abs=1e-3)
+
+
+def test_site_distances(folder):
+    '''Test the distances between a site and the ports'''
+    
+    ports = ports_table(PORTS)
+    table = port_distances.load_port_distances(ports, folder)
+    grid = table.grid
+    lat, lon = 50.42, -5.52
+    
+    dist = table.site_distances(lat, lon)
+    
+    assert list(dist.index) == list(ports.index)
+    point = grid.snap(lat, lon)
+    site_leg = great_circle_array(lat, lon, grid.lat[point], grid.lon[point])
+    port_lat, port_lon = port_distances.port_coordinates(ports)
+    for ind in range(2):
+        port = grid.snap(port_lat[ind], port_lon[ind])
+        port_leg = great_circle_array(port_lat[ind], port_lon[ind],
+                                      grid.lat[port], grid.lon[port])
+        assert site_leg > 0 and (port_leg > 0 or ind == 0)
+        assert dist.iloc[ind] == pytest.approx(
+            site_leg + grid.distances_from(port)[point] + port_leg, rel=1e-6)
+    # the isolated port cannot be reached, the last ports are not placed
+    assert dist.iloc[2] == float('inf')
+    assert numpy.isnan(dist.iloc[3:]).all()
+    # a site too far from the sea grid is not placed
+    assert numpy.isnan(table.site_distances(53., -6.)).all()
+
+
+def test_load_port_distances(folder, monkeypatch):
+    '''Test that the table is loaded once per process, read back from the
+    sea grid folder and rebuilt when the ports change'''
+    
+    ports = ports_table(PORTS)
+    table = port_distances.load_port_distances(ports, folder)
+    
+    assert port_distances.load_port_distances(ports, folder) is table
+    
+    def no_build(grid, ports):
+        raise AssertionError('the port distance table is rebuilt')
+    
+    monkeypatch.setattr(port_distances, 'port_tables', {})
+    monkeypatch.setattr(port_distances, 'build_port_distances', no_build)
+    loaded = port_distances.load_port_distances(ports, folder)
+    
+    assert loaded is not table
+    assert isinstance(loaded.table, numpy.memmap)
+    numpy.testing.assert_array_equal(loaded.columns, table.columns)
+    numpy.testing.assert_array_equal(loaded.legs, table.legs)
+    numpy.testing.assert_array_equal(loaded.table, table.table)
+    
+    moved = ports_table([(50.4, -5.6)] + PORTS[1:])
+    
+    with pytest.raises(AssertionError):
+        port_distances.load_port_distances(moved, folder)
+
+
+def test_site_port_distances(folder):
+    '''Test that the sea distances are used where available, the straight
+    line distances otherwise'''
+    
+    ports = ports_table(PORTS)
+    x, y, number, letter = utm.from_latlon(50.42, -5.52)
+    site = [x, y, '{0} {1}'.format(number, letter)]
+    
+    dist = select_port.site_port_distances(site, ports)
+    
+    sea_dist = port_distances.load_port_distances(ports).site_distances(50.42, -5.52)
+    numpy.testing.assert_allclose(dist.iloc[:3], sea_dist.iloc[:3], atol=1e-3)
+    assert dist.iloc[3] == pytest.approx(great_circle_array(50.42, -5.52, 52., -6.),
+                                         rel=1e-3)
+    assert numpy.isnan(dist.iloc[4])
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""py.test tests on the ranking of the solutions
+"""
+
+import itertools
+
+import numpy
+import pandas as pd
+import pytest
+
+from Logistics.performance.economic.eco import day_rate_tables, solutions_cost
+from Logistics.performance.rank import RANK_CRITERIA, best_leaves, finite
+from Logistics.performance.rank import hourly_rates, rank_key
+from Logistics.selection.tables import RecordTable
+
+
+class Phase(object):
+    '''Logistic phase with the feasible vessels and equipments tables only'''
+    
+    def __init__(self, tables):
+        self.tables = tables
+
+
+def synthetic_branches(seed):
+    '''Branches of small synthetic cost tables: integer hourly rates, so that
+    many solutions tie, and missing (NaN) equipment rates and durations'''
+    
+    rng = numpy.random.RandomState(seed)
+    branches = []
+    for ind_branch in range(5):
+        ves_rate = float(rng.randint(1, 4))
+        duration = float(rng.choice([1, 2, 2, numpy.nan]))
+        nb_types = rng.randint(0, 3)
+        sols_eqs = [['eq {0}'.format(ind) for ind in range(rng.randint(1, 4))]
+                    for eq_type in range(nb_types)]
+        rates = [[float(rng.choice([1, 2, 2, numpy.nan])) for eq in eqs]
+                 for eqs in sols_eqs]
+        branches.append((ves_rate, duration, sols_eqs, rates, ind_branch))
+    return branches
+
+
+def leaf_total(branches, ind_branch, equips):
+    '''Total cost of a leaf, NaN if one of its rates is missing'''
+    
+    ves_rate, duration, sols_eqs, rates = branches[ind_branch][:4]
+    leaf_rate = sum(type_rates[eqs.index(eq)]
+                    for eqs, type_rates, eq in zip(sols_eqs, rates, equips))
+    return (ves_rate + leaf_rate) * duration
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("criterion", ['cost', 'time'])
+def test_best_leaves(seed, criterion):
+    '''Test the top_k leaves against brute-force sorting'''
+    
+    branches = synthetic_branches(seed)
+    
+    # the search receives the finite hourly rates of hourly_rates
+    search_branches = [(ves_rate, finite(duration), sols_eqs,
+                        [[finite(rate) for rate in type_rates]
+                         for type_rates in rates], ind_branch)
+                       for ves_rate, duration, sols_eqs, rates, ind_branch
+                       in branches]
+    
+    def leaf_cost(ind_branch, equips):
+        return (leaf_total(branches, ind_branch, equips),
+                (ind_branch, tuple(equips)))
+    
+    # all leaves of all branches
+    keys = []
+    for ves_rate, duration, sols_eqs, rates, ind_branch in branches:
+        for equips in itertools.product(*sols_eqs):
+            total = leaf_total(branches, ind_branch, equips)
+            keys.append(rank_key(finite(total), finite(duration), criterion))
+    keys.sort()
+    
+    for top_k in range(1, len(keys) + 2):
+        best = best_leaves(search_branches, top_k, criterion, leaf_cost)
+        
+        assert [key for key, leaf in best] == keys[:top_k]
+        # the keys are the ones of the returned leaves
+        for key, (ind_branch, equips) in best:
+            duration = finite(branches[ind_branch][1])
+            total = leaf_total(branches, ind_branch, equips)
+            assert key == rank_key(finite(total), duration, criterion)
+        # no leaf is returned twice
+        assert len(set(leaf for key, leaf in best)) == len(best)
+
+
+def test_best_leaves_unpriced():
+    '''Test that an equipment without price data is ranked after a priced
+    one, even an expensive one'''
+    
+    vessels = pd.DataFrame({'Op max Day Rate': [48000.],
+                            'Op min Day Rate': [48000.]})
+    rovs = pd.DataFrame({'ROV day rate [EURO/day]': [numpy.nan, 9600.],
+                         'AE supervisor [-]': [1., 1.],
+                         'Supervisor rate [EURO/12h]': [numpy.nan, 1200.],
+                         'AE technician [-]': [1., 1.],
+                         'Technician rate [EURO/12h]': [numpy.nan, 1200.]})
+    phase = Phase({'vessel': {'Barge': RecordTable('Barge', vessels)},
+                   'equipment': {'rov': RecordTable('rov', rovs)}})
+    rates = day_rate_tables(phase)
+    vels = [['Barge', 1, 0]]
+    sols_eqs = [[['rov', 1, 0, 0], ['rov', 1, 1, 0]]]
+    duration = 10.
+    
+    ves_rate, eq_rates = hourly_rates(rates, vels, sols_eqs)
+    
+    assert eq_rates == [[float('inf'), 600.]]
+    
+    def leaf_cost(branch, equips):
+        sols = {0: {'VEs': [vels[0] + equips]}}
+        sol_cost = solutions_cost(sols, rates, [duration])[0]
+        return sum(sol_cost.values()), equips[0][2]
+    
+    for criterion in RANK_CRITERIA:
+        best = best_leaves([(ves_rate, duration, sols_eqs, eq_rates, None)],
+                           2, criterion, leaf_cost)
+        
+        assert [row for key, row in best] == [1, 0]
+        assert best[0][0] == rank_key((2000. + 600.) * duration, duration,
+                                      criterion)
+        assert best[1][0] == rank_key(float('inf'), duration, criterion)
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""py.test tests on the scheduling kernel of the logistic phases
+"""
+
+import numpy
+import pandas as pd
+import pytest
+
+from Logistics.phases import op_durations
+from Logistics.performance.schedule import schedule_phase
+from Logistics.selection.tables import RecordTable
+
+
+class Op(object):
+    '''Logistic operation whose duration is given by a resolver of
+    op_durations'''
+    
+    def __init__(self, description, resolver, time_value=None, olc=("",)):
+        self.description = description
+        self.time_value = time_value
+        self.olc = olc
+        self.duration = lambda context, jour, elements: resolver(self, context, jour, elements)
+
+
+class Sequence(object):
+    '''Operation sequence of a logistic phase with a single solution'''
+    
+    def __init__(self, op_seq_prep, op_seq_sea, op_seq_demob):
+        self.description = 'On-deck transportation'
+        self.sol = {0: {'VEs': [['Barge', 1, 0]]}}
+        self.op_seq_prep = op_seq_prep
+        self.op_seq_sea = op_seq_sea
+        self.op_seq_demob = op_seq_demob
+
+
+class Phase(object):
+    '''Logistic phase with a single operation sequence'''
+    
+    def __init__(self, sequence):
+        self.op_ve = {0: sequence}
+        barge = pd.DataFrame({'Vessel type [-]': ['Barge'],
+                              'Deck space [m^2]': [70.],
+                              'Max. cargo [t]': [100.],
+                              'Mob time [h]': [24.],
+                              'Transit speed [m/s]': [5.],
+                              'OLC: Transit maxHs [m]': [2.],
+                              'OLC: Transit maxTp [s]': [10.],
+                              'OLC: Transit maxWs [m/s]': [15.],
+                              'OLC: Transit maxCs [knots]': [2.]})
+        self.tables = {'vessel': {'Barge': RecordTable('Barge', barge)}}
+
+
+def positioning(log_op, context, jour, elements):
+    '''1 hour per journey, at most 1.5 m of Hs and 20 m/s of wind'''
+    
+    return 1., [[1.5, numpy.nan, 20., numpy.nan]]
+
+
+@pytest.fixture
+def phase():
+    '''Synthetic phase: mobilisation before the first journey, 2 hours of
+    preparation per journey, positioning once per journey and 3 hours of
+    lifting per element, demobilisation'''
+    
+    sea = [Op('Position', positioning),
+           Op('Lift', op_durations.per_element, 3., ('vessel',))]
+    sequence = Sequence([Op('Mob', op_durations.first_mobilisation),
+                         Op('Prep', op_durations.per_journey, 2.)],
+                        dict((el, sea) for el in ['a', 'b', 'c']),
+                        [Op('Demob', op_durations.mobilisation)])
+    return Phase(sequence)
+
+
+@pytest.fixture
+def user_inputs():
+    '''Device and site data used by the duration resolvers'''
+    
+    device = pd.DataFrame({'assembly duration [h]': [0.],
+                           'connect duration [h]': [0.],
+                           'disconnect duration [h]': [0.],
+                           'max Hs [m]': [numpy.nan],
+                           'max Tp [s]': [numpy.nan],
+                           'max wind speed [m/s]': [numpy.nan],
+                           'max current speed [m/s]': [numpy.nan]})
+    return {'device': device, 'site': pd.DataFrame()}
+
+
+def elements(mass=(10., 10., 10., 10.)):
+    '''Three elements 5 km apart in local site coordinates, the last one
+    ('d') not installed by the phase'''
+    
+    return schedule_phase.element_table(['a', 'b', 'c', 'd'], [30.] * 4, mass,
+                                        [0., 3000., 6000., 0.],
+                                        [0., 4000., 8000., 0.],
+                                        [numpy.nan] * 4)
+
+
+INSTALL = {'port': {'Distance port-site [km]': 36.}, 'route': 'installation'}
+
+
+def test_sched_phase(phase, user_inputs):
+    '''Test the durations and OLC of a synthetic phase'''
+    
+    sched_sol = schedule_phase.sched_phase(0, 0, INSTALL, phase, user_inputs,
+                                           elements(), {})
+    detail = sched_sol['detail']
+    # 2 elements per journey on the deck of the barge, at 18 km/h
+    transit = numpy.array([(72. + 5.) / 18, 72. / 18])
+    
+    assert sched_sol['feasible']
+    assert [list(els) for els in detail['journey elements']] == [['a', 'b'], ['c']]
+    numpy.testing.assert_allclose(detail['transit'], transit)
+    assert sched_sol['preparation'] == 24. + 2 * 2.
+    assert sched_sol['sea time'] == pytest.approx(2 * 1. + 3 * 3. + transit.sum())
+    assert sched_sol['log_op_dur_all'] == pytest.approx(28. + sched_sol['sea time'] + 24.)
+    numpy.testing.assert_allclose(sched_sol['olc'], [1.5, 10., 15., 2 * op_durations.KNOT])
+    assert [op[:3] for op in detail['operations']] == [
+        (0, 'prep', 'Mob'), (0, 'prep', 'Prep'), (0, 'sea', 'Transit'),
+        (0, 'sea', 'Position'), (0, 'sea', 'Lift'),
+        (1, 'prep', 'Prep'), (1, 'sea', 'Transit'),
+        (1, 'sea', 'Position'), (1, 'sea', 'Lift'),
+        (1, 'demob', 'Demob')]
+
+
+def test_sched_phase_unfit(phase, user_inputs):
+    '''Test that a solution is not feasible if an element does not fit on
+    deck'''
+    
+    sched_sol = schedule_phase.sched_phase(0, 0, INSTALL, phase, user_inputs,
+                                           elements([10., 200., 10., 200.]), {})
+    
+    assert not sched_sol['feasible']
+    assert list(sched_sol['detail']['unfit elements']) == ['b']
+    assert [list(els) for els in sched_sol['detail']['journey elements']] == [['a', 'c']]
+
+
+def test_sched_phase_empty(phase, user_inputs):
+    '''Test that no vessel is mobilised without any element to install'''
+    
+    phase.op_ve[0].op_seq_sea = {}
+    sched_sol = schedule_phase.sched_phase(0, 0, INSTALL, phase, user_inputs,
+                                           elements(), {})
+    
+    assert sched_sol['feasible']
+    assert sched_sol['preparation'] == 0
+    assert sched_sol['sea time'] == 0
+    assert sched_sol['log_op_dur_all'] == 0
+
+
+def test_mooring_elements(reference_datasets):
+    '''Test that the anchors are transported with their mooring lines'''
+    
+    MF_outputs = reference_datasets['MF_outputs']
+    found_db = MF_outputs['foundation']
+    line_db = MF_outputs['line']
+    
+    moorings = schedule_phase.mooring_elements(MF_outputs)
+    
+    assert list(moorings.index) == list(found_db.index)
+    for ind in found_db.index:
+        line = line_db[(line_db['devices [-]'] == found_db['devices [-]'][ind]) &
+                       (line_db['lines [-]'] == found_db['foundations [-]'][ind].replace('foundation', 'line'))]
+        assert moorings['mass [t]'][ind] == pytest.approx(
+            (found_db['dry mass [kg]'][ind] + line['dry mass [kg]'].sum()) / 1000)
+    numpy.testing.assert_allclose(moorings['area [m^2]'],
+                                  found_db['length [m]'] * found_db['width [m]'])
+
+
+@pytest.mark.parametrize('method, expected', [('greedy', [['a'], ['b', 'c']]),
+                                              ('ffd', [['a', 'c'], ['b']])])
+def test_sched_phase_journeys(phase, user_inputs, method, expected):
+    '''Test that the journeys are planned with the method of the assessment'''
+    
+    install = dict(INSTALL, journeys=method)
+    table = schedule_phase.element_table(['a', 'b', 'c'], [40., 40., 30.],
+                                         [1.] * 3, [0.] * 3, [0.] * 3,
+                                         [numpy.nan] * 3)
+    
+    sched_sol = schedule_phase.sched_phase(0, 0, install, phase, user_inputs,
+                                           table, {})
+    
+    assert [list(els) for els in sched_sol['detail']['journey elements']] == expected
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""py.test tests on the sea grid
+"""
+
+import os
+import pickle
+
+import networkx
+import numpy
+import pytest
+
+from Logistics.installation import sea_grid
+
+
+def lattice(nb_lat=6, nb_lon=7):
+    '''Water points of a regular lattice off Cornwall and the networkx graph
+    of their 8-neighbourhood, a few land points being left out of the graph'''
+    
+    lat, lon = numpy.meshgrid(50. + 0.1 * numpy.arange(nb_lat),
+                              -6. + 0.1 * numpy.arange(nb_lon), indexing='ij')
+    land = set([2 * nb_lon + 2, 2 * nb_lon + 3, 3 * nb_lon + 3, nb_lat * nb_lon - 1])
+    graph = networkx.Graph()
+    for i in range(nb_lat):
+        for j in range(nb_lon):
+            node = i * nb_lon + j
+            if node in land:
+                continue
+            graph.add_node(node)
+            for di, dj in [(0, 1), (1, -1), (1, 0), (1, 1)]:
+                succ = (i + di) * nb_lon + j + dj
+                if 0 <= i + di < nb_lat and 0 <= j + dj < nb_lon and succ not in land:
+                    graph.add_edge(node, succ)
+    
+    return lat.ravel(), lon.ravel(), graph
+
+
+def write_water_points(path, lat, lon):
+    '''Writes the water points in the format of Point_DTOcean_0.csv, for up
+    to 1000 points'''
+    
+    with open(path, 'wb') as f:
+        for ind in range(len(lat)):
+            f.write('{0}\t0\t{1:.0f}\t{2:.0f}\n'.format(ind, lat[ind] * 1e15,
+                                                        lon[ind] * 1e15))
+
+
+@pytest.fixture
+def grid(tmpdir):
+    '''Sea grid of the lattice, saved and memory-mapped'''
+    
+    lat, lon, graph = lattice()
+    folder = str(tmpdir.join('sea_grid'))
+    sea_grid.save_sea_grid(sea_grid.graph_arrays(graph, lat, lon), folder)
+    
+    return sea_grid.load_sea_grid(folder)
+
+
+def test_sea_grid_dir():
+    '''Test that the sea grid is looked for in the databases folder'''
+    
+    if sea_grid.SEA_GRID_ENV in os.environ:
+        pytest.skip('sea grid folder relocated')
+    
+    databases = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             '..', 'src', 'databases')
+    
+    assert (os.path.realpath(sea_grid.sea_grid_dir()) ==
+            os.path.realpath(os.path.join(databases, 'sea_grid')))
+    assert (os.path.realpath(os.path.dirname(sea_grid.WATER_POINTS)) ==
+            os.path.realpath(databases))
+
+
+def test_build_sea_grid(tmpdir):
+    '''Test that the CSR arrays built from the water points and the pickled
+    graph are loaded back, memory-mapped'''
+    
+    lat, lon, graph = lattice()
+    csv_path = str(tmpdir.join('points.csv'))
+    graph_path = str(tmpdir.join('graph.p'))
+    write_water_points(csv_path, lat, lon)
+    with open(graph_path, 'wb') as f:
+        pickle.dump(graph, f)
+    
+    grid = sea_grid.load_sea_grid(str(tmpdir.join('sea_grid')), csv_path,
+                                  graph_path)
+    
+    assert grid is sea_grid.load_sea_grid(str(tmpdir.join('sea_grid')))
+    assert isinstance(grid.indices, numpy.memmap)
+    assert len(grid) == len(lat)
+    numpy.testing.assert_allclose(grid.lat, lat)
+    numpy.testing.assert_allclose(grid.lon, lon)
+    assert list(numpy.flatnonzero(grid.nodes)) == sorted(graph)
+    for node in range(len(lat)):
+        indices, weights = grid.neighbours(node)
+        assert list(indices) == sorted(graph[node]) if node in graph else not len(indices)
+        assert (weights > 0).all()
+
+
+def test_shortest_path(grid):
+    '''Test the A* routes against the Dijkstra searches of the sea grid and of
+    networkx'''
+    
+    graph = networkx.Graph()
+    for node in numpy.flatnonzero(grid.nodes):
+        graph.add_node(node)
+        for succ, weight in zip(*grid.neighbours(node)):
+            graph.add_edge(node, succ, weight=weight)
+    
+    for start in [0, 9, 20]:
+        dist = grid.distances_from(start)
+        lengths = networkx.single_source_dijkstra_path_length(graph, start)
+        for end in graph:
+            route, length = grid.shortest_path(start, end)
+            
+            assert length == pytest.approx(dist[end])
+            assert length == pytest.approx(lengths[end])
+            assert route[0] == start and route[-1] == end
+            steps = [dict(zip(*grid.neighbours(point)))[succ]
+                     for point, succ in zip(route[:-1], route[1:])]
+            assert sum(steps) == pytest.approx(length)
+
+
+def test_shortest_path_land(grid):
+    '''Test that there is no route to a land point'''
+    
+    route, length = grid.shortest_path(0, 16)
+    
+    assert route is None
+    assert length == float('inf')
+    assert grid.distances_from(0)[16] == float('inf')
+
+
+@pytest.mark.parametrize('radius', [0, 1, 2, 5, sea_grid.RING_CACHE + 1])
+def test_node_index_ring(grid, radius):
+    '''Test that the rings are the shells of cells at a Chebyshev distance'''
+    
+    index = sea_grid.NodeIndex(grid)
+    offsets = index.ring(radius)
+    
+    assert len(offsets) == (2 * radius + 1) ** 3 - max(2 * radius - 1, 0) ** 3
+    assert (abs(offsets).max(1) == radius).all()
+    assert len(set(map(tuple, offsets))) == len(offsets)
+    assert (radius in index.rings) == (0 < radius <= sea_grid.RING_CACHE)
+
+
+def test_node_index_nearest(grid):
+    '''Test the nearest points of the sea graph against a brute force search'''
+    
+    points = numpy.flatnonzero(grid.nodes)
+    lat = numpy.array([50.02, 50.23, 50.21, 50.33, 50.5, 49.9, 50.26])
+    lon = numpy.array([-5.97, -5.78, -5.69, -5.72, -5.4, -6.05, -5.7])
+    
+    nearest = grid.snap_points(lat, lon)
+    
+    for ind in range(len(lat)):
+        dist = sea_grid.great_circle_array(numpy.repeat(lat[ind], len(points)),
+                                           numpy.repeat(lon[ind], len(points)),
+                                           grid.lat[points], grid.lon[points])
+        assert nearest[ind] == points[dist.argmin()]
+        assert grid.snap(lat[ind], lon[ind]) == nearest[ind]
+
+
+def test_node_index_max_distance(grid):
+    '''Test that the search is limited to SNAP_DISTANCE by default'''
+    
+    # about 300 km off the lattice
+    assert grid.snap(53., -6.) is None
+    assert grid.snap(53., -6., max_distance=400.) is not None
+    assert grid.snap(50.25, -4.95) is not None
+    assert grid.snap(50.25, -4.95, max_distance=1.) is None
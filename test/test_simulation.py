@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""py.test tests on the simulation of the installation plan
+"""
+
+import math
+
+import numpy
+import pandas as pd
+import pytest
+
+from Logistics.performance.schedule import simulation
+
+
+def met_ocean_series(hs):
+    '''Hourly met-ocean time series with the given significant wave heights'''
+    
+    nb_rec = len(hs)
+    return pd.DataFrame({'hour [-]': numpy.arange(nb_rec) % 24,
+                         'Hs [m]': numpy.asarray(hs, dtype=float),
+                         'Tp [s]': numpy.zeros(nb_rec),
+                         'Ws [m/s]': numpy.zeros(nb_rec),
+                         'Cs [m/s]': numpy.zeros(nb_rec)})
+
+
+# at most 2 m of Hs
+OLC = [2., numpy.nan, numpy.nan, numpy.nan]
+# calm weather but for hours 5 to 7
+MET_OCEAN = met_ocean_series([1] * 5 + [3] * 3 + [1] * 5)
+
+
+class Sequence(object):
+    '''Operation sequence with scheduled and costed solutions'''
+    
+    def __init__(self, schedules, costs):
+        self.sol = dict((ind_sol, {'schedule': schedule})
+                        for ind_sol, schedule in enumerate(schedules))
+        self.sol_cost = dict((ind_sol, {'vessel cost': cost})
+                             for ind_sol, cost in enumerate(costs))
+
+
+class Phase(object):
+    '''Logistic phase with a single operation sequence'''
+    
+    def __init__(self, schedules, costs=()):
+        self.op_ve = {0: Sequence(schedules, costs)}
+
+
+def schedule(operations):
+    '''Schedule of a solution with the given operations'''
+    
+    return {'detail': {'operations': operations}}
+
+
+def test_simulate_phase():
+    '''Test that an operation waits for a weather window long enough'''
+    
+    operations = [(0, 'prep', 'Prep', 4., None),
+                  (0, 'sea', 'Transit', 1., OLC),
+                  (0, 'sea', 'Lift', 2., OLC),
+                  (0, 'demob', 'Demob', float('nan'), None)]
+    
+    phase = simulation.simulate_phase(operations, MET_OCEAN, 0.)
+    
+    # the lift waits for the end of the storm
+    assert list(phase['operation start']) == [0., 4., 8., 10.]
+    assert list(phase['operation end']) == [4., 5., 10., 10.]
+    assert phase['waiting time'] == 3.
+    assert phase['start'] == 0.
+    assert phase['end'] == 10.
+
+
+def test_simulate_phase_no_window():
+    '''Test that the end of a phase is NaN if an operation does not fit in
+    any weather window'''
+    
+    operations = [(0, 'prep', 'Prep', 4., None),
+                  (0, 'sea', 'Lift', 6., OLC),
+                  (0, 'demob', 'Demob', 1., None)]
+    
+    phase = simulation.simulate_phase(operations, MET_OCEAN, 0.)
+    
+    assert math.isnan(phase['end'])
+    assert list(phase['operation end'][:1]) == [4.]
+    assert numpy.isnan(phase['operation start'][1:]).all()
+    assert math.isnan(simulation.simulate_phase(operations[:1], MET_OCEAN,
+                                                float('nan'))['end'])
+
+
+def test_selected_schedule():
+    '''Test that the cheapest solution of a phase is simulated'''
+    
+    first = schedule([(0, 'sea', 'Lift', 1., None)])
+    cheapest = schedule([(0, 'sea', 'Lift', 2., None)])
+    
+    assert simulation.selected_schedule(Phase([first, cheapest], [20., 10.])) is cheapest
+    assert simulation.selected_schedule(Phase([first, cheapest])) is first
+    assert simulation.selected_schedule(Phase([])) is None
+
+
+def test_simulate_layer():
+    '''Test that a layer ends with the last of its phases and that the next
+    layer starts then'''
+    
+    log_phases = {'A': Phase([schedule([(0, 'sea', 'Lift', 3., None)])]),
+                  'B': Phase([schedule([(0, 'sea', 'Lift', 1., OLC)])]),
+                  'C': Phase([schedule([(0, 'sea', 'Lift', 9., OLC)])]),
+                  'D': Phase([])}
+    
+    sim = simulation.simulate_plan({0: ['A', 'B'], 1: ['A']}, log_phases,
+                                   MET_OCEAN, 2.)
+    
+    assert sim['layers'][0] == {'start': 2., 'end': 5.}
+    assert sim['phases']['B']['end'] == 3.
+    assert sim['layers'][1] == {'start': 5., 'end': 8.}
+    
+    # a layer is not completed if one of its phases is not
+    for phase_ids in [['A', 'C'], ['A', 'D']]:
+        sim = simulation.simulate_plan({0: phase_ids, 1: ['A']}, log_phases,
+                                       MET_OCEAN, 2.)
+        
+        assert math.isnan(sim['layers'][0]['end'])
+        assert math.isnan(sim['layers'][1]['start'])
+        assert math.isnan(sim['phases']['A']['end'])
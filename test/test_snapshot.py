@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""py.test tests on the snapshots of the input data sets
+"""
+
+import os
+import json
+import hashlib
+
+import pandas as pd
+
+import main
+from Logistics.load import snapshot
+
+
+def test_snapshot_key(tmpdir):
+    '''Test that a snapshot is only valid for the key it was saved with'''
+    
+    root = str(tmpdir)
+    snapshot.save_snapshot('test', {'data': pd.DataFrame({'a': [1, 2]})},
+                           root, key='digest 1')
+    
+    assert snapshot.has_snapshot('test', root)
+    assert snapshot.has_snapshot('test', root, key='digest 1')
+    assert not snapshot.has_snapshot('test', root, key='digest 2')
+
+
+def test_snapshot_unreadable(tmpdir):
+    '''Test that a data set which cannot be unpickled is not in the snapshot'''
+    
+    root = str(tmpdir)
+    snapshot.save_snapshot('test', {'data': pd.DataFrame({'a': [1, 2]}),
+                                    'other': pd.DataFrame({'b': [3]})}, root)
+    
+    # data set pickled with a module unknown to this environment
+    folder = os.path.join(root, 'test')
+    payload = 'cunknown_module\nUnknownClass\n.'
+    with open(os.path.join(folder, 'data.pickle'), 'wb') as f:
+        f.write(payload)
+    with open(os.path.join(folder, snapshot.MANIFEST), 'r') as f:
+        manifest = json.load(f)
+    manifest['datasets']['data']['sha1'] = hashlib.sha1(payload).hexdigest()
+    with open(os.path.join(folder, snapshot.MANIFEST), 'w') as f:
+        json.dump(manifest, f)
+    
+    inputs_snapshot = snapshot.Snapshot('test', root)
+    
+    assert 'data' not in inputs_snapshot
+    assert inputs_snapshot.failed == set(['data'])
+    assert 'other' in inputs_snapshot
+    assert list(inputs_snapshot['other']['b']) == [3]
+
+
+def test_load_datasets_snapshot(tmpdir, monkeypatch):
+    '''Test that the data sets read from a snapshot match the databases'''
+    
+    monkeypatch.setenv(snapshot.SNAPSHOT_ENV, str(tmpdir))
+    
+    imported = main.load_datasets('test')
+    assert snapshot.has_snapshot('test', key=main.databases_key())
+    
+    restored = main.load_datasets('test')
+    
+    assert sorted(restored) == sorted(imported)
+    assert restored['ports'].equals(imported['ports'])
+    assert restored['vessels']['Crane Barge'].panda.equals(
+        imported['vessels']['Crane Barge'].panda)
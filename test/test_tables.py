@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""py.test tests on the record tables of the feasible vessels and equipments
+"""
+
+import numpy
+import pandas as pd
+
+from Logistics.selection import match
+from Logistics.selection.tables import (RecordTable, vessel_record,
+                                        equipment_record)
+
+from test_match import Type
+
+
+class Phase(object):
+    '''Logistic phase with the feasible vessels and equipments tables only'''
+    
+    def __init__(self, tables):
+        self.tables = tables
+
+
+def assert_same_record(record, series):
+    '''Test that a record holds the values of a panda Series'''
+    
+    for column in series.index:
+        numpy.testing.assert_equal(record[column], series[column])
+
+
+def test_record_table():
+    '''Test that the rows of a table are the rows of the panda dataframe'''
+    
+    panda = pd.DataFrame({'Name': ['Barge 1', 'Barge 2', 'Barge 3'],
+                          'Max. cargo [t]': [10., numpy.nan, 40.],
+                          'Crew [-]': [4, 6, 8]},
+                         index=[5, 2, 11])
+    table = RecordTable('Crane Barge', panda)
+    
+    assert len(table) == 3
+    numpy.testing.assert_array_equal(table.labels, [5, 2, 11])
+    numpy.testing.assert_array_equal(table.column('Crew [-]'), [4, 6, 8])
+    assert table.value(2, 'Name') == 'Barge 3'
+    assert numpy.isnan(table.value(1, 'Max. cargo [t]'))
+    
+    for row, label in enumerate(panda.index):
+        assert_same_record(table.record(row), panda.ix[label])
+
+
+def test_solution_records():
+    '''Test that the VEs entries of the solutions resolve to the vessels and
+    equipments the solutions used to copy'''
+    
+    barges = Type('Crane Barge',
+                  pd.DataFrame({'Name': ['Barge 1', 'Barge 2', 'Barge 3'],
+                                'Max. cargo [t]': [10., 50., 30.]},
+                               index=[4, 9, 13]))
+    rovs = Type('rov', pd.DataFrame({'Name': ['ROV 1', 'ROV 2', 'ROV 3'],
+                                     'Weight [t]': [5., 20., 35.]},
+                                    index=[0, 3, 7]))
+    combination = {'vessel': [[2, barges]], 'equipment': [[1, rovs, 0]]}
+    port = pd.DataFrame({'Max. cargo [t]': [40.]})
+    req_pv = {'Crane Barge': [['Max. cargo [t]', 'sup', 'Max. cargo [t]']]}
+    req_ev = {'rov': [['Weight [t]', 'sup', 'Max. cargo [t]']]}
+    
+    cache = {}
+    solutions = [match.shape_solution(vels, equips, None)
+                 for vels, equips in match.candidate_solutions(
+                     combination, match.compile_rules(req_pv),
+                     match.compile_rules(req_ev), port, cache)]
+    phase = Phase(match.match_tables(cache))
+    
+    names = []
+    for sol in solutions:
+        ves_sol = sol['VEs'][0]
+        ves_label = phase.tables['vessel']['Crane Barge'].labels[ves_sol[2]]
+        assert_same_record(vessel_record(phase, ves_sol),
+                           barges.panda.ix[ves_label])
+        for eq_sol in ves_sol[3:]:
+            eq_label = phase.tables['equipment']['rov'].labels[eq_sol[2]]
+            assert_same_record(equipment_record(phase, eq_sol),
+                               rovs.panda.ix[eq_label])
+            names.append((vessel_record(phase, ves_sol)['Name'],
+                          equipment_record(phase, eq_sol)['Name']))
+    
+    assert sorted(names) == [('Barge 1', 'ROV 1'), ('Barge 3', 'ROV 1'),
+                             ('Barge 3', 'ROV 2')]
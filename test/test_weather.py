@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""py.test tests on the weather window engine
+"""
+
+from collections import OrderedDict
+
+import numpy
+import pandas as pd
+import pytest
+
+from Logistics.performance.schedule import weather
+
+
+def met_ocean_series(hs):
+    '''Hourly met-ocean time series with the given significant wave heights'''
+    
+    nb_rec = len(hs)
+    return pd.DataFrame({'hour [-]': numpy.arange(nb_rec) % 24,
+                         'Hs [m]': numpy.asarray(hs, dtype=float),
+                         'Tp [s]': numpy.zeros(nb_rec),
+                         'Ws [m/s]': numpy.zeros(nb_rec),
+                         'Cs [m/s]': numpy.zeros(nb_rec)})
+
+
+def test_weather_windows():
+    '''Test the weather windows of an hourly series'''
+    
+    met_ocean = met_ocean_series([1, 1, 3, 1, 3, 3, 1, 1, 1])
+    ww = weather.weather_windows(met_ocean, {'maxHs': 2})
+    
+    assert list(ww['start']) == [0, 3, 6]
+    assert list(ww['duration']) == [2, 1, 3]
+
+
+def test_weather_windows_single_record():
+    '''Test that a single record series has one hour long windows'''
+    
+    met_ocean = met_ocean_series([1])
+    
+    assert weather.time_step(met_ocean) == 1
+    ww = weather.weather_windows(met_ocean, {'maxHs': 2})
+    assert list(ww['start']) == [0]
+    assert list(ww['duration']) == [1]
+    
+    ww = weather.weather_windows(met_ocean, {'maxHs': 0.5})
+    assert len(ww['start']) == 0
+
+
+@pytest.fixture
+def ww_cache(monkeypatch):
+    '''Empty weather windows cache of 3 entries'''
+    
+    monkeypatch.setattr(weather, 'ww_cache', OrderedDict())
+    monkeypatch.setattr(weather, 'WW_CACHE_SIZE', 3)
+    return weather.ww_cache
+
+
+def test_cached_weather_windows(ww_cache):
+    '''Test that the weather windows are computed once per met-ocean data set
+    and limits, and read-only'''
+    
+    met_ocean = met_ocean_series([1, 1, 3, 1, 3, 3, 1, 1, 1])
+    
+    ww = weather.cached_weather_windows(met_ocean, {'maxHs': 2})
+    
+    assert weather.cached_weather_windows(met_ocean, {'maxHs': 2.}) is ww
+    assert list(ww['start']) == [0, 3, 6]
+    for array in ww.values():
+        assert not array.flags.writeable
+        with pytest.raises(ValueError):
+            array[0] = 1
+    
+    # other limits, undefined limits being ignored
+    other = weather.cached_weather_windows(met_ocean, {'maxHs': 3})
+    
+    assert other is not ww
+    assert list(other['start']) == [0]
+    assert weather.cached_weather_windows(met_ocean, {'maxHs': 2, 'maxTp': 0}) is ww
+    assert len(ww_cache) == 2
+
+
+def test_cached_weather_windows_eviction(ww_cache):
+    '''Test that the least recently used entries are evicted beyond
+    WW_CACHE_SIZE entries'''
+    
+    met_ocean = met_ocean_series([1, 2, 3, 4])
+    
+    first = weather.cached_weather_windows(met_ocean, {'maxHs': 1})
+    second = weather.cached_weather_windows(met_ocean, {'maxHs': 2})
+    weather.cached_weather_windows(met_ocean, {'maxHs': 3})
+    # the first entry becomes the most recently used
+    assert weather.cached_weather_windows(met_ocean, {'maxHs': 1}) is first
+    weather.cached_weather_windows(met_ocean, {'maxHs': 4})
+    
+    assert len(ww_cache) == 3
+    assert weather.cached_weather_windows(met_ocean, {'maxHs': 1}) is first
+    assert weather.cached_weather_windows(met_ocean, {'maxHs': 2}) is not second
+
+
+def test_cached_weather_windows_reused_id(ww_cache):
+    '''Test that the entry of a met-ocean data set is not returned for
+    another one with the same id'''
+    
+    calm = met_ocean_series([1, 1, 1])
+    rough = met_ocean_series([3, 1, 3])
+    weather.cached_weather_windows(calm, {'maxHs': 2})
+    
+    # the id of the calm data set reused by the rough one
+    key, entry = ww_cache.popitem()
+    ww_cache[(id(rough),) + key[1:]] = entry
+    ww = weather.cached_weather_windows(rough, {'maxHs': 2})
+    
+    assert list(ww['start']) == [1]
+    assert list(ww['duration']) == [1]
+    assert ww_cache[(id(rough),) + key[1:]][0] is rough
+
+
+def first_fit(ww, time, duration):
+    '''Earliest start of an operation in the weather windows, by a linear
+    scan'''
+    
+    for start, length in zip(ww['start'], ww['duration']):
+        begin = max(time, start)
+        if begin + duration <= start + length:
+            return begin
+    return None
+
+
+def test_window_index():
+    '''Test the earliest starts of the window index on known cases'''
+    
+    # windows [0, 2), [3, 4), [6, 9), [12, 13)
+    ww = {'start': numpy.array([0, 3, 6, 12]), 'duration': numpy.array([2, 1, 3, 1])}
+    index = weather.WindowIndex(ww)
+    
+    # already inside a window long enough
+    assert index.next_start(0.5, 1.) == 0.5
+    assert index.next_start(6., 3.) == 6.
+    # waiting for the next window long enough
+    assert index.next_start(1.5, 1.) == 3.
+    assert index.next_start(0., 2.5) == 6.
+    # no window long enough
+    assert index.next_start(0., 4.) is None
+    assert index.next_start(7., 3.) is None
+    # zero duration, in a window or between two
+    assert index.next_start(1., 0.) == 1.
+    assert index.next_start(4.5, 0.) == 6.
+    # after the last window
+    assert index.next_start(13.5, 0.) is None
+    assert index.next_start(20., 1.) is None
+    # no window at all
+    assert weather.WindowIndex({'start': [], 'duration': []}).next_start(0., 1.) is None
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_window_index_scan(seed):
+    '''Test the earliest starts of the window index against a linear scan'''
+    
+    rng = numpy.random.RandomState(seed)
+    met_ocean = met_ocean_series(rng.uniform(0., 3., size=rng.randint(1, 300)))
+    ww = weather.weather_windows(met_ocean, {'maxHs': 2.})
+    index = weather.WindowIndex(ww)
+    
+    for time, duration in zip(rng.uniform(-5., len(met_ocean) + 5., 200),
+                              rng.choice([0., 0.5, 1., 2., 3., 5., 8.], 200)):
+        assert index.next_start(time, duration) == first_fit(ww, time, duration)
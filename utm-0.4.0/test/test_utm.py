@@ -1,6 +1,11 @@
 import utm as UTM
 import unittest
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 class UTMTestCase(unittest.TestCase):
     def assert_utm_equal(self, a, b):
@@ -173,5 +178,58 @@ class BadInput(UTMTestCase):
         self.assertRaises(
             UTM.OutOfRangeError, UTM.to_latlon, 500000, 5000000, 32, 'Z')
 
+
+@unittest.skipIf(numpy is None, 'numpy is not available')
+class ArrayValues(UTMTestCase):
+    known_values = KnownValues.known_values
+
+    def test_from_latlon_array(self):
+        '''from_latlon_array should give the same results as from_latlon'''
+        lats = [latlon[0] for latlon, _, _ in self.known_values]
+        lons = [latlon[1] for latlon, _, _ in self.known_values]
+        result = UTM.from_latlon_array(lats, lons)
+        for i, (latlon, utm, _) in enumerate(self.known_values):
+            self.assert_utm_equal(utm, [value[i] for value in result])
+            self.assert_utm_equal(UTM.from_latlon(*latlon), [value[i] for value in result])
+
+    def test_to_latlon_array(self):
+        '''to_latlon_array should give the same results as to_latlon'''
+        utms = list(zip(*[utm for _, utm, _ in self.known_values]))
+        northern = [utm_kw['northern'] for _, _, utm_kw in self.known_values]
+        for result in [UTM.to_latlon_array(*utms),
+                       UTM.to_latlon_array(*utms[0:3], northern=northern)]:
+            for i, (latlon, utm, _) in enumerate(self.known_values):
+                self.assert_latlon_equal(latlon, [value[i] for value in result])
+                self.assert_latlon_equal(UTM.to_latlon(*utm), [value[i] for value in result])
+
+    def test_to_latlon_array_nan(self):
+        '''to_latlon_array should give NaN coordinates for NaN input'''
+        lat, lon = UTM.to_latlon_array([294409, float('nan')], [5628898, 5628898], 32, 'U')
+        self.assert_latlon_equal((50.77535, 6.08389), (lat[0], lon[0]))
+        self.assertTrue(numpy.isnan(lat[1]) and numpy.isnan(lon[1]))
+
+    def test_array_range_checks(self):
+        '''array versions should fail if any input is out-of-bounds'''
+        self.assertRaises(UTM.OutOfRangeError, UTM.from_latlon_array, [0, 84.1], [0, 0])
+        self.assertRaises(UTM.OutOfRangeError, UTM.from_latlon_array, [0, 0], [0, -180.1])
+        self.assertRaises(
+            UTM.OutOfRangeError, UTM.to_latlon_array, [500000, 99999], 5000000, 32, 'U')
+        self.assertRaises(
+            UTM.OutOfRangeError, UTM.to_latlon_array, 500000, [5000000, 10000001], 32, 'U')
+        self.assertRaises(
+            UTM.OutOfRangeError, UTM.to_latlon_array, 500000, 5000000, [32, 61], 'U')
+        self.assertRaises(
+            UTM.OutOfRangeError, UTM.to_latlon_array, 500000, 5000000, 32, ['U', 'I'])
+
+    def test_zone_numbers(self):
+        '''from_latlon_array should give the zones of from_latlon, special zones included'''
+        lats, lons = numpy.meshgrid(numpy.arange(-80, 84.5, 1.5), numpy.arange(-180, 180.5, 1.5))
+        result = UTM.from_latlon_array(lats.ravel(), lons.ravel())
+        for i, (lat, lon) in enumerate(zip(lats.ravel(), lons.ravel())):
+            expected = UTM.from_latlon(lat, lon)
+            self.assertEqual(expected[2], result[2][i])
+            self.assertEqual(expected[3], result[3][i])
+
+
 if __name__ == '__main__':
     unittest.main()
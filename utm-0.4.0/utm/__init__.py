@@ -1,2 +1,2 @@
-from utm.conversion import to_latlon, from_latlon
+from utm.conversion import to_latlon, from_latlon, to_latlon_array, from_latlon_array
 from utm.error import OutOfRangeError
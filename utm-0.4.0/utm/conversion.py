@@ -1,7 +1,12 @@
 import math
 from utm.error import OutOfRangeError
 
-__all__ = ['to_latlon', 'from_latlon']
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+__all__ = ['to_latlon', 'from_latlon', 'to_latlon_array', 'from_latlon_array']
 
 K0 = 0.9996
 
@@ -167,6 +172,153 @@ def from_latlon(latitude, longitude, force_zone_number=None):
     return easting, northing, zone_number, zone_letter
 
 
+def to_latlon_array(easting, northing, zone_number, zone_letter=None, northern=None):
+    """Array version of to_latlon: easting, northing, zone_number and
+    zone_letter (or northern) are numpy arrays, or scalars broadcast against
+    them. Points with a NaN easting or northing give NaN coordinates.
+    Requires numpy."""
+
+    if numpy is None:
+        raise ImportError('to_latlon_array requires numpy')
+
+    if zone_letter is None and northern is None:
+        raise ValueError('either zone_letter or northern needs to be set')
+
+    elif zone_letter is not None and northern is not None:
+        raise ValueError('set either zone_letter or northern, but not both')
+
+    easting, northing = numpy.broadcast_arrays(numpy.asarray(easting, dtype=float),
+                                               numpy.asarray(northing, dtype=float))
+    zone_number = numpy.asarray(zone_number)
+
+    located = ~(numpy.isnan(easting) | numpy.isnan(northing))
+    if not numpy.all((100000 <= easting[located]) & (easting[located] < 1000000)):
+        raise OutOfRangeError('easting out of range (must be between 100.000 m and 999.999 m)')
+    if not numpy.all((0 <= northing[located]) & (northing[located] <= 10000000)):
+        raise OutOfRangeError('northing out of range (must be between 0 m and 10.000.000 m)')
+    if not numpy.all((1 <= zone_number) & (zone_number <= 60)):
+        raise OutOfRangeError('zone number out of range (must be between 1 and 60)')
+
+    if zone_letter is not None:
+        zone_letter = numpy.char.upper(numpy.asarray(zone_letter, dtype=str))
+
+        if not numpy.all(numpy.in1d(zone_letter, list('CDEFGHJKLMNPQRSTUVWX'))):
+            raise OutOfRangeError('zone letter out of range (must be between C and X)')
+
+        northern = (zone_letter >= 'N')
+
+    x = easting - 500000
+    y = numpy.where(northern, northing, northing - 10000000)
+
+    m = y / K0
+    mu = m / (R * M1)
+
+    p_rad = (mu +
+             P2 * numpy.sin(2 * mu) +
+             P3 * numpy.sin(4 * mu) +
+             P4 * numpy.sin(6 * mu) +
+             P5 * numpy.sin(8 * mu))
+
+    p_sin = numpy.sin(p_rad)
+    p_sin2 = p_sin * p_sin
+
+    p_cos = numpy.cos(p_rad)
+
+    p_tan = p_sin / p_cos
+    p_tan2 = p_tan * p_tan
+    p_tan4 = p_tan2 * p_tan2
+
+    ep_sin = 1 - E * p_sin2
+    ep_sin_sqrt = numpy.sqrt(1 - E * p_sin2)
+
+    n = R / ep_sin_sqrt
+    r = (1 - E) / ep_sin
+
+    c = _E * p_cos**2
+    c2 = c * c
+
+    d = x / (n * K0)
+    d2 = d * d
+    d3 = d2 * d
+    d4 = d3 * d
+    d5 = d4 * d
+    d6 = d5 * d
+
+    latitude = (p_rad - (p_tan / r) *
+                (d2 / 2 -
+                 d4 / 24 * (5 + 3 * p_tan2 + 10 * c - 4 * c2 - 9 * E_P2)) +
+                 d6 / 720 * (61 + 90 * p_tan2 + 298 * c + 45 * p_tan4 - 252 * E_P2 - 3 * c2))
+
+    longitude = (d -
+                 d3 / 6 * (1 + 2 * p_tan2 + c) +
+                 d5 / 120 * (5 - 2 * c + 28 * p_tan2 - 3 * c2 + 8 * E_P2 + 24 * p_tan4)) / p_cos
+
+    return (numpy.degrees(latitude),
+            numpy.degrees(longitude) + zone_number_to_central_longitude(zone_number))
+
+
+def from_latlon_array(latitude, longitude, force_zone_number=None):
+    """Array version of from_latlon: latitude and longitude are numpy arrays,
+    the zone numbers and letters are returned as arrays too. Requires numpy."""
+
+    if numpy is None:
+        raise ImportError('from_latlon_array requires numpy')
+
+    latitude, longitude = numpy.broadcast_arrays(numpy.asarray(latitude, dtype=float),
+                                                 numpy.asarray(longitude, dtype=float))
+
+    if not numpy.all((-80.0 <= latitude) & (latitude <= 84.0)):
+        raise OutOfRangeError('latitude out of range (must be between 80 deg S and 84 deg N)')
+    if not numpy.all((-180.0 <= longitude) & (longitude <= 180.0)):
+        raise OutOfRangeError('northing out of range (must be between 180 deg W and 180 deg E)')
+
+    lat_rad = numpy.radians(latitude)
+    lat_sin = numpy.sin(lat_rad)
+    lat_cos = numpy.cos(lat_rad)
+
+    lat_tan = lat_sin / lat_cos
+    lat_tan2 = lat_tan * lat_tan
+    lat_tan4 = lat_tan2 * lat_tan2
+
+    if force_zone_number is None:
+        zone_number = latlon_to_zone_number_array(latitude, longitude)
+    else:
+        zone_number = numpy.zeros(latitude.shape, dtype=int) + force_zone_number
+
+    zone_letter = latitude_to_zone_letter_array(latitude)
+
+    lon_rad = numpy.radians(longitude)
+    central_lon = zone_number_to_central_longitude(zone_number)
+    central_lon_rad = numpy.radians(central_lon)
+
+    n = R / numpy.sqrt(1 - E * lat_sin**2)
+    c = E_P2 * lat_cos**2
+
+    a = lat_cos * (lon_rad - central_lon_rad)
+    a2 = a * a
+    a3 = a2 * a
+    a4 = a3 * a
+    a5 = a4 * a
+    a6 = a5 * a
+
+    m = R * (M1 * lat_rad -
+             M2 * numpy.sin(2 * lat_rad) +
+             M3 * numpy.sin(4 * lat_rad) -
+             M4 * numpy.sin(6 * lat_rad))
+
+    easting = K0 * n * (a +
+                        a3 / 6 * (1 - lat_tan2 + c) +
+                        a5 / 120 * (5 - 18 * lat_tan2 + lat_tan4 + 72 * c - 58 * E_P2)) + 500000
+
+    northing = K0 * (m + n * lat_tan * (a2 / 2 +
+                                        a4 / 24 * (5 - lat_tan2 + 9 * c + 4 * c**2) +
+                                        a6 / 720 * (61 - 58 * lat_tan2 + lat_tan4 + 600 * c - 330 * E_P2)))
+
+    northing = numpy.where(latitude < 0, northing + 10000000, northing)
+
+    return easting, northing, zone_number, zone_letter
+
+
 def latitude_to_zone_letter(latitude):
     for lat_min, zone_letter in ZONE_LETTERS:
         if latitude >= lat_min:
@@ -192,5 +344,27 @@ def latlon_to_zone_number(latitude, longitude):
     return int((longitude + 180) / 6) + 1
 
 
+def latitude_to_zone_letter_array(latitude):
+    lat_mins = [lat_min for lat_min, zone_letter in reversed(ZONE_LETTERS)]
+    zone_letters = numpy.array([zone_letter for lat_min, zone_letter in reversed(ZONE_LETTERS)] + [None],
+                               dtype=object)
+    # latitudes below the lowest band have no zone letter, as in latitude_to_zone_letter
+    index = numpy.searchsorted(lat_mins, latitude, side='right') - 1
+    return zone_letters[numpy.where(index < 0, len(lat_mins), index)]
+
+
+def latlon_to_zone_number_array(latitude, longitude):
+    zone_number = ((longitude + 180) / 6).astype(int) + 1
+
+    norway = (56 <= latitude) & (latitude <= 64) & (3 <= longitude) & (longitude <= 12)
+    zone_number[norway] = 32
+
+    svalbard = (72 <= latitude) & (latitude <= 84) & (longitude >= 0)
+    for lon_max, svalbard_zone in [(42, 37), (33, 35), (21, 33), (9, 31)]:
+        zone_number[svalbard & (longitude <= lon_max)] = svalbard_zone
+
+    return zone_number
+
+
 def zone_number_to_central_longitude(zone_number):
     return (zone_number - 1) * 6 - 180 + 3